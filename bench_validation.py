@@ -0,0 +1,204 @@
+# bench_validation.py
+#
+# Scaling benchmark for validation_runner.run_one_signal. Sweeps symbols,
+# price points per symbol and auxiliary (bybit/okx/deribit) rows one at a time,
+# times every signal and fits the empirical exponent k in time ~ size^k.
+#
+#   python bench_validation.py --out validation_scaling.json
+#   python bench_validation.py --factors 1,2,4,8 --points 400
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+# Nothing is fetched or written: inputs are built in memory and sb_post is stubbed.
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench")
+
+import validation_runner as vr
+from synthetic_logs import CADENCE_SEC, generate_logs
+
+SIGNAL_KEYS = [
+    "S1_futures_divergence",
+    "S2_dispersion_low",
+    "S2_dispersion_high",
+    "S3_bybit_calm",
+    "S4_okx_bybit_divergence",
+]
+DIMENSIONS = ("symbols", "points", "aux_rows")
+
+T_END = 1_771_671_600_000  # fixed so runs are comparable
+WINDOW_MS = 24 * 3600 * 1000
+T_START = T_END - WINDOW_MS
+AUX_LOOKBACK_MS = 12 * 3600 * 1000  # longest dispersion window
+
+
+class _Response:
+    # Stands in for requests.Response as far as sb_post callers read it.
+    status_code = 201
+    content = b'[{"id":0}]'
+
+    def json(self):
+        return [{"id": 0}]
+
+
+def build_inputs(symbols: int, points: int, aux_rows: int, seed: int = 0) -> Dict[str, Any]:
+    """Synthetic inputs shaped like run_validation_runner's after loading and sorting."""
+    risk_volume = points * CADENCE_SEC["risk_eval"] * 1000 / WINDOW_MS
+    aux_span = WINDOW_MS + AUX_LOOKBACK_MS
+    aux_volume = aux_rows * CADENCE_SEC["okx_market_state"] * 1000 / aux_span
+
+    risk_rows, div_rows = [], []
+    for row in generate_logs(T_START, T_END, volume=risk_volume, symbols=symbols, seed=seed,
+                             events=["risk_eval", "risk_divergence"]):
+        (risk_rows if row["event"] == "risk_eval" else div_rows).append(row)
+
+    aux = {"bybit_market_state": [], "okx_market_state": [], "deribit_vbi_snapshot": []}
+    for row in generate_logs(T_START - AUX_LOOKBACK_MS, T_END, volume=aux_volume, seed=seed, events=list(aux)):
+        aux[row["event"]].append(row)
+
+    for rows in (risk_rows, *aux.values()):
+        rows.sort(key=lambda r: int(r["ts"]))
+
+    price_series = vr.build_price_series(risk_rows)
+    return {
+        "symbols": sorted(price_series),
+        "price_series": price_series,
+        "div_times": vr.build_signal_times_by_symbol_risk_divergence(div_rows),
+        "risk_eval_rows": risk_rows,
+        "bybit_rows": aux["bybit_market_state"],
+        "okx_rows": aux["okx_market_state"],
+        "deribit_rows": aux["deribit_vbi_snapshot"],
+    }
+
+
+def time_signal(signal_key: str, inputs: Dict[str, Any], repeat: int = 1) -> float:
+    t_points = inputs["div_times"] if signal_key == "S1_futures_divergence" else {}
+    best = math.inf
+    log = io.StringIO()
+    with patch.object(vr, "sb_post", lambda *a, **k: _Response()), contextlib.redirect_stdout(log):
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            vr.run_one_signal(
+                signal_key=signal_key,
+                symbols=inputs["symbols"],
+                t_points=t_points,
+                price_series=inputs["price_series"],
+                bybit_rows=inputs["bybit_rows"],
+                okx_rows=inputs["okx_rows"],
+                deribit_rows=inputs["deribit_rows"],
+                risk_eval_rows=inputs["risk_eval_rows"],
+                t_start=T_START,
+                t_end=T_END,
+            )
+            best = min(best, time.perf_counter() - t0)
+    # run_one_signal logs and swallows per-horizon errors; a timing of a failed
+    # signal would be meaningless, so surface them instead.
+    failures = [line for line in log.getvalue().splitlines() if "FAILED" in line]
+    if failures:
+        raise RuntimeError(f"{signal_key} failed during the benchmark: {failures[0]}")
+    return best
+
+
+def fit_exponent(sizes: List[float], seconds: List[float]) -> float | None:
+    """Least-squares slope of log(seconds) against log(size)."""
+    pairs = [(math.log(x), math.log(y)) for x, y in zip(sizes, seconds) if x > 0 and y > 0]
+    if len(pairs) < 2:
+        return None
+    mx = sum(x for x, _ in pairs) / len(pairs)
+    my = sum(y for _, y in pairs) / len(pairs)
+    var = sum((x - mx) ** 2 for x, _ in pairs)
+    if var == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in pairs) / var
+
+
+def run_sweep(
+    base: Dict[str, int],
+    factors: List[float],
+    *,
+    signals: List[str] | None = None,
+    repeat: int = 1,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    signals = signals or SIGNAL_KEYS
+    results: Dict[str, Any] = {signal: {} for signal in signals}
+
+    for dimension in DIMENSIONS:
+        sizes, timings = [], {signal: [] for signal in signals}
+        for factor in factors:
+            params = dict(base)
+            params[dimension] = max(1, int(round(base[dimension] * factor)))
+            inputs = build_inputs(seed=seed, **params)
+            sizes.append(params[dimension])
+            for signal in signals:
+                timings[signal].append(time_signal(signal, inputs, repeat))
+            print(f"{dimension}={params[dimension]}: " + ", ".join(
+                f"{s}={timings[s][-1]:.3f}s" for s in signals
+            ), file=sys.stderr)
+
+        for signal in signals:
+            exponent = fit_exponent(sizes, timings[signal])
+            results[signal][dimension] = {
+                "exponent": None if exponent is None else round(exponent, 2),
+                "sizes": sizes,
+                "seconds": [round(t, 5) for t in timings[signal]],
+            }
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "base": base,
+            "factors": factors,
+            "repeat": repeat,
+            "seed": seed,
+            "val_step_minutes": vr.VAL_STEP_MINUTES,
+        },
+        "signals": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fit scaling exponents of validation_runner signals")
+    parser.add_argument("--symbols", type=int, default=2)
+    parser.add_argument("--points", type=int, default=200, help="price points per symbol in the window")
+    parser.add_argument("--aux-rows", type=int, default=200, help="rows per auxiliary event (bybit/okx/deribit)")
+    parser.add_argument("--factors", default="1,2,4", help="multipliers applied to one dimension at a time")
+    parser.add_argument("--signal", action="append", dest="signals", choices=SIGNAL_KEYS)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write results JSON")
+    args = parser.parse_args(argv)
+
+    report = run_sweep(
+        {"symbols": args.symbols, "points": args.points, "aux_rows": args.aux_rows},
+        [float(f) for f in args.factors.split(",") if f.strip()],
+        signals=args.signals,
+        repeat=max(1, args.repeat),
+        seed=args.seed,
+    )
+
+    print(f"{'signal':<26} " + " ".join(f"{d:>10}" for d in DIMENSIONS))
+    for signal, dims in report["signals"].items():
+        print(f"{signal:<26} " + " ".join(
+            f"{'n/a' if dims[d]['exponent'] is None else dims[d]['exponent']:>10}" for d in DIMENSIONS
+        ))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Results written to {args.out}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# bench_wire_format.py
+#
+# Wire bytes and parse time of load_event on one large risk_eval day, served by
+# the in-process local Supabase stand-in: whole rows (select=*, JSON) against a
+# flat data->field projection read as JSON and as CSV.
+#
+#   python bench_wire_format.py --volume 5 --symbols 10 --out wire_format.json
+#   python bench_wire_format.py --fields risk,price --repeat 3
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench")
+
+import loaders
+from local_supabase import LocalSupabase
+from runtime_metrics import METRICS
+from synthetic_logs import populate
+
+EVENT = "risk_eval"
+DEFAULT_FIELDS = ("risk", "price", "direction")
+# (label, projected fields?, wire format)
+MODES = (
+    ("json_rows", False, "json"),
+    ("json_projection", True, "json"),
+    ("csv_projection", True, "csv"),
+)
+
+T_END = 1_771_671_600_000  # fixed so runs are comparable
+T_START = T_END - 24 * 3600 * 1000
+
+
+def measure(url: str, fields: Optional[List[str]], wire: str) -> Dict[str, Any]:
+    start = datetime.fromtimestamp(T_START / 1000, tz=timezone.utc)
+    end = datetime.fromtimestamp(T_END / 1000, tz=timezone.utc)
+    loaders.clear_run_cache()
+    METRICS.reset()
+    with patch("loaders.SUPABASE_URL", url), patch("loaders.LOAD_WIRE_FORMAT", wire):
+        t0 = time.perf_counter()
+        df = loaders.load_event(EVENT, start, end, fields=fields)
+        wall = time.perf_counter() - t0
+    loaders.clear_run_cache()
+
+    phases = METRICS.load_phases.get(EVENT, {})
+    return {
+        "rows": len(df),
+        "columns": len(df.columns),
+        "pages": phases.get("pages", 0),
+        "bytes": phases.get("bytes", 0),
+        "wait_sec": round(phases.get("wait_sec", 0.0), 4),
+        "parse_sec": round(sum(phases.get(k, 0.0) for k in ("decode_sec", "coerce_sec", "frame_sec")), 4),
+        "wall_sec": round(wall, 4),
+    }
+
+
+def run(volume: float, symbols: int, fields: List[str], repeat: int = 1, seed: int = 0) -> Dict[str, Any]:
+    with LocalSupabase() as server:
+        rows = populate(server.store, T_START, T_END, volume=volume, symbols=symbols, seed=seed, events=[EVENT])
+        results = {}
+        for label, projected, wire in MODES:
+            runs = [measure(server.url, fields if projected else None, wire) for _ in range(max(1, repeat))]
+            # Best of N for the timings; bytes and rows do not vary between runs.
+            best = min(runs, key=lambda r: r["parse_sec"])
+            best["wall_sec"] = min(r["wall_sec"] for r in runs)
+            results[label] = best
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "event": EVENT,
+            "stored_rows": rows,
+            "volume": volume,
+            "symbols": symbols,
+            "fields": fields,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "modes": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare JSON and CSV wire formats for load_event")
+    parser.add_argument("--volume", type=float, default=5.0, help="risk_eval rows per symbol per cadence step")
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--fields", default=",".join(DEFAULT_FIELDS), help="data fields to project")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write results JSON")
+    args = parser.parse_args(argv)
+
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()]
+    report = run(args.volume, args.symbols, fields, repeat=args.repeat, seed=args.seed)
+
+    print(f"{'mode':<16} {'rows':>8} {'MB':>8} {'parse_s':>8} {'wall_s':>8}")
+    for label, r in report["modes"].items():
+        print(f"{label:<16} {r['rows']:>8} {r['bytes'] / 1e6:>8.2f} {r['parse_sec']:>8.3f} {r['wall_sec']:>8.3f}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Results written to {args.out}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
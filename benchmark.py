@@ -0,0 +1,273 @@
+# benchmark.py
+#
+# End-to-end benchmark of the daily pipeline against synthetic data served by
+# the in-process local Supabase stand-in (no network).
+#
+#   python benchmark.py --volumes 1,10 --out bench_baseline.json
+#   python benchmark.py --volumes 1,10 --compare bench_baseline.json --threshold 25
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from local_supabase import LocalSupabase
+from synthetic_logs import populate
+from window import analysis_window_utc
+
+PIPELINE = "pipeline"
+COMPARED_FIELDS = ("wall_sec", "cpu_sec", "peak_mb", "requests")
+# Below these baselines a relative change is noise, not a regression.
+NOISE_FLOOR = {"wall_sec": 0.05, "cpu_sec": 0.05, "peak_mb": 1.0, "requests": 5}
+VALIDATION_LOOKBACK_MS = 48 * 3600 * 1000
+
+
+def configure_env(url: str) -> None:
+    loaded = sys.modules.get("config")
+    if loaded is not None and loaded.SUPABASE_URL != url:
+        raise RuntimeError("config was imported before the benchmark could point it at the stand-in")
+    os.environ["SUPABASE_URL"] = url
+    os.environ["SUPABASE_KEY"] = "local"
+    os.environ["AUTO_POST_TWITTER"] = "false"
+    os.environ["AUTO_POST_TELEGRAM"] = "false"
+
+
+def module_runners(start, end) -> List[tuple]:
+    # Imported lazily: pipeline modules read config at import time.
+    main = importlib.import_module("main")
+    cross_layer = importlib.import_module("cross_layer")
+    ts_from = int(start.timestamp() * 1000)
+    ts_to = int(end.timestamp() * 1000)
+
+    runners = [(name, lambda runner=runner: runner(start, end)) for name, runner in main.MODULES]
+    runners.append(("cross_layer", lambda: cross_layer.process_cross_layer_daily_window(ts_from, ts_to)))
+    runners.append((PIPELINE, main.main))
+    return runners
+
+
+def _measure(fn, trace_memory: bool = False) -> Dict[str, Any]:
+    loaders = importlib.import_module("loaders")
+    validation_runner = importlib.import_module("validation_runner")
+    metrics = importlib.import_module("runtime_metrics").METRICS
+
+    loaders.clear_run_cache()
+    validation_runner.clear_log_cache()
+    metrics.reset()
+    if trace_memory:
+        tracemalloc.start()
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    error = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            fn()
+        except Exception as err:
+            error = f"{type(err).__name__}: {err}"
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    result = {
+        "wall_sec": round(wall, 4),
+        "cpu_sec": round(cpu, 4),
+        "peak_mb": None if peak is None else round(peak / (1024 * 1024), 2),
+        "requests": metrics.request_count,
+        "rows_in": metrics.payload_rows_in,
+        "rows_per_sec": round(metrics.payload_rows_in / wall, 1) if wall > 0 else None,
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+def _best(samples: List[Dict[str, Any]], memory: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # Fastest untraced repeat for timings; tracemalloc slows allocation-heavy
+    # code several-fold, so peak memory comes from a separate traced pass.
+    best = dict(min(samples, key=lambda s: s["wall_sec"]))
+    best["cpu_sec"] = min(s["cpu_sec"] for s in samples)
+    if memory is not None:
+        best["peak_mb"] = memory["peak_mb"]
+    return best
+
+
+def run_benchmark(
+    volumes: List[float],
+    *,
+    symbols: int = 5,
+    seed: int = 0,
+    repeat: int = 1,
+    modules: Optional[List[str]] = None,
+    trace_memory: bool = True,
+) -> Dict[str, Any]:
+    start, end = analysis_window_utc()
+    start_ms = int(start.timestamp() * 1000)
+    end_ms = int(end.timestamp() * 1000)
+    results: Dict[str, Any] = {}
+
+    server = LocalSupabase().start()
+    try:
+        configure_env(server.url)
+        runners = module_runners(start, end)
+        for volume in volumes:
+            server.store.reset(keep=())
+            rows = populate(
+                server.store,
+                start_ms - VALIDATION_LOOKBACK_MS,
+                end_ms,
+                volume=volume,
+                symbols=symbols,
+                seed=seed,
+            )
+            by_module = {}
+            for name, fn in runners:
+                if modules and name not in modules:
+                    continue
+                samples = []
+                for _ in range(repeat):
+                    server.store.reset()
+                    samples.append(_measure(fn))
+                memory = None
+                if trace_memory:
+                    server.store.reset()
+                    memory = _measure(fn, trace_memory=True)
+                by_module[name] = _best(samples, memory)
+            results[f"{volume:g}x"] = {"log_rows": rows, "modules": by_module}
+    finally:
+        server.stop()
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "window_start": start.isoformat(),
+            "window_end": end.isoformat(),
+            "symbols": symbols,
+            "seed": seed,
+            "repeat": repeat,
+            "peak_mb": "tracemalloc peak of allocations made during the module, stand-in server included" if trace_memory else None,
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold_pct: float) -> List[Dict[str, Any]]:
+    regressions = []
+    for volume, current_volume in current.get("results", {}).items():
+        base_volume = baseline.get("results", {}).get(volume)
+        if not base_volume:
+            continue
+        for module, stats in current_volume["modules"].items():
+            base_stats = base_volume["modules"].get(module)
+            if not base_stats:
+                continue
+            if stats.get("error"):
+                # Timings of a module that raised say nothing; the error is the regression.
+                if not base_stats.get("error"):
+                    regressions.append({
+                        "volume": volume,
+                        "module": module,
+                        "field": "error",
+                        "baseline": None,
+                        "current": stats["error"],
+                        "change_pct": None,
+                    })
+                continue
+            for field in COMPARED_FIELDS:
+                base_value = base_stats.get(field)
+                value = stats.get(field)
+                if base_value is None or value is None or base_value < NOISE_FLOOR[field]:
+                    continue
+                change_pct = (value - base_value) / base_value * 100
+                if change_pct > threshold_pct:
+                    regressions.append({
+                        "volume": volume,
+                        "module": module,
+                        "field": field,
+                        "baseline": base_value,
+                        "current": value,
+                        "change_pct": round(change_pct, 1),
+                    })
+    return regressions
+
+
+def module_errors(report: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    return [
+        (volume, module, stats["error"])
+        for volume, block in report["results"].items()
+        for module, stats in block["modules"].items()
+        if stats.get("error")
+    ]
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    print(f"{'volume':>7} {'module':<16} {'wall_s':>8} {'cpu_s':>8} {'peak_mb':>8} {'reqs':>6} {'rows/s':>10}")
+    for volume, block in report["results"].items():
+        for module, stats in block["modules"].items():
+            print(
+                f"{volume:>7} {module:<16} {stats['wall_sec']:>8.3f} {stats['cpu_sec']:>8.3f} "
+                f"{stats['peak_mb'] or 0:>8.1f} {stats['requests']:>6} {stats['rows_per_sec'] or 0:>10.0f}"
+                + (f"  {stats['error']}" if stats.get("error") else "")
+            )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the daily pipeline against synthetic data")
+    parser.add_argument("--volumes", default="1", help="comma-separated volume multipliers, e.g. 1,10,100")
+    parser.add_argument("--symbols", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--module", action="append", dest="modules", help=f"limit to modules (or '{PIPELINE}')")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--out", help="write results JSON (use as a baseline later)")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=20.0, help="allowed regression, percent")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        [float(v) for v in args.volumes.split(",") if v.strip()],
+        symbols=args.symbols,
+        seed=args.seed,
+        repeat=max(1, args.repeat),
+        modules=args.modules,
+        trace_memory=not args.no_memory,
+    )
+    _print_table(report)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Results written to {args.out}.")
+
+    errors = module_errors(report)
+    for volume, module, error in errors:
+        print(f"ERROR {volume} {module}: {error}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare_results(baseline, report, args.threshold)
+        for r in regressions:
+            if r["field"] == "error":
+                print(f"REGRESSION {r['volume']} {r['module']}: now fails with {r['current']}")
+                continue
+            print(
+                f"REGRESSION {r['volume']} {r['module']} {r['field']}: "
+                f"{r['baseline']} -> {r['current']} (+{r['change_pct']}%)"
+            )
+        if regressions:
+            return 1
+        print(f"No regressions above {args.threshold}%.")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
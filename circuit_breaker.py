@@ -0,0 +1,92 @@
+# circuit_breaker.py
+#
+# Per-host circuit breaker for request_with_retry. After HTTP_BREAKER_FAILURES
+# consecutive transport errors or 5xx responses the host is considered down:
+# requests fail immediately with CircuitOpenError for HTTP_BREAKER_COOLDOWN_SEC,
+# then a single probe is let through (half-open) to decide whether to close.
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests.exceptions import ConnectionError
+
+from config import HTTP_BREAKER_COOLDOWN_SEC, HTTP_BREAKER_FAILURES
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised without touching the network while a host's breaker is open.
+
+    A ConnectionError, so callers with a local fallback (job_log lock state,
+    perf_history spool file) take it exactly as they would an unreachable host.
+    """
+
+
+class CircuitBreaker:
+    def __init__(self, host: str, failure_threshold: int = 5, cooldown_sec: float = 30.0):
+        self.host = host
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_sec = cooldown_sec
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.cooldown_sec:
+                self.state = HALF_OPEN
+                self._probe_started = None
+            # A probe that never reported back (non-HTTP exception) expires
+            # after one cooldown so the breaker cannot wedge half-open.
+            if self.state == HALF_OPEN and (
+                self._probe_started is None or now - self._probe_started >= self.cooldown_sec
+            ):
+                self._probe_started = now
+                return
+            remaining = max(0.0, self.cooldown_sec - (now - self.opened_at))
+            raise CircuitOpenError(f"Circuit open for {self.host}; next probe in {remaining:.0f}s")
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probe_started = None
+
+    def record_failure(self) -> bool:
+        """Returns True when this failure opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            self._probe_started = None
+            if self.state == OPEN:
+                return False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def breaker_for(url: str) -> CircuitBreaker:
+    host = urlsplit(url).netloc
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(host)
+        if breaker is None:
+            breaker = _BREAKERS[host] = CircuitBreaker(host, HTTP_BREAKER_FAILURES, HTTP_BREAKER_COOLDOWN_SEC)
+        return breaker
+
+
+def reset_breakers():
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
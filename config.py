@@ -32,3 +32,53 @@ TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
 HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
 LOCK_STALE_MINUTES = int(os.getenv("LOCK_STALE_MINUTES", "180"))
+RUN_CACHE_MAX_MB = float(os.getenv("RUN_CACHE_MAX_MB", "512"))
+METRICS_TRACEMALLOC = os.getenv("METRICS_TRACEMALLOC", "false").lower() in {"1", "true", "yes"}
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+METRICS_PROM_FILE = os.getenv("METRICS_PROM_FILE")
+HTTP_RECORD = os.getenv("HTTP_RECORD")
+HTTP_REPLAY = os.getenv("HTTP_REPLAY")
+HTTP_REPLAY_LATENCY = os.getenv("HTTP_REPLAY_LATENCY", "zero").lower()
+PROFILE_MODE = os.getenv("PROFILE_MODE", "off").lower()
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_RUN_RATE = float(os.getenv("PROFILE_RUN_RATE", "1"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PERF_HISTORY_FILE = os.getenv("PERF_HISTORY_FILE", ".daily_run_metrics.jsonl")
+PERF_HISTORY_WINDOW = int(os.getenv("PERF_HISTORY_WINDOW", "14"))
+PERF_MIN_HISTORY = int(os.getenv("PERF_MIN_HISTORY", "5"))
+PERF_REGRESSION_PCT = float(os.getenv("PERF_REGRESSION_PCT", "50"))
+PERF_REGRESSION_MIN_SEC = float(os.getenv("PERF_REGRESSION_MIN_SEC", "5"))
+TRACE_FILE = os.getenv("TRACE_FILE")
+TRACE_FORMAT = os.getenv("TRACE_FORMAT", "chrome").lower()
+HTTP_RATE_LIMIT = float(os.getenv("HTTP_RATE_LIMIT", "50"))
+HTTP_RATE_BURST = float(os.getenv("HTTP_RATE_BURST", "20"))
+HTTP_MIN_CONCURRENCY = int(os.getenv("HTTP_MIN_CONCURRENCY", "1"))
+HTTP_MAX_CONCURRENCY = int(os.getenv("HTTP_MAX_CONCURRENCY", "16"))
+HTTP_RETRY_BUDGET_RATIO = float(os.getenv("HTTP_RETRY_BUDGET_RATIO", "0.2"))
+HTTP_RETRY_BUDGET_MIN = int(os.getenv("HTTP_RETRY_BUDGET_MIN", "10"))
+HTTP_RETRY_AFTER_MAX = float(os.getenv("HTTP_RETRY_AFTER_MAX", "60"))
+HTTP_BREAKER_FAILURES = int(os.getenv("HTTP_BREAKER_FAILURES", "5"))
+HTTP_BREAKER_COOLDOWN_SEC = float(os.getenv("HTTP_BREAKER_COOLDOWN_SEC", "30"))
+HTTP_HEDGE = os.getenv("HTTP_HEDGE", "false").lower() in {"1", "true", "yes"}
+HTTP_HEDGE_QUANTILE = float(os.getenv("HTTP_HEDGE_QUANTILE", "0.95"))
+HTTP_HEDGE_MIN_SAMPLES = int(os.getenv("HTTP_HEDGE_MIN_SAMPLES", "20"))
+HTTP_HEDGE_MIN_DELAY_MS = float(os.getenv("HTTP_HEDGE_MIN_DELAY_MS", "50"))
+# PostgREST db-max-rows of the Supabase project; load_event never pages past it.
+# At the default 1000 adaptive pages never grow beyond their 1000-row start.
+SUPABASE_MAX_ROWS = int(os.getenv("SUPABASE_MAX_ROWS", "1000"))
+LOAD_PAGE_MIN = int(os.getenv("LOAD_PAGE_MIN", "250"))
+LOAD_PAGE_MAX = int(os.getenv("LOAD_PAGE_MAX", "10000"))
+LOAD_PAGE_TARGET_SEC = float(os.getenv("LOAD_PAGE_TARGET_SEC", "2"))
+LOAD_PAGE_TARGET_MB = float(os.getenv("LOAD_PAGE_TARGET_MB", "8"))
+# Events that usually fit in one page; load_events fetches them in one scan.
+LOAD_SPARSE_EVENTS = {
+    e.strip()
+    for e in os.getenv("LOAD_SPARSE_EVENTS", "alert_sent,risk_divergence,market_regime").split(",")
+    if e.strip()
+}
+LOAD_PARALLELISM = int(os.getenv("LOAD_PARALLELISM", "4"))
+LOAD_PREFETCH = os.getenv("LOAD_PREFETCH", "true").lower() in {"1", "true", "yes"}
+LOAD_STREAM = os.getenv("LOAD_STREAM", "false").lower() in {"1", "true", "yes"}
+LOAD_STREAM_BATCH_ROWS = int(os.getenv("LOAD_STREAM_BATCH_ROWS", "1000"))
+# Wire format for load_event(fields=...) projections: json or csv. select=* is always json.
+LOAD_WIRE_FORMAT = os.getenv("LOAD_WIRE_FORMAT", "json").strip().lower()
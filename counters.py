@@ -1,13 +1,18 @@
 # counters.py
-import requests
 from config import SUPABASE_URL, HEADERS
+from http_client import decode_json, request_with_retry
+from runtime_metrics import METRICS
+
 
 def next_counter(name: str) -> int:
-    r = requests.post(
+    # Not idempotent: a retried increment could skip a log number.
+    METRICS.add(request_count=1)
+    r = request_with_retry(
+        "POST",
         f"{SUPABASE_URL}/rest/v1/rpc/increment_counter",
         headers=HEADERS,
         json={"counter_name": name},
         timeout=10,
+        retries=0,
     )
-    r.raise_for_status()
-    return r.json()
+    return decode_json(r)
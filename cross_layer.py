@@ -7,6 +7,7 @@ import math
 
 import pandas as pd
 
+from event_schema import TS_MS
 from loaders import load_event
 from supabase import supabase_post
 
@@ -65,12 +66,11 @@ def _df_to_rows(df: pd.DataFrame) -> list[dict]:
     if df.empty:
         return []
     rows: list[dict] = []
-    for _, row in df.iterrows():
+    for (_, row), ts_ms in zip(df.iterrows(), df[TS_MS].tolist()):
         data = row.to_dict()
-        ts = data.get("ts")
-        if isinstance(ts, pd.Timestamp):
-            data["ts"] = int(ts.timestamp() * 1000)
-        rows.append({"data": data, "ts": data.get("ts")})
+        del data[TS_MS]
+        data["ts"] = ts_ms
+        rows.append({"data": data, "ts": ts_ms})
     return rows
 
 
@@ -256,18 +256,6 @@ def _to_float_or_none(value) -> float | None:
     return None
 
 
-def _sanitize_for_json(value):
-    if isinstance(value, dict):
-        return {k: _sanitize_for_json(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [_sanitize_for_json(item) for item in value]
-    if isinstance(value, float):
-        return value if math.isfinite(value) else None
-    if pd.isna(value):
-        return None
-    return value
-
-
 def compute_risk_bucket(risk: float | int | None) -> str | None:
     if risk is None:
         return None
@@ -368,7 +356,8 @@ def classify_daily_window_event_cross(*, symbol: str, window_start_ts_ms: int, w
 
 
 def _persist_cross_layer_event(result: dict) -> None:
-    supabase_post("cross_layer_events", _sanitize_for_json(result), on_conflict="event_key")
+    # NaN/Inf become null in http_client's encoder.
+    supabase_post("cross_layer_events", result, on_conflict="event_key")
 
 
 def process_cross_layer_daily_window(ts_from: int, ts_to: int) -> dict[str, int]:
@@ -1,4 +1,3 @@
-import pandas as pd
 from requests import HTTPError
 
 from loaders import load_event
@@ -12,14 +11,16 @@ def dominant(series, default_value="UNKNOWN", default_pct=0.0):
     clean = series.dropna() if hasattr(series, "dropna") else series
     if clean is None or len(clean) == 0:
         return default_value, default_pct
-    vc = clean.value_counts(normalize=True)
+    # Label columns load as categoricals ordered for the whole frame; object
+    # dtype breaks ties by first appearance within this per-symbol subset.
+    vc = clean.astype(object).value_counts(normalize=True)
     return vc.index[0], round(float(vc.iloc[0]) * 100, 1)
 
 
 def numeric_mean(series, digits):
     if series is None or len(series) == 0:
         return None
-    values = pd.to_numeric(series, errors="coerce").dropna()
+    values = series.dropna()
     if values.empty:
         return None
     return round(float(values.mean()), digits)
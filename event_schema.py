@@ -0,0 +1,162 @@
+# event_schema.py
+#
+# Typed schema of the data fields each `logs` event carries. load_event applies
+# it once per loaded frame, so modules get numeric fields as numbers, label
+# fields as categoricals and an int64 ts_ms column without coercing them again.
+# Fields not listed are left as loaded.
+from dataclasses import dataclass
+
+import pandas as pd
+
+from runtime_metrics import METRICS
+
+FLOAT = "float"
+INT = "int"
+CATEGORY = "category"
+
+TS_MS = "ts_ms"
+
+
+@dataclass(frozen=True)
+class Field:
+    kind: str
+    nullable: bool = True
+    # Known labels of a CATEGORY field; others are kept but counted as violations.
+    vocabulary: frozenset | None = None
+
+
+def _labels(*values: str) -> frozenset:
+    return frozenset(values)
+
+
+REGIMES = _labels("CALM", "NEUTRAL", "UNCERTAIN", "DIRECTIONAL_UP", "DIRECTIONAL_DOWN")
+DIVERGENCE_TYPES = _labels("BULLISH", "BEARISH")
+OKX_DIVERGENCE = _labels("NONE", "WEAK", "STRONG")
+LIQUIDITY_REGIMES = _labels("LIQUIDITY_FLAT", "LIQUIDITY_EXPANSION", "LIQUIDITY_CRUSH")
+EXPIRY_STATES = _labels("CALM", "NEUTRAL", "BUILDING", "STRESS", "COMPRESSION", "EXPANSION")
+
+SCHEMAS: dict[str, dict[str, Field]] = {
+    "risk_eval": {
+        "risk": Field(INT, nullable=False),
+        "price": Field(FLOAT),
+        "direction": Field(CATEGORY, vocabulary=_labels("up", "down")),
+        "ts_unix_ms": Field(INT),
+    },
+    "alert_sent": {
+        "type": Field(CATEGORY),
+        "risk": Field(INT),
+        "price": Field(FLOAT),
+    },
+    "risk_divergence": {
+        "divergence_type": Field(CATEGORY, vocabulary=DIVERGENCE_TYPES),
+        "risk": Field(INT),
+        "price": Field(FLOAT),
+        "confidence": Field(FLOAT),
+    },
+    "deribit_vbi_snapshot": {
+        "vbi_state": Field(CATEGORY, vocabulary=_labels("COLD", "CALM", "WARM", "HOT")),
+        "vbi_pattern": Field(CATEGORY),
+        "near_iv": Field(FLOAT),
+        "far_iv": Field(FLOAT),
+        "iv_slope": Field(FLOAT),
+        "curvature": Field(FLOAT),
+        "skew": Field(FLOAT),
+        "vbi_score": Field(FLOAT),
+    },
+    "bybit_market_state": {
+        "regime": Field(CATEGORY, vocabulary=REGIMES),
+        "mci": Field(FLOAT),
+        "mci_slope": Field(FLOAT),
+        "confidence": Field(FLOAT),
+        "mci_phase": Field(CATEGORY, vocabulary=_labels("OVERCOMPRESSED", "STABLE", "RELEASING", "EXPANDING")),
+    },
+    "okx_market_state": {
+        "okx_olsi_avg": Field(FLOAT),
+        "okx_olsi_slope": Field(FLOAT),
+        "okx_liquidity_regime": Field(CATEGORY, vocabulary=LIQUIDITY_REGIMES),
+        "divergence": Field(CATEGORY, vocabulary=OKX_DIVERGENCE),
+        "divergence_type": Field(CATEGORY, vocabulary=DIVERGENCE_TYPES),
+        "divergence_strength": Field(FLOAT),
+        "divergence_diff": Field(FLOAT),
+    },
+    "options_market_state": {
+        "regime": Field(CATEGORY, vocabulary=EXPIRY_STATES),
+        "near_expiry_state": Field(CATEGORY, vocabulary=EXPIRY_STATES),
+        "mid_expiry_state": Field(CATEGORY, vocabulary=EXPIRY_STATES),
+        "mci": Field(FLOAT),
+        "mci_slope": Field(FLOAT),
+        "confidence": Field(FLOAT),
+        "skew": Field(FLOAT),
+        "credit": Field(FLOAT),
+        "divergence": Field(CATEGORY, vocabulary=OKX_DIVERGENCE),
+    },
+    "options_ticker_cycle": {
+        "regime": Field(CATEGORY, vocabulary=REGIMES),
+        "mci": Field(FLOAT),
+    },
+    "market_regime": {
+        "regime": Field(CATEGORY, vocabulary=_labels("CALM", "NEUTRAL", "STRESS")),
+        "liquidity_regime": Field(CATEGORY, vocabulary=LIQUIDITY_REGIMES),
+        "market_volatility": Field(CATEGORY, vocabulary=_labels("LOW", "NORMAL", "HIGH")),
+    },
+}
+
+
+def _numeric(series: pd.Series, kind: str):
+    values = pd.to_numeric(series, errors="coerce")
+    failed = int(values.isna().sum() - series.isna().sum())
+    if kind == INT and pd.api.types.is_float_dtype(values.dtype) and not values.isna().any():
+        if (values % 1 == 0).all():
+            values = values.astype("int64")
+    return values, failed
+
+
+def first_seen_category(series: pd.Series) -> pd.Series:
+    """Categorical of series with categories in first-seen order.
+
+    value_counts() on the whole column then breaks ties as object dtype would;
+    subsets keep the whole column's order, so label counts that must break ties
+    within a subset count on .astype(object).
+    """
+    return series.astype(pd.CategoricalDtype(pd.unique(series.dropna())))
+
+
+def _category(series: pd.Series, vocabulary):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        values = series
+    else:
+        values = first_seen_category(series)
+    if vocabulary is None:
+        return values, 0
+    unknown = [label for label in values.cat.categories if label not in vocabulary]
+    return values, int(values.isin(unknown).sum()) if unknown else 0
+
+
+def apply_schema(event: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Coerces the event's known fields and adds ts_ms; returns a new frame.
+
+    Values a field cannot hold become NaN, as pd.to_numeric(errors="coerce")
+    would; they, labels outside a vocabulary and nulls in non-nullable fields
+    are counted in METRICS.schema_violations.
+    """
+    if df.empty:
+        return df
+    columns = {}
+    violations = 0
+    for name, field in SCHEMAS.get(event, {}).items():
+        if name not in df.columns:
+            violations += 0 if field.nullable else len(df)
+            continue
+        series = df[name]
+        if field.kind == CATEGORY:
+            columns[name], failed = _category(series, field.vocabulary)
+        else:
+            columns[name], failed = _numeric(series, field.kind)
+        violations += failed
+        if not field.nullable:
+            violations += int(series.isna().sum())
+    if "ts" in df.columns:
+        columns[TS_MS] = df["ts"].dt.as_unit("ms").astype("int64")
+    if violations:
+        METRICS.add(schema_violations=violations)
+    return df.assign(**columns)
@@ -0,0 +1,188 @@
+# golden_outputs.py
+#
+# Captures every payload the daily modules send to Supabase for a synthetic
+# window (via the in-process local stand-in) and diffs captures field by field.
+#
+#   python golden_outputs.py capture --out golden.json
+#   python golden_outputs.py check golden.json
+#   python golden_outputs.py check golden.json --candidate risk=fast_risk:run_risk_daily
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import math
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmark import VALIDATION_LOOKBACK_MS, configure_env, module_runners
+from local_supabase import LocalSupabase
+from synthetic_logs import populate
+
+GOLDEN_MODULES = ["deribit", "options", "risk", "risk_divergence", "meta", "cross_layer", "validation"]
+SKIPPED_TABLES = {"daily_job_runs"}
+DEFAULT_END = "2026-02-21T11:00:00+00:00"
+
+
+def _parse_dt(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _load_callable(spec: str) -> Callable:
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def capture(
+    *,
+    end: str = DEFAULT_END,
+    volume: float = 0.5,
+    symbols: int = 3,
+    seed: int = 0,
+    modules: Optional[List[str]] = None,
+    candidates: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Run each module against the same synthetic window and record its writes.
+
+    `candidates` maps a module name to "package.module:function"; the function is
+    called like the legacy runner (start, end datetimes; cross_layer takes ms).
+    """
+    window_end = _parse_dt(end)
+    window_start = window_end - timedelta(days=1)
+    start_ms = int(window_start.timestamp() * 1000)
+    end_ms = int(window_end.timestamp() * 1000)
+    modules = modules or GOLDEN_MODULES
+    candidates = candidates or {}
+
+    server = LocalSupabase().start()
+    try:
+        configure_env(server.url)
+        loaders = importlib.import_module("loaders")
+        validation_runner = importlib.import_module("validation_runner")
+        runners = dict(module_runners(window_start, window_end))
+        populate(server.store, start_ms - VALIDATION_LOOKBACK_MS, end_ms, volume=volume, symbols=symbols, seed=seed)
+
+        writes: Dict[str, List[dict]] = {}
+        for name in modules:
+            fn = runners[name]
+            if name in candidates:
+                candidate = _load_callable(candidates[name])
+                if name == "cross_layer":
+                    fn = lambda candidate=candidate: candidate(start_ms, end_ms)
+                else:
+                    fn = lambda candidate=candidate: candidate(window_start, window_end)
+            server.store.reset()
+            loaders.clear_run_cache()
+            validation_runner.clear_log_cache()
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn()
+            writes[name] = [w for w in server.store.writes if w["table"] not in SKIPPED_TABLES]
+    finally:
+        server.stop()
+
+    return {
+        "meta": {"end": window_end.isoformat(), "volume": volume, "symbols": symbols, "seed": seed},
+        "writes": writes,
+    }
+
+
+def diff_payloads(expected: Any, actual: Any, path: str = "", rel_tol: float = 1e-9, abs_tol: float = 1e-12) -> List[str]:
+    """Field-by-field differences; numbers compare with tolerance, NaN equals NaN."""
+    if isinstance(expected, bool) or isinstance(actual, bool):
+        same = type(expected) is type(actual) and expected == actual
+        return [] if same else [f"{path}: {expected!r} != {actual!r}"]
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        if math.isnan(expected) and math.isnan(actual):
+            return []
+        if math.isclose(expected, actual, rel_tol=rel_tol, abs_tol=abs_tol):
+            return []
+        return [f"{path}: {expected!r} != {actual!r}"]
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        out = []
+        for key in sorted(set(expected) | set(actual), key=str):
+            sub = f"{path}.{key}" if path else str(key)
+            if key not in actual:
+                out.append(f"{sub}: missing in candidate")
+            elif key not in expected:
+                out.append(f"{sub}: unexpected in candidate ({actual[key]!r})")
+            else:
+                out.extend(diff_payloads(expected[key], actual[key], sub, rel_tol, abs_tol))
+        return out
+    if isinstance(expected, list) and isinstance(actual, list):
+        out = []
+        if len(expected) != len(actual):
+            out.append(f"{path}: length {len(expected)} != {len(actual)}")
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            out.extend(diff_payloads(e, a, f"{path}[{i}]", rel_tol, abs_tol))
+        return out
+    return [] if expected == actual else [f"{path}: {expected!r} != {actual!r}"]
+
+
+def diff_captures(golden: Dict[str, Any], candidate: Dict[str, Any], **tolerances) -> Dict[str, List[str]]:
+    result = {}
+    for module, writes in golden["writes"].items():
+        if module not in candidate["writes"]:
+            continue
+        result[module] = diff_payloads(writes, candidate["writes"][module], module, **tolerances)
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Capture and compare Supabase payloads of the daily modules")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cap = sub.add_parser("capture", help="record a golden capture")
+    cap.add_argument("--out", required=True)
+    cap.add_argument("--end", default=DEFAULT_END, help="analysis window end (UTC ISO)")
+    cap.add_argument("--volume", type=float, default=0.5)
+    cap.add_argument("--symbols", type=int, default=3)
+    cap.add_argument("--seed", type=int, default=0)
+    cap.add_argument("--module", action="append", dest="modules", choices=GOLDEN_MODULES)
+
+    chk = sub.add_parser("check", help="re-run and diff against a golden capture")
+    chk.add_argument("golden")
+    chk.add_argument("--candidate", action="append", default=[], help="module=package.module:function")
+    chk.add_argument("--rel-tol", type=float, default=1e-9)
+    chk.add_argument("--abs-tol", type=float, default=1e-12)
+    chk.add_argument("--max-diffs", type=int, default=20, help="differences printed per module")
+    args = parser.parse_args(argv)
+
+    if args.command == "capture":
+        report = capture(end=args.end, volume=args.volume, symbols=args.symbols, seed=args.seed, modules=args.modules)
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+        counts = ", ".join(f"{m}={len(w)}" for m, w in report["writes"].items())
+        print(f"Captured writes ({counts}) to {args.out}.")
+        return 0
+
+    with open(args.golden, encoding="utf-8") as fh:
+        golden = json.load(fh)
+    candidates = dict(spec.split("=", 1) for spec in args.candidate)
+    meta = golden["meta"]
+    current = capture(
+        end=meta["end"],
+        volume=meta["volume"],
+        symbols=meta["symbols"],
+        seed=meta["seed"],
+        modules=list(golden["writes"]),
+        candidates=candidates,
+    )
+    # Round-trip so the candidate is compared in the same JSON shape as the golden file.
+    current = json.loads(json.dumps(current))
+
+    failed = False
+    for module, diffs in diff_captures(golden, current, rel_tol=args.rel_tol, abs_tol=args.abs_tol).items():
+        if not diffs:
+            print(f"{module}: OK ({len(golden['writes'][module])} writes)")
+            continue
+        failed = True
+        print(f"{module}: {len(diffs)} differences")
+        for line in diffs[: args.max_diffs]:
+            print(f"  {line}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
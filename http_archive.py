@@ -0,0 +1,203 @@
+# http_archive.py
+#
+# Record/replay of request_with_retry traffic.
+#
+#   HTTP_RECORD=day.jsonl.gz python main.py        # capture every attempt
+#   HTTP_REPLAY=day.jsonl.gz python main.py        # serve them back, no network
+#   HTTP_REPLAY_LATENCY=original                   # sleep the recorded time per attempt
+#
+# The archive is gzip-compressed JSON lines, one line per attempt. Requests are
+# matched on method, URL (with query) and a hash of the body; credentials only
+# live in headers (never stored) or the Telegram bot path (redacted).
+#
+# Request params and bodies carry the run's wall clock (analysis window, job
+# lock timestamps), so now_utc() reads are archived too: a recording logs each
+# read and a replay serves them back in order, keeping the keys stable.
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+ARCHIVE_VERSION = 1
+# Archive whose clock now_utc() reads; set by open_archive.
+_CLOCK_ARCHIVE = None
+REPLAY_LATENCIES = {"zero", "original"}
+_KEPT_HEADERS = ("content-type", "content-range", "retry-after")
+_TELEGRAM_TOKEN = re.compile(r"/bot[^/]+/")
+
+
+class ReplayMissError(requests.exceptions.ConnectionError):
+    pass
+
+
+def _redact(url: str) -> str:
+    return _TELEGRAM_TOKEN.sub("/bot<redacted>/", url)
+
+
+def request_key(method: str, url: str, kwargs: dict) -> tuple[str, str, str]:
+    prepared = requests.Request(
+        method.upper(),
+        url,
+        params=kwargs.get("params"),
+        data=kwargs.get("data"),
+        json=kwargs.get("json"),
+    ).prepare()
+    body = prepared.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return method.upper(), _redact(prepared.url), hashlib.sha1(body).hexdigest()
+
+
+def _parse_clock(value: str) -> datetime:
+    return datetime.fromisoformat(value).astimezone(timezone.utc)
+
+
+def now_utc() -> datetime:
+    """Current UTC time, recorded under HTTP_RECORD and replayed under HTTP_REPLAY."""
+    if _CLOCK_ARCHIVE is None:
+        return datetime.now(timezone.utc)
+    return _CLOCK_ARCHIVE.clock()
+
+
+def _encode_content(content: bytes) -> dict:
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"content_b64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_content(entry: dict) -> bytes:
+    if "content_b64" in entry:
+        return base64.b64decode(entry["content_b64"])
+    return entry.get("text", "").encode("utf-8")
+
+
+class HttpRecorder:
+    replaying = False
+    sleeps = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._fh = gzip.open(path, "wt", encoding="utf-8")
+        self._write({"version": ARCHIVE_VERSION, "created_at": datetime.now(timezone.utc).isoformat()})
+        atexit.register(self.close)
+
+    def clock(self) -> datetime:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            if not self._fh.closed:
+                self._write({"clock": now.isoformat()})
+        return now
+
+    def _write(self, entry: dict):
+        self._fh.write(json.dumps(entry, separators=(",", ":")))
+        self._fh.write("\n")
+
+    def record(self, method: str, url: str, kwargs: dict, elapsed_sec: float, response=None, error=None):
+        method, key_url, body_sha1 = request_key(method, url, kwargs)
+        entry = {"method": method, "url": key_url, "body_sha1": body_sha1, "elapsed_ms": round(elapsed_sec * 1000, 2)}
+        if error is not None:
+            entry["error"] = type(error).__name__
+            entry["message"] = str(error)
+        else:
+            entry["status"] = response.status_code
+            entry["headers"] = {k: response.headers[k] for k in _KEPT_HEADERS if k in response.headers}
+            entry.update(_encode_content(response.content or b""))
+        with self._lock:
+            self._seq += 1
+            entry["seq"] = self._seq
+            self._write(entry)
+
+    def close(self):
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+
+class HttpReplayer:
+    replaying = True
+
+    def __init__(self, path: str, latency: str = "zero"):
+        if latency not in REPLAY_LATENCIES:
+            raise ValueError(f"HTTP_REPLAY_LATENCY must be one of {sorted(REPLAY_LATENCIES)}")
+        self.path = path
+        self.latency = latency
+        self.sleeps = latency == "original"
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, deque] = defaultdict(deque)
+        self._last: dict[tuple, dict] = {}
+        self._clock: deque[datetime] = deque()
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            header = json.loads(fh.readline() or "{}")
+            if header.get("version") != ARCHIVE_VERSION:
+                raise ValueError(f"Unsupported HTTP archive version: {header.get('version')}")
+            for line in fh:
+                entry = json.loads(line)
+                if "clock" in entry:
+                    self._clock.append(_parse_clock(entry["clock"]))
+                    continue
+                self._entries[(entry["method"], entry["url"], entry["body_sha1"])].append(entry)
+        # Archives without clock reads replay at their recording time.
+        created_at = header.get("created_at")
+        self._last_clock = _parse_clock(created_at) if created_at else None
+
+    def clock(self) -> datetime:
+        # Like responses: recorded reads in order, then the last one repeated.
+        with self._lock:
+            if self._clock:
+                self._last_clock = self._clock.popleft()
+            return self._last_clock or datetime.now(timezone.utc)
+
+    def _next(self, key: tuple) -> dict | None:
+        # Recorded attempts are served in order; once a key runs out its last
+        # response is repeated, so extra idempotent reads still resolve.
+        with self._lock:
+            queue = self._entries.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            return self._last.get(key)
+
+    def replay(self, method: str, url: str, kwargs: dict):
+        key = request_key(method, url, kwargs)
+        entry = self._next(key)
+        if entry is None:
+            raise ReplayMissError(f"No recorded response for {key[0]} {key[1]}")
+        if self.sleeps:
+            time.sleep(entry["elapsed_ms"] / 1000)
+        if "error" in entry:
+            error_cls = getattr(requests.exceptions, entry["error"], requests.exceptions.ConnectionError)
+            raise error_cls(entry.get("message", ""))
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        response._content = _decode_content(entry)
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.url = url
+        response.reason = ""
+        return response
+
+
+def open_archive(record_path: str | None, replay_path: str | None, latency: str = "zero"):
+    global _CLOCK_ARCHIVE
+    if record_path and replay_path:
+        raise ValueError("HTTP_RECORD and HTTP_REPLAY are mutually exclusive")
+    if replay_path:
+        _CLOCK_ARCHIVE = HttpReplayer(replay_path, latency=latency)
+    elif record_path:
+        _CLOCK_ARCHIVE = HttpRecorder(record_path)
+    else:
+        _CLOCK_ARCHIVE = None
+    return _CLOCK_ARCHIVE
@@ -1,16 +1,244 @@
+import codecs
+import json
+import math
 import random
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from contextvars import copy_context
+from urllib.parse import urlsplit
 
+import numpy as np
+import pandas as pd
 import requests
 
-from config import HTTP_RETRIES, HTTP_TIMEOUT
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+from circuit_breaker import CircuitOpenError, breaker_for
+from config import (
+    HTTP_HEDGE,
+    HTTP_HEDGE_MIN_DELAY_MS,
+    HTTP_HEDGE_MIN_SAMPLES,
+    HTTP_HEDGE_QUANTILE,
+    HTTP_MAX_CONCURRENCY,
+    HTTP_RECORD,
+    HTTP_REPLAY,
+    HTTP_REPLAY_LATENCY,
+    HTTP_RETRIES,
+    HTTP_RETRY_AFTER_MAX,
+    HTTP_TIMEOUT,
+)
+from http_archive import open_archive
+from observability import log_event
+from rate_limit import RETRY_BUDGET, limiter_for, retry_after_sec
+from runtime_metrics import METRICS
+from tracing import span
 
 RETRYABLE = {429, 500, 502, 503, 504}
 
+ARCHIVE = open_archive(HTTP_RECORD, HTTP_REPLAY, HTTP_REPLAY_LATENCY)
+
+_HEDGE_POOL: ThreadPoolExecutor | None = None
+
+
+# ---------- JSON codec ----------
+#
+# orjson when installed, stdlib otherwise. Both write NaN/Inf as null while
+# serializing (PostgREST rejects bare NaN), and both decode straight from the
+# response bytes. The stdlib path runs the C encoder first and only falls back
+# to the slower null-writing encoder for payloads that hold a non-finite float.
+
+JSON_CODEC = "orjson" if orjson is not None else "stdlib"
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _finite_floatstr(value, _repr=float.__repr__) -> str:
+    return _repr(value) if math.isfinite(value) else "null"
+
+
+class _NullNaNEncoder(json.JSONEncoder):
+    # The C encoder has no float hook, so build the pure-Python one with a
+    # floatstr that writes non-finite values as null.
+    def iterencode(self, o, _one_shot=False):
+        markers = {} if self.check_circular else None
+        encoder = json.encoder.encode_basestring_ascii if self.ensure_ascii else json.encoder.encode_basestring
+        return json.encoder._make_iterencode(
+            markers,
+            self.default,
+            encoder,
+            self.indent,
+            _finite_floatstr,
+            self.key_separator,
+            self.item_separator,
+            self.sort_keys,
+            self.skipkeys,
+            _one_shot,
+        )(o, 0)
+
+
+_STDLIB_ENCODER = _NullNaNEncoder(separators=(",", ":"), ensure_ascii=False, default=_json_default)
+
+
+def json_dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    try:
+        text = json.dumps(value, separators=(",", ":"), ensure_ascii=False, allow_nan=False, default=_json_default)
+    except ValueError:
+        text = _STDLIB_ENCODER.encode(value)
+    return text.encode("utf-8")
+
+
+def json_loads(data: bytes | str):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def decode_json(response):
+    return json_loads(response.content)
+
+
+_STREAM_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def _iter_body(response, chunk_bytes: int):
+    if response.raw is None:
+        # Already buffered: mocked, replayed or recorded responses.
+        yield response.content or b""
+        return
+    yield from response.iter_content(chunk_bytes)
+
+
+class JsonArrayStream:
+    """Iterates a top-level JSON array in lists of up to batch_rows elements.
+
+    Reads the body in chunk_bytes pieces (request it with stream=True), so
+    only one chunk of text and one batch of parsed rows are held at a time.
+    bytes_read is the body size once iteration has finished.
+    """
+
+    def __init__(self, response, batch_rows: int = 1000, chunk_bytes: int = 64 * 1024):
+        self.response = response
+        self.batch_rows = max(1, batch_rows)
+        self.chunk_bytes = chunk_bytes
+        self.bytes_read = 0
+
+    def __iter__(self):
+        # Closing hands the connection back to the pool, or drops it when the
+        # body was abandoned half-read (an error, or a consumer that stopped).
+        try:
+            yield from self._batches()
+        finally:
+            _release(self.response)
+
+    def _batches(self):
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        chunks = _iter_body(self.response, self.chunk_bytes)
+        buf, pos, started, done = "", 0, False, False
+        batch = []
+
+        while True:
+            # Parse everything complete in the buffer. An element is only
+            # taken when something follows it, so a number split across
+            # chunks is not read short.
+            while True:
+                while pos < len(buf) and buf[pos] in _WHITESPACE:
+                    pos += 1
+                if pos >= len(buf):
+                    break
+                if not started:
+                    if buf[pos] != "[":
+                        raise ValueError("expected a JSON array")
+                    started = True
+                    pos += 1
+                    continue
+                if buf[pos] == "]":
+                    if batch:
+                        yield batch
+                    METRICS.add(response_bytes=self.bytes_read)
+                    return
+                if buf[pos] == ",":
+                    pos += 1
+                    continue
+                try:
+                    value, end = _STREAM_DECODER.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if done:
+                        raise
+                    break
+                if end >= len(buf) and not done:
+                    break
+                batch.append(value)
+                pos = end
+                if len(batch) >= self.batch_rows:
+                    yield batch
+                    batch = []
+
+            if done:
+                raise ValueError("truncated JSON array")
+            buf, pos = buf[pos:], 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                done = True
+                buf += decoder.decode(b"", final=True)
+            else:
+                self.bytes_read += len(chunk)
+                buf += decoder.decode(chunk)
+
+
+def _release(response):
+    if response.raw is not None:
+        response.close()
+
+
+def _encode_json_body(kwargs: dict):
+    # requests' json= goes through stdlib with allow_nan=False; encode here
+    # instead so payloads take the fast path and NaN becomes null.
+    if "json" not in kwargs:
+        return
+    payload = kwargs.pop("json")
+    if payload is None:
+        return
+    headers = dict(kwargs.get("headers") or {})
+    if not any(key.lower() == "content-type" for key in headers):
+        headers["Content-Type"] = "application/json"
+    kwargs["headers"] = headers
+    kwargs["data"] = json_dumps(payload)
 
-def _backoff_sleep(attempt: int):
+
+def endpoint_label(url: str) -> str:
+    parts = urlsplit(url)
+    if "/rest/v1/" in parts.path:
+        return parts.path.split("/rest/v1/", 1)[1].strip("/")
+    host = parts.hostname or ""
+    if host.endswith("telegram.org"):
+        return "telegram"
+    if host.endswith("twitter.com") or host.endswith("x.com"):
+        return "twitter"
+    return host or url
+
+
+def _backoff_sleep(attempt: int, retry_after: float | None = None):
+    METRICS.add(retry_count=1)
+    if ARCHIVE is not None and not ARCHIVE.sleeps:
+        return
     backoff = (2 ** attempt) * 0.25 + random.uniform(0.05, 0.2)
-    time.sleep(backoff)
+    if retry_after is not None:
+        backoff = max(backoff, min(retry_after, HTTP_RETRY_AFTER_MAX))
+    with span("http.backoff", attempt=attempt, sleep_sec=round(backoff, 3)):
+        time.sleep(backoff)
 
 
 def _request_without_proxy(method: str, url: str, timeout: float, **kwargs):
@@ -27,35 +255,159 @@ def _request_without_proxy(method: str, url: str, timeout: float, **kwargs):
         )
 
 
+def _send(method: str, url: str, timeout: float, **kwargs):
+    if ARCHIVE is not None and ARCHIVE.replaying:
+        return ARCHIVE.replay(method, url, kwargs)
+    try:
+        return requests.request(method, url, timeout=timeout, **kwargs)
+    except requests.exceptions.ProxyError:
+        # One immediate direct attempt per retry iteration without proxy.
+        return _request_without_proxy(method, url, timeout=timeout, **kwargs)
+
+
+def archive_open() -> bool:
+    """True under HTTP_RECORD or HTTP_REPLAY, when requests must not depend on timing."""
+    return ARCHIVE is not None
+
+
+def _hedge_delay(method: str, endpoint: str, kwargs: dict) -> float | None:
+    # Only idempotent, non-streamed GETs are duplicated, and never while an
+    # archive is open: it keys recorded responses by request order.
+    if not HTTP_HEDGE or ARCHIVE is not None or method.upper() != "GET" or kwargs.get("stream"):
+        return None
+    p_tail = METRICS.latency_quantile(endpoint, HTTP_HEDGE_QUANTILE, HTTP_HEDGE_MIN_SAMPLES)
+    if p_tail is None:
+        return None
+    return max(p_tail, HTTP_HEDGE_MIN_DELAY_MS / 1000)
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    global _HEDGE_POOL
+    if _HEDGE_POOL is None:
+        _HEDGE_POOL = ThreadPoolExecutor(max_workers=2 * HTTP_MAX_CONCURRENCY, thread_name_prefix="http-hedge")
+    return _HEDGE_POOL
+
+
+def _send_hedged(method: str, url: str, timeout: float, delay: float, **kwargs):
+    pool = _hedge_pool()
+    primary = pool.submit(copy_context().run, _send, method, url, timeout, **kwargs)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+
+    METRICS.add(hedged_requests=1)
+    pending = {primary, pool.submit(copy_context().run, _send, method, url, timeout, **kwargs)}
+    last_exc = None
+    # First successful response wins; the slower copy finishes in the
+    # background and is discarded. Fail only when both copies failed.
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result()
+            except requests.RequestException as err:
+                last_exc = err
+    raise last_exc
+
+
 def request_with_retry(method: str, url: str, **kwargs):
     timeout = kwargs.pop("timeout", HTTP_TIMEOUT)
     retries = kwargs.pop("retries", HTTP_RETRIES)
+    _encode_json_body(kwargs)
 
+    endpoint = endpoint_label(url)
+    recorder = ARCHIVE if ARCHIVE is not None and not ARCHIVE.replaying else None
+
+    with span("http.request", method=method, endpoint=endpoint) as request_span:
+        return _request_attempts(method, url, endpoint, timeout, retries, recorder, request_span, kwargs)
+
+
+def _slot(url: str, endpoint: str):
+    # Replayed traffic never reaches the host, so it is not flow-controlled.
+    if ARCHIVE is not None and ARCHIVE.replaying:
+        return nullcontext({})
+    return limiter_for(url).slot(endpoint)
+
+
+def _breaker(url: str):
+    if ARCHIVE is not None and ARCHIVE.replaying:
+        return None
+    return breaker_for(url)
+
+
+def _check_circuit(breaker, request_span):
+    if breaker is None:
+        return
+    try:
+        breaker.before_request()
+    except CircuitOpenError:
+        METRICS.add(circuit_rejections=1)
+        request_span.set(circuit="open")
+        raise
+
+
+def _record_health(breaker, failed: bool):
+    if breaker is None:
+        return
+    if not failed:
+        breaker.record_success()
+    elif breaker.record_failure():
+        log_event(
+            "http.circuit_open",
+            host=breaker.host,
+            failures=breaker.failures,
+            cooldown_sec=breaker.cooldown_sec,
+        )
+
+
+def _request_attempts(method, url, endpoint, timeout, retries, recorder, request_span, kwargs):
+    RETRY_BUDGET.record_request()
+    breaker = _breaker(url)
+    hedge_delay = _hedge_delay(method, endpoint, kwargs)
     last_exc = None
     for attempt in range(retries + 1):
+        _check_circuit(breaker, request_span)
+        request_span.set(attempts=attempt + 1)
+        started = time.perf_counter()
         try:
-            response = requests.request(method, url, timeout=timeout, **kwargs)
-        except requests.exceptions.ProxyError:
-            # One immediate direct attempt per retry iteration without proxy.
-            try:
-                response = _request_without_proxy(method, url, timeout=timeout, **kwargs)
-            except requests.RequestException as err:
-                last_exc = err
-                if attempt >= retries:
-                    raise
-                _backoff_sleep(attempt)
-                continue
+            with span("http.attempt", attempt=attempt) as attempt_span, _slot(url, endpoint) as outcome:
+                if hedge_delay is None:
+                    response = _send(method, url, timeout, **kwargs)
+                else:
+                    response = _send_hedged(method, url, timeout, hedge_delay, **kwargs)
+                outcome["status"] = response.status_code
+                attempt_span.set(status=response.status_code)
         except requests.RequestException as err:
+            elapsed = time.perf_counter() - started
+            METRICS.observe_latency(endpoint, elapsed)
+            _record_health(breaker, failed=True)
+            if recorder is not None:
+                recorder.record(method, url, kwargs, elapsed, error=err)
             last_exc = err
-            if attempt >= retries:
+            if attempt >= retries or not RETRY_BUDGET.try_spend():
                 raise
             _backoff_sleep(attempt)
             continue
+        elapsed = time.perf_counter() - started
+        METRICS.observe_latency(endpoint, elapsed)
+        _record_health(breaker, failed=response.status_code >= 500)
+        if recorder is not None:
+            recorder.record(method, url, kwargs, elapsed, response=response)
 
-        if response.status_code in RETRYABLE and attempt < retries:
-            _backoff_sleep(attempt)
+        if not kwargs.get("stream"):
+            METRICS.add(response_bytes=len(response.content or b""))
+
+        if response.status_code in RETRYABLE and attempt < retries and RETRY_BUDGET.try_spend():
+            # A streamed body nobody will read must not go back to the pool.
+            _release(response)
+            _backoff_sleep(attempt, retry_after_sec(response))
             continue
 
+        if response.status_code >= 400 and kwargs.get("stream"):
+            # Keep the (short) error body for HTTPError.response.text, then
+            # release the connection before raising.
+            response.content
+            _release(response)
         response.raise_for_status()
         return response
 
@@ -0,0 +1,43 @@
+# intervals.py
+#
+# Sorted, merged lists of half-open [start, end) integer intervals, used by the
+# range-aware caches (loaders, validation_runner) to track which ts ranges of
+# an event they already hold and which gaps are left to fetch.
+
+
+def add(covered: list[tuple[int, int]], start: int, end: int) -> list[tuple[int, int]]:
+    """covered plus [start, end), with overlapping or touching intervals merged."""
+    if start >= end:
+        return list(covered)
+    out = []
+    for lo, hi in covered:
+        if hi < start or lo > end:
+            out.append((lo, hi))
+        else:
+            start, end = min(start, lo), max(end, hi)
+    out.append((start, end))
+    out.sort()
+    return out
+
+
+def gaps(covered: list[tuple[int, int]], start: int, end: int) -> list[tuple[int, int]]:
+    """Parts of [start, end) not in covered, in order."""
+    out = []
+    cursor = start
+    for lo, hi in covered:
+        if hi <= cursor:
+            continue
+        if lo >= end:
+            break
+        if lo > cursor:
+            out.append((cursor, lo))
+        cursor = max(cursor, hi)
+        if cursor >= end:
+            break
+    if cursor < end:
+        out.append((cursor, end))
+    return out
+
+
+def contains(covered: list[tuple[int, int]], start: int, end: int) -> bool:
+    return not gaps(covered, start, end)
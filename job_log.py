@@ -1,12 +1,13 @@
 # job_log.py
 import json
-from datetime import date, datetime, timedelta
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from requests import HTTPError
 from requests.exceptions import ConnectionError
 
 from config import LOCK_STALE_MINUTES
+from http_archive import now_utc
 from supabase import supabase_get, supabase_post, supabase_patch
 
 
@@ -35,9 +36,14 @@ def _parse_dt(value):
         return None
 
 
+def _clock() -> tuple[str, datetime]:
+    # Local date and naive UTC time of a single clock read.
+    now = now_utc()
+    return now.astimezone().date().isoformat(), now.replace(tzinfo=None)
+
+
 def acquire_daily_lock() -> bool:
-    today = date.today().isoformat()
-    now = datetime.utcnow()
+    today, now = _clock()
     
     try:
         supabase_post(
@@ -86,8 +92,8 @@ def acquire_daily_lock() -> bool:
 
 
 def finish_daily_job(status: str = "ok"):
-    today = date.today().isoformat()
-    finished_at = datetime.utcnow().isoformat()
+    today, now = _clock()
+    finished_at = now.isoformat()
 
     try:
         supabase_patch(
@@ -102,7 +108,7 @@ def finish_daily_job(status: str = "ok"):
 
         fallback_payload = {
             "date": today,
-            "started_at": datetime.utcnow().isoformat(),
+            "started_at": finished_at,
             "finished_at": finished_at,
             "status": status,
         }
@@ -126,6 +132,6 @@ def finish_daily_job(status: str = "ok"):
                 "backend": "local_fallback",
             }
         )
-        state.setdefault("started_at", datetime.utcnow().isoformat())
+        state.setdefault("started_at", finished_at)
         _write_local_lock_state(state)
         print(f"Daily job status saved locally: {status} ({today}).")
@@ -1,71 +1,706 @@
-# loaders.py
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from time import perf_counter
+
+import numpy as np
 import pandas as pd
 
-from config import SUPABASE_URL, HEADERS
-from http_client import request_with_retry
+import intervals
+from config import (
+    HEADERS,
+    LOAD_PAGE_MAX,
+    LOAD_PAGE_MIN,
+    LOAD_PAGE_TARGET_MB,
+    LOAD_PAGE_TARGET_SEC,
+    LOAD_PARALLELISM,
+    LOAD_SPARSE_EVENTS,
+    LOAD_STREAM,
+    LOAD_STREAM_BATCH_ROWS,
+    LOAD_WIRE_FORMAT,
+    RUN_CACHE_MAX_MB,
+    SUPABASE_MAX_ROWS,
+    SUPABASE_URL,
+)
+from event_schema import TS_MS, apply_schema, first_seen_category
+from http_client import JsonArrayStream, archive_open, decode_json, request_with_retry
 from runtime_metrics import METRICS
+from tracing import span
 
 
-_RUN_CACHE: dict[tuple[str, int, int], pd.DataFrame] = {}
+# Unfiltered full-row loads are kept per event under (event,): one frame sorted
+# by ts holding every covered range in _RUN_CACHE_COVERAGE, which serves any
+# window, filter or projection inside it. Other loads are keyed by
+# (event, start_ms, end_ms, symbols, where, fields).
+_RUN_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+# Half-open [start_ms, end_ms + 1) ranges each (event,) frame covers.
+_RUN_CACHE_COVERAGE: dict[str, list[tuple[int, int]]] = {}
+_RUN_CACHE_SIZES: dict[tuple, int] = {}
+# Wire bytes each cached frame cost to fetch, reported as saved on a hit.
+_RUN_CACHE_WIRE_BYTES: dict[tuple, int] = {}
+_RUN_CACHE_MAX_BYTES = int(RUN_CACHE_MAX_MB * 1024 * 1024)
+# load_events fills the cache from worker threads.
+_RUN_CACHE_LOCK = threading.RLock()
 
+# Columns kept in their wire representation: cursors, joins and payloads rely on them.
+_COMPACT_SKIP = {"ts", "id", TS_MS}
+# String columns become categoricals when they repeat enough to pay for the codes.
+# Categories keep first-seen order so value_counts() breaks ties like object dtype.
+_CATEGORY_MAX_UNIQUE = 1024
+_CATEGORY_MAX_RATIO = 0.5
+# (event, field) pairs only published as rounded aggregates and never compared
+# against thresholds; float32 keeps ~7 significant digits, well beyond the 2
+# decimals they are rounded to. deribit iv_slope/skew/curvature and options
+# skew feed twitter_daily thresholds and stay float64.
+_FLOAT32_FIELDS = {("deribit_vbi_snapshot", "near_iv"), ("deribit_vbi_snapshot", "far_iv")}
+
+
+# Cached frames are shared between modules. With Copy-on-Write (always on in
+# pandas >= 3, the process's own choice on 2.x) a shallow copy keeps callers
+# that add or overwrite columns from touching the cached frame; without it
+# each caller gets a deep copy.
+def _copy_on_write_enabled() -> bool:
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return bool(pd.get_option("mode.copy_on_write"))
+
+
+def _cached_view(df: pd.DataFrame) -> pd.DataFrame:
+    if _copy_on_write_enabled():
+        return df.copy(deep=False)
+    return df.copy()
+
+
+def _frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _cache_get(key):
+    with _RUN_CACHE_LOCK:
+        df = _RUN_CACHE.get(key)
+        if df is None:
+            return None
+        _RUN_CACHE.move_to_end(key)
+        return df
+
+
+def _cache_put(key, df: pd.DataFrame, wire_bytes: int = 0) -> bool:
+    size = _frame_bytes(df)
+    if size > _RUN_CACHE_MAX_BYTES:
+        return False
+
+    with _RUN_CACHE_LOCK:
+        if key in _RUN_CACHE:
+            _cache_evict(key)
+        _RUN_CACHE[key] = df
+        _RUN_CACHE_SIZES[key] = size
+        _RUN_CACHE_WIRE_BYTES[key] = wire_bytes
+
+        total = sum(_RUN_CACHE_SIZES.values())
+        while total > _RUN_CACHE_MAX_BYTES and _RUN_CACHE:
+            oldest = next(iter(_RUN_CACHE))
+            total -= _RUN_CACHE_SIZES.get(oldest, 0)
+            _cache_evict(oldest)
+    return key in _RUN_CACHE
+
+
+def _cache_evict(key) -> None:
+    with _RUN_CACHE_LOCK:
+        _RUN_CACHE.pop(key, None)
+        _RUN_CACHE_SIZES.pop(key, None)
+        _RUN_CACHE_WIRE_BYTES.pop(key, None)
+        if len(key) == 1:
+            _RUN_CACHE_COVERAGE.pop(key[0], None)
+
+
+def clear_run_cache() -> None:
+    with _RUN_CACHE_LOCK:
+        _RUN_CACHE.clear()
+        _RUN_CACHE_SIZES.clear()
+        _RUN_CACHE_WIRE_BYTES.clear()
+        _RUN_CACHE_COVERAGE.clear()
+
+
+def _is_text_column(series: pd.Series) -> bool:
+    if not (pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)):
+        return False
+    values = series.dropna()
+    return len(values) > 0 and all(isinstance(v, str) for v in values)
+
+
+def _compact_column(series: pd.Series, event: str | None = None) -> pd.Series:
+    if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series.dtype):
+        return series
+
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return pd.to_numeric(series, downcast="integer")
+
+    if pd.api.types.is_float_dtype(series.dtype):
+        if (event, series.name) in _FLOAT32_FIELDS:
+            return series.astype("float32")
+        return series
+
+    if _is_text_column(series):
+        unique = series.nunique(dropna=True)
+        if unique <= _CATEGORY_MAX_UNIQUE and unique <= len(series) * _CATEGORY_MAX_RATIO:
+            return first_seen_category(series)
+    return series
+
+
+def _compact_frame(df: pd.DataFrame, event: str | None = None):
+    before = _frame_bytes(df)
+    if df.empty:
+        return df, before, before
+    compacted = {}
+    for column in df.columns:
+        if column in _COMPACT_SKIP:
+            compacted[column] = df[column]
+        else:
+            compacted[column] = _compact_column(df[column], event)
+    out = pd.DataFrame(compacted, index=df.index)
+    return out, before, _frame_bytes(out)
+
+
+_ROW_FIELDS = ("symbol", "ts", "id")
+_MISSING = float("nan")
+
+
+class _ColumnBuilder:
+    """Flattens log rows (data fields plus symbol, ts, id) into column lists.
+
+    Gives the same frame as pd.DataFrame(list_of_row_dicts) without keeping a
+    dict per row: absent fields are NaN, columns in first-seen order, row
+    fields overriding data fields of the same name. With flat=True rows are
+    already projected (select=field:data->field,...) and taken as they are.
+    """
+
+    def __init__(self, flat: bool = False):
+        self.columns: dict[str, list] = {}
+        self.count = 0
+        self.flat = flat
+
+    def _put(self, key, value):
+        column = self.columns.get(key)
+        if column is None:
+            column = self.columns[key] = [_MISSING] * self.count
+        column.append(value)
+
+    def add(self, batch):
+        if self.flat:
+            for row in batch:
+                for key, value in row.items():
+                    self._put(key, _MISSING if value is None else value)
+                self.count += 1
+            return
+        columns = self.columns
+        for row in batch:
+            data = row.get("data") or {}
+            for key, value in data.items():
+                self._put(key, row.get(key) if key in _ROW_FIELDS else value)
+            width = len(data)
+            for key in _ROW_FIELDS:
+                if key not in data:
+                    self._put(key, row.get(key))
+                    width += 1
+            self.count += 1
+            if len(columns) > width:
+                for column in columns.values():
+                    if len(column) < self.count:
+                        column.append(_MISSING)
+
+    def frame(self) -> pd.DataFrame:
+        if not self.count:
+            return pd.DataFrame()
+        columns = dict(self.columns)
+        columns["ts"] = pd.to_datetime(columns["ts"], unit="ms", utc=True)
+        return pd.DataFrame(columns)
+
+
+class _CsvPages:
+    """Collects the CSV pages of a flat projection into one frame.
+
+    Types come from the pandas C parser per column; empty fields are NaN, so
+    the frame matches the JSON projection for numeric, boolean and text fields.
+    """
+
+    def __init__(self):
+        self.pages: list[pd.DataFrame] = []
+        self.count = 0
+
+    @staticmethod
+    def parse(content: bytes) -> pd.DataFrame:
+        if not content or not content.strip():
+            return pd.DataFrame()
+        return pd.read_csv(
+            io.BytesIO(content),
+            dtype={"symbol": "str", "ts": "int64", "id": "int64"},
+            keep_default_na=False,
+            na_values=[""],
+        )
+
+    def add(self, page: pd.DataFrame):
+        if len(page):
+            self.pages.append(page)
+            self.count += len(page)
+
+    def frame(self) -> pd.DataFrame:
+        if not self.count:
+            return pd.DataFrame()
+        if len(self.pages) == 1:
+            df = self.pages[0]
+        else:
+            # An all-empty column in one page parses as float and would turn a
+            # boolean or text column in another into floats; leave it to concat.
+            columns = self.pages[0].columns
+            df = pd.concat([page.dropna(axis=1, how="all") for page in self.pages], ignore_index=True)
+            df = df.reindex(columns=columns)
+        df["ts"] = pd.to_datetime(df["ts"], unit="ms", utc=True)
+        return df
+
+
+class _PageSizer:
+    """Next page size from the last page's per-row latency and bytes.
+
+    Aims for pages of about LOAD_PAGE_TARGET_SEC and LOAD_PAGE_TARGET_MB,
+    moving at most 2x per page, within [LOAD_PAGE_MIN, LOAD_PAGE_MAX]. Never
+    asks for more than SUPABASE_MAX_ROWS (PostgREST db-max-rows): a short
+    page has to mean the end of the data, not a server-side cap.
+
+    The first page is 1000 rows, which is also the default SUPABASE_MAX_ROWS,
+    so out of the box pages can only shrink. Growing past 1000 needs a higher
+    db-max-rows on the project and SUPABASE_MAX_ROWS set to match.
+    """
+
+    def __init__(self, initial: int = 1000, low: int = LOAD_PAGE_MIN, high: int = LOAD_PAGE_MAX,
+                 target_sec: float = LOAD_PAGE_TARGET_SEC, target_bytes: float = LOAD_PAGE_TARGET_MB * 1024 * 1024,
+                 server_max: int | None = SUPABASE_MAX_ROWS):
+        self.high = max(1, min(high, server_max) if server_max else high)
+        self.low = max(1, min(low, self.high))
+        self.target_sec = target_sec
+        self.target_bytes = target_bytes
+        self.size = self._clamp(initial)
+
+    def _clamp(self, size: float) -> int:
+        return int(min(self.high, max(self.low, size)))
+
+    def observe(self, rows: int, seconds: float, nbytes: int):
+        if rows <= 0:
+            return
+        ideal = float("inf")
+        if seconds > 0:
+            ideal = min(ideal, self.target_sec * rows / seconds)
+        if nbytes > 0:
+            ideal = min(ideal, self.target_bytes * rows / nbytes)
+        self.size = self._clamp(min(max(ideal, self.size / 2), self.size * 2))
+
+
+# ---------- filter pushdown ----------
+
+def _text(value) -> str:
+    # data->>field renders JSON booleans as true/false.
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
 
-def _coerce_rows(batch):
-    rows = []
-    for row in batch:
-        d = row.get("data") or {}
-        d["symbol"] = row.get("symbol")
-        d["ts"] = pd.to_datetime(row["ts"], unit="ms", utc=True)
-        d["id"] = row.get("id")
-        rows.append(d)
-    return rows
 
+def _filter_key(symbols=None, where=None):
+    symbols_key = tuple(sorted({str(s) for s in symbols})) if symbols is not None else None
+    where_key = tuple(sorted((field, _text(value)) for field, value in where.items())) if where else None
+    return symbols_key, where_key
 
-def load_event(event: str, start, end) -> pd.DataFrame:
+
+def _quote(value: str) -> str:
+    if any(ch in value for ch in ',.:()" '):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return value
+
+
+def filter_params(symbols=None, where=None) -> list[tuple[str, str]]:
+    """PostgREST filters for a symbol list and data->>field equality predicates."""
+    symbols_key, where_key = _filter_key(symbols, where)
+    params = []
+    if symbols_key is not None:
+        params.append(("symbol", f"in.({','.join(_quote(s) for s in symbols_key)})"))
+    for field, value in where_key or ():
+        params.append((f"data->>{field}", f"eq.{value}"))
+    return params
+
+
+def _holds_text(series: pd.Series) -> bool:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return all(isinstance(v, str) for v in series.cat.categories)
+    return _is_text_column(series) or bool(series.isna().all())
+
+
+def _apply_filters(df: pd.DataFrame, symbols_key, where, where_key) -> pd.DataFrame | None:
+    """Rows of a cached unfiltered frame the pushed-down filters would return.
+
+    None when that cannot be decided locally: data->>field is compared as the
+    text Postgres renders from jsonb, which str() of a loaded number, bool or
+    NaN does not reproduce, so only string predicates on string columns are
+    applied here.
+    """
+    if where and not all(isinstance(value, str) for value in where.values()):
+        return None
+    mask = pd.Series(True, index=df.index)
+    if symbols_key is not None:
+        if "symbol" not in df.columns:
+            return df.iloc[0:0]
+        mask &= df["symbol"].isin(symbols_key)
+    for field, value in where_key or ():
+        if field not in df.columns:
+            return df.iloc[0:0]
+        if not _holds_text(df[field]):
+            return None
+        mask &= df[field] == value
+    # A server-filtered load comes back with a fresh RangeIndex; match it.
+    return df[mask].reset_index(drop=True)
+
+
+def _fields_key(fields):
+    if not fields:
+        return None
+    return tuple(f for f in dict.fromkeys(str(f) for f in fields) if f not in _ROW_FIELDS) or None
+
+
+def _slice(df: pd.DataFrame, start_ts: int, end_ts: int) -> pd.DataFrame:
+    if df.empty:
+        return df
+    lo, hi = np.searchsorted(df[TS_MS].to_numpy(), [start_ts, end_ts + 1])
+    if lo == hi:
+        return pd.DataFrame()
+    if lo == 0 and hi == len(df):
+        return df
+    out = df.iloc[lo:hi].reset_index(drop=True)
+    # Categories in the window's own first-seen order, as a fetch of just this
+    # window would build them, rather than the cached superset's.
+    for column in out.columns:
+        if isinstance(out[column].dtype, pd.CategoricalDtype):
+            out[column] = first_seen_category(out[column].astype(object))
+    return out
+
+
+def _range_covers(event: str, start_ts: int, end_ts: int) -> bool:
+    with _RUN_CACHE_LOCK:
+        return (event,) in _RUN_CACHE and intervals.contains(
+            _RUN_CACHE_COVERAGE.get(event, []), start_ts, end_ts + 1
+        )
+
+
+def _range_slice(event: str, start_ts: int, end_ts: int):
+    """Cached rows of event in [start_ts, end_ts] and the wire bytes they saved; None unless covered."""
+    key = (event,)
+    with _RUN_CACHE_LOCK:
+        if not _range_covers(event, start_ts, end_ts):
+            return None
+        df = _cache_get(key)
+        wire_bytes = _RUN_CACHE_WIRE_BYTES.get(key, 0)
+    view = _slice(df, start_ts, end_ts)
+    return view, wire_bytes * len(view) // max(1, len(df))
+
+
+def _project(df: pd.DataFrame, fields_key) -> pd.DataFrame:
+    if fields_key is None or not len(df.columns):
+        return df
+    return df.reindex(columns=[*fields_key, *_ROW_FIELDS, TS_MS])
+
+
+def _projection_select(fields_key, text: bool) -> str:
+    arrow = "->>" if text else "->"
+    return ",".join([*(f"{_quote(f)}:data{arrow}{_quote(f)}" for f in fields_key), *_ROW_FIELDS])
+
+
+def load_event(event: str, start, end, *, symbols=None, where: dict | None = None, fields=None) -> pd.DataFrame:
+    """Rows of one event in [start, end].
+
+    symbols keeps rows whose symbol column is in the list, where keeps rows
+    whose data field equals the value (compared as text, like data->>field).
+    Both are applied by PostgREST, or to an unfiltered cached load.
+
+    fields projects the listed data fields (plus symbol, ts, id) instead of
+    fetching whole rows; with LOAD_WIRE_FORMAT=csv the projection is read as
+    CSV rather than JSON.
+    """
+    with span("load_event", event=event) as load_span:
+        return _load_event(event, start, end, load_span, symbols, where, fields)
+
+
+def _load_event(event: str, start, end, load_span, symbols=None, where=None, fields=None) -> pd.DataFrame:
     start_ts = int(start.timestamp() * 1000)
     end_ts = int(end.timestamp() * 1000)
-    cache_key = (event, start_ts, end_ts)
-    if cache_key in _RUN_CACHE:
-        return _RUN_CACHE[cache_key].copy()
+    symbols_key, where_key = _filter_key(symbols, where)
+    fields_key = _fields_key(fields)
+    filtered = symbols_key is not None or where_key is not None
+    if not filtered and fields_key is None:
+        return _load_range(event, start_ts, end_ts, load_span)
+
+    cache_key = (event, start_ts, end_ts, symbols_key, where_key, fields_key)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        METRICS.add_load_phase(event, cache_hits=1, cache_bytes_saved=_RUN_CACHE_WIRE_BYTES.get(cache_key, 0))
+        load_span.set(cache="hit", rows=len(cached))
+        return _cached_view(cached)
+
+    # Whole rows with the same filters, then the unfiltered range, can serve a projection.
+    source, label = None, "hit_unprojected"
+    if fields_key is not None and filtered:
+        source = _cache_get((event, start_ts, end_ts, symbols_key, where_key, None))
+    if source is None:
+        hit = _range_slice(event, start_ts, end_ts)
+        if hit is not None:
+            source, label = _apply_filters(hit[0], symbols_key, where, where_key), "hit_unfiltered"
+    if source is not None:
+        METRICS.add_load_phase(event, cache_hits=1)
+        view = _project(source, fields_key)
+        load_span.set(cache=label, rows=len(view))
+        return _cached_view(view)
 
-    rows = []
-    limit = 1000
-    cursor_ts = start_ts
+    builders, wire_bytes = _fetch_pages([event], start_ts, end_ts, symbols, where, event, fields_key)
+    df = _store_frame(event, cache_key, builders[event], wire_bytes)
+    load_span.set(cache="miss", rows=len(df), bytes=wire_bytes)
+    return _cached_view(df)
+
+
+def _load_range(event: str, start_ts: int, end_ts: int, load_span) -> pd.DataFrame:
+    """Unfiltered rows in [start_ts, end_ts]: sliced from the (event,) frame, fetching only uncovered gaps."""
+    hit = _range_slice(event, start_ts, end_ts)
+    if hit is not None:
+        view, saved = hit
+        METRICS.add_load_phase(event, cache_hits=1, cache_bytes_saved=saved)
+        load_span.set(cache="hit", rows=len(view))
+        return _cached_view(view)
+
+    with _RUN_CACHE_LOCK:
+        covered = _RUN_CACHE_COVERAGE.get(event, [])
+    gaps = intervals.gaps(covered, start_ts, end_ts + 1)
+    wire_bytes = 0
+    df, covered_after = pd.DataFrame(), []
+    for gap_start, gap_end in gaps:
+        builders, gap_bytes = _fetch_pages([event], gap_start, gap_end - 1, None, None, event)
+        df, covered_after = _store_range(event, gap_start, gap_end - 1, builders[event], gap_bytes)
+        wire_bytes += gap_bytes
+    if not intervals.contains(covered_after, start_ts, end_ts + 1):
+        # The cached part was evicted while the gaps were fetched.
+        builders, window_bytes = _fetch_pages([event], start_ts, end_ts, None, None, event)
+        df, _ = _store_range(event, start_ts, end_ts, builders[event], window_bytes)
+        wire_bytes += window_bytes
+    view = _slice(df, start_ts, end_ts)
+    load_span.set(cache="partial" if covered else "miss", rows=len(view), bytes=wire_bytes)
+    return _cached_view(view)
+
+
+def _fetch_pages(events: list[str], start_ts: int, end_ts: int, symbols, where, phase: str, fields_key=None):
+    """Pages through logs for one or more events; rows come back grouped by event.
+
+    Load phases (pages, wait, bytes, decode, coerce) are recorded under `phase`.
+    A projection (fields_key) is for a single event only.
+    """
+    csv_wire = fields_key is not None and LOAD_WIRE_FORMAT == "csv"
+    if csv_wire:
+        builders = {events[0]: _CsvPages()}
+        headers = {**HEADERS, "Accept": "text/csv"}
+    else:
+        builders = {event: _ColumnBuilder(flat=fields_key is not None) for event in events}
+        headers = HEADERS
+    select = "*" if fields_key is None else _projection_select(fields_key, text=csv_wire)
+    stream_json = LOAD_STREAM and not csv_wire
+    event_filter = f"eq.{events[0]}" if len(events) == 1 else f"in.({','.join(events)})"
+    pager = _PageSizer()
+    # limit is part of the archived request key; a latency-driven size would
+    # differ between a recording and its replay, so it stays fixed under one.
+    adaptive = not archive_open()
+    # Keyset cursor on (ts, id): exact across pages that end inside a run of
+    # identical timestamps, with no overlap to de-duplicate.
+    cursor = None
+    wire_bytes = 0
 
     while True:
+        limit = pager.size
         params = [
-            ("select", "*"),
-            ("event", f"eq.{event}"),
-            ("ts", f"gte.{cursor_ts}"),
+            ("select", select),
+            ("event", event_filter),
+            ("ts", f"gte.{start_ts}"),
             ("ts", f"lte.{end_ts}"),
-            ("order", "ts.asc"),
+            *filter_params(symbols, where),
+            ("order", "ts.asc,id.asc"),
             ("limit", limit),
         ]
+        if cursor is not None:
+            params.append(("or", f"(ts.gt.{cursor[0]},and(ts.eq.{cursor[0]},id.gt.{cursor[1]}))"))
 
-        METRICS.request_count += 1
-        r = request_with_retry(
-            "GET",
-            f"{SUPABASE_URL}/rest/v1/logs",
-            headers=HEADERS,
-            params=params,
+        METRICS.add(request_count=1)
+        with span("load_event.page", cursor_ts=cursor[0] if cursor else start_ts, limit=limit) as page_span:
+            t0 = perf_counter()
+            r = request_with_retry(
+                "GET",
+                f"{SUPABASE_URL}/rest/v1/logs",
+                headers=headers,
+                params=params,
+                stream=stream_json,
+            )
+            t1 = perf_counter()
+            decode_sec = coerce_sec = 0.0
+            page_rows = 0
+            if csv_wire:
+                page = _CsvPages.parse(r.content)
+                decode_sec = perf_counter() - t1
+                page_rows = len(page)
+                if page_rows:
+                    builders[events[0]].add(page)
+                    cursor = (int(page["ts"].iat[-1]), int(page["id"].iat[-1]))
+            else:
+                stream = JsonArrayStream(r, LOAD_STREAM_BATCH_ROWS) if stream_json else None
+                batches = iter(stream) if stream is not None else iter([decode_json(r)])
+                while True:
+                    t = perf_counter()
+                    batch = next(batches, None)
+                    decode_sec += perf_counter() - t
+                    if batch is None:
+                        break
+                    if not batch:
+                        continue
+                    t = perf_counter()
+                    _add_rows(builders, batch)
+                    coerce_sec += perf_counter() - t
+                    page_rows += len(batch)
+                    cursor = (batch[-1]["ts"], batch[-1]["id"])
+            page_bytes = stream.bytes_read if stream_json else len(r.content or b"")
+            page_span.set(rows=page_rows, bytes=page_bytes)
+        wire_bytes += page_bytes
+        METRICS.add(payload_rows_in=page_rows)
+        METRICS.add_load_phase(
+            phase,
+            pages=1,
+            wait_sec=t1 - t0,
+            bytes=page_bytes,
+            decode_sec=decode_sec,
+            coerce_sec=coerce_sec,
         )
 
-        batch = r.json()
-        if not batch:
+        if page_rows < limit:
             break
+        if adaptive:
+            pager.observe(page_rows, perf_counter() - t0 - coerce_sec, page_bytes)
 
-        chunk_rows = _coerce_rows(batch)
-        rows.extend(chunk_rows)
-        METRICS.payload_rows_in += len(chunk_rows)
+    return builders, wire_bytes
 
-        last_ts = int(pd.Timestamp(chunk_rows[-1]["ts"]).timestamp() * 1000)
-        if last_ts == cursor_ts and len(batch) >= limit:
-            cursor_ts += 1
-        else:
-            cursor_ts = last_ts + 1
 
-        if len(batch) < limit or cursor_ts > end_ts:
-            break
+def _add_rows(builders: dict, batch: list) -> None:
+    if len(builders) == 1:
+        next(iter(builders.values())).add(batch)
+        return
+    grouped: dict[str, list] = {}
+    for row in batch:
+        grouped.setdefault(row.get("event"), []).append(row)
+    for event, rows in grouped.items():
+        builder = builders.get(event)
+        if builder is None:
+            builder = builders[event] = _ColumnBuilder()
+        builder.add(rows)
 
-    df = pd.DataFrame(rows)
-    _RUN_CACHE[cache_key] = df
-    return df.copy()
+
+def _build_frame(event: str, builder) -> pd.DataFrame:
+    t0 = perf_counter()
+    frame = apply_schema(event, builder.frame())
+    t1 = perf_counter()
+    df, raw_bytes, compact_bytes = _compact_frame(frame, event)
+    METRICS.add(frame_bytes_raw=raw_bytes, frame_bytes_compact=compact_bytes)
+    METRICS.add_load_phase(event, cache_misses=1, frame_sec=t1 - t0, compact_sec=perf_counter() - t1)
+    return df
+
+
+def _store_frame(event: str, cache_key, builder, wire_bytes: int) -> pd.DataFrame:
+    df = _build_frame(event, builder)
+    _cache_put(cache_key, df, wire_bytes)
+    return df
+
+
+def _merge_range(cached: pd.DataFrame, fresh: pd.DataFrame, start_ts: int, end_ts: int) -> pd.DataFrame:
+    parts = []
+    if not cached.empty:
+        ts = cached[TS_MS]
+        parts.append(cached[(ts < start_ts) | (ts > end_ts)])
+    parts = [part for part in (*parts, fresh) if len(part)]
+    if not parts:
+        return pd.DataFrame()
+    if len(parts) == 1:
+        return parts[0].reset_index(drop=True)
+    merged = pd.concat(parts, ignore_index=True)
+    merged = merged.sort_values(TS_MS, kind="stable", ignore_index=True)
+    # concat only keeps a categorical when every part has the same categories;
+    # rebuild it in first-seen order, as a single load would have.
+    for column in merged.columns:
+        if any(column in part.columns and isinstance(part[column].dtype, pd.CategoricalDtype) for part in parts):
+            merged[column] = first_seen_category(merged[column].astype(object))
+    return merged
+
+
+def _store_range(event: str, start_ts: int, end_ts: int, builder, wire_bytes: int):
+    """Merges rows fetched for [start_ts, end_ts] into the (event,) frame.
+
+    Returns the merged frame and the ranges it covers, also when it was too
+    large to cache.
+    """
+    df = _build_frame(event, builder)
+    key = (event,)
+    with _RUN_CACHE_LOCK:
+        cached = _cache_get(key)
+        covered = []
+        if cached is not None:
+            df = _merge_range(cached, df, start_ts, end_ts)
+            covered = _RUN_CACHE_COVERAGE.get(event, [])
+            wire_bytes += _RUN_CACHE_WIRE_BYTES.get(key, 0)
+        covered = intervals.add(covered, start_ts, end_ts + 1)
+        if _cache_put(key, df, wire_bytes):
+            _RUN_CACHE_COVERAGE[event] = covered
+    return df, covered
+
+
+def load_events(events, start, end) -> dict[str, pd.DataFrame]:
+    """Unfiltered frames for several events over one window, cached for load_event.
+
+    Events in LOAD_SPARSE_EVENTS share one event=in.(...) scan, since each
+    usually fits in a single page; the rest page separately, up to
+    LOAD_PARALLELISM at a time.
+    """
+    start_ts = int(start.timestamp() * 1000)
+    end_ts = int(end.timestamp() * 1000)
+    events = list(dict.fromkeys(events))
+    missing = [event for event in events if not _range_covers(event, start_ts, end_ts)]
+    sparse = sorted(event for event in missing if event in LOAD_SPARSE_EVENTS)
+    dense = [event for event in missing if event not in LOAD_SPARSE_EVENTS]
+
+    tasks = [lambda event=event: load_event(event, start, end) for event in dense]
+    if len(sparse) > 1:
+        tasks.append(lambda: _load_sparse_batch(sparse, start_ts, end_ts))
+    else:
+        tasks.extend(lambda event=event: load_event(event, start, end) for event in sparse)
+
+    if len(tasks) > 1 and LOAD_PARALLELISM > 1:
+        with ThreadPoolExecutor(max_workers=LOAD_PARALLELISM, thread_name_prefix="load-events") as pool:
+            for future in [pool.submit(copy_context().run, task) for task in tasks]:
+                future.result()
+    else:
+        for task in tasks:
+            task()
+
+    frames = {}
+    for event in events:
+        hit = _range_slice(event, start_ts, end_ts)
+        # Over the cache budget a frame may already be gone; load it again.
+        frames[event] = _cached_view(hit[0]) if hit is not None else load_event(event, start, end)
+    return frames
+
+
+def _load_sparse_batch(events: list[str], start_ts: int, end_ts: int) -> None:
+    phase = "+".join(events)
+    with span("load_events", events=phase) as batch_span:
+        builders, wire_bytes = _fetch_pages(events, start_ts, end_ts, None, None, phase)
+        total = sum(builders[event].count for event in events) or 1
+        for event in events:
+            builder = builders[event]
+            # Wire bytes are shared; attribute them by row share for cache savings.
+            _store_range(event, start_ts, end_ts, builder, wire_bytes * builder.count // total)
+        batch_span.set(rows=total, bytes=wire_bytes)
@@ -0,0 +1,790 @@
+# local_supabase.py
+#
+# In-memory PostgREST stand-in for offline performance work:
+#
+#   python local_supabase.py --port 54321 --latency-ms 40 --jitter-ms 20 --error-rate 0.01
+#   SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_KEY=local python main.py
+#
+# Implements the subset of PostgREST the pipeline uses: eq/neq/gt/gte/lt/lte/in/is
+# filters, or=(...)/and=(...) groups, order, limit/offset, select, Prefer resolution=merge-duplicates and
+# return=representation, on_conflict, PATCH and rpc/increment_counter. GETs with
+# Accept: text/csv get CSV, as PostgREST renders it.
+import argparse
+import bisect
+import csv
+import heapq
+import io
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+
+# Primary/unique keys of the live tables the pipeline writes with on_conflict or
+# relies on for 409s (daily_job_runs is the daily lock).
+DEFAULT_UNIQUE_KEYS = {
+    "daily_job_runs": ("date",),
+    "daily_deribit_vbi": ("date_utc", "symbol"),
+    "cross_layer_events": ("event_key",),
+}
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+_INF = float("inf")
+
+
+class PostgrestError(Exception):
+    def __init__(self, status: int, message: str, code: str = "PGRST000"):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.code = code
+
+
+# ---------- query parsing ----------
+
+def _split_top_level(text: str, sep: str = ",") -> list[str]:
+    parts, depth, quoted, current = [], 0, False, []
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == sep and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    parts.append("".join(current))
+    return parts
+
+
+def _parse_in_list(text: str) -> list[str]:
+    if not (text.startswith("(") and text.endswith(")")):
+        raise PostgrestError(400, f"invalid in list: {text}")
+    inner = text[1:-1]
+    if not inner:
+        return []
+    return [item.strip().strip('"') for item in _split_top_level(inner)]
+
+
+def column_value(row: dict, column: str):
+    if "->>" in column:
+        base, key = column.split("->>", 1)
+        value = (row.get(base) or {}).get(key)
+        if value is None or isinstance(value, str):
+            return value
+        return json.dumps(value) if isinstance(value, (dict, list)) else _text(value)
+    if "->" in column:
+        base, key = column.split("->", 1)
+        return (row.get(base) or {}).get(key)
+    return row.get(column)
+
+
+def _text(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _compare_pair(actual, raw: str):
+    if isinstance(actual, bool):
+        return actual, raw.lower() in {"true", "t", "1"}
+    if isinstance(actual, (int, float)):
+        try:
+            return actual, float(raw)
+        except ValueError:
+            return _text(actual), raw
+    if isinstance(actual, str):
+        try:
+            return float(actual), float(raw)
+        except ValueError:
+            return actual, raw
+    return _text(actual), raw
+
+
+class Filter:
+    def __init__(self, column: str, op: str, value: str, negate: bool = False):
+        self.column = column
+        self.op = op
+        self.value = value
+        self.negate = negate
+        self.values = _parse_in_list(value) if op == "in" else None
+
+    @classmethod
+    def parse(cls, column: str, expr: str) -> "Filter":
+        negate = False
+        if expr.startswith("not."):
+            negate, expr = True, expr[4:]
+        op, _, value = expr.partition(".")
+        if op not in {"eq", "neq", "gt", "gte", "lt", "lte", "in", "is"}:
+            raise PostgrestError(400, f"unsupported operator: {op}", "PGRST100")
+        return cls(column, op, value, negate)
+
+    def matches(self, row: dict) -> bool:
+        return self._matches(row) != self.negate
+
+    def _matches(self, row: dict) -> bool:
+        actual = column_value(row, self.column)
+        if self.op == "is":
+            if self.value == "null":
+                return actual is None
+            return actual is (self.value == "true")
+        if actual is None:
+            return False
+        if self.op == "in":
+            return any(_eq(actual, item) for item in self.values)
+        if self.op == "eq":
+            return _eq(actual, self.value)
+        if self.op == "neq":
+            return not _eq(actual, self.value)
+        left, right = _compare_pair(actual, self.value)
+        try:
+            if self.op == "gt":
+                return left > right
+            if self.op == "gte":
+                return left >= right
+            if self.op == "lt":
+                return left < right
+            return left <= right
+        except TypeError:
+            return False
+
+
+class LogicalFilter:
+    """or=(a,b) / and=(a,and(b,c)) groups; children are column.op.value terms."""
+
+    column = None
+    negate = False
+
+    def __init__(self, op: str, children: list):
+        self.op = op
+        self.children = children
+
+    @classmethod
+    def parse(cls, op: str, expr: str) -> "LogicalFilter":
+        if not (expr.startswith("(") and expr.endswith(")")):
+            raise PostgrestError(400, f"invalid logic tree: {op}={expr}", "PGRST100")
+        children = []
+        for item in _split_top_level(expr[1:-1]):
+            item = item.strip()
+            negate = item.startswith("not.")
+            body = item[4:] if negate else item
+            head, _, rest = body.partition("(")
+            if head in {"and", "or"} and rest:
+                child = cls.parse(head, "(" + rest)
+                child.negate = negate
+            else:
+                column, _, term = item.partition(".")
+                if not term:
+                    raise PostgrestError(400, f"invalid filter term: {item}", "PGRST100")
+                child = Filter.parse(column, term)
+            children.append(child)
+        return cls(op, children)
+
+    def matches(self, row: dict) -> bool:
+        combine = any if self.op == "or" else all
+        return combine(child.matches(row) for child in self.children) != self.negate
+
+    def keyset_after(self) -> tuple | None:
+        # Recognises the (ts, id) cursor or=(ts.gt.X,and(ts.eq.X,id.gt.Y)) so
+        # paging can bisect the event index instead of rescanning the window.
+        if self.op != "or" or self.negate or len(self.children) != 2:
+            return None
+        after, tie = self.children
+        if not isinstance(after, Filter) or not isinstance(tie, LogicalFilter) or tie.op != "and":
+            return None
+        terms = {(c.column, c.op): c.value for c in tie.children if isinstance(c, Filter) and not c.negate}
+        if (after.column, after.op, after.negate) != ("ts", "gt", False) or len(terms) != 2:
+            return None
+        if terms.get(("ts", "eq")) != after.value or ("id", "gt") not in terms:
+            return None
+        try:
+            return float(after.value), float(terms[("id", "gt")])
+        except ValueError:
+            return None
+
+
+def parse_filter(key: str, value: str):
+    if key in {"or", "and"}:
+        return LogicalFilter.parse(key, value)
+    return Filter.parse(key, value)
+
+
+def _eq(actual, raw: str) -> bool:
+    left, right = _compare_pair(actual, raw)
+    return left == right
+
+
+def parse_order(text: str | None) -> list[tuple[str, bool]]:
+    if not text:
+        return []
+    out = []
+    for part in _split_top_level(text):
+        pieces = part.split(".")
+        column = pieces[0]
+        desc = "desc" in pieces[1:]
+        out.append((column, desc))
+    return out
+
+
+def _order_key(order: list[tuple[str, bool]]):
+    def key(row):
+        out = []
+        for column, desc in order:
+            value = column_value(row, column)
+            # PostgREST default: nulls last for asc, first for desc.
+            missing = value is None
+            if desc:
+                out.append((not missing, _Desc(value)))
+            else:
+                out.append((missing, value if not missing else 0))
+        return out
+    return key
+
+
+class _Desc:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        if self.value is None or other.value is None:
+            return False
+        return self.value > other.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def parse_select(text: str | None) -> list[tuple[str, str]] | None:
+    if not text or text.strip() == "*":
+        return None
+    columns = []
+    for part in _split_top_level(text):
+        part = part.strip()
+        if not part:
+            continue
+        alias, sep, expr = part.partition(":")
+        if not sep:
+            expr = alias
+            alias = expr.split("->")[-1].lstrip(">")
+        columns.append((alias, expr))
+    return columns
+
+
+def project(row: dict, columns: list[tuple[str, str]] | None) -> dict:
+    if columns is None:
+        return dict(row)
+    out = {}
+    for alias, expr in columns:
+        if expr == "*":
+            out.update(row)
+        else:
+            out[alias] = column_value(row, expr)
+    return out
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return _text(value)
+
+
+def to_csv(rows: list[dict]) -> bytes:
+    """CSV body for rows: header from the first row, nulls as empty fields."""
+    if not rows:
+        return b""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    columns = list(rows[0])
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(row.get(column)) for column in columns])
+    return out.getvalue().encode("utf-8")
+
+
+# ---------- storage ----------
+
+class _Table:
+    def __init__(self, name: str, unique_key: tuple[str, ...] | None):
+        self.name = name
+        self.unique_key = unique_key
+        self.rows: list[dict] = []
+        self.by_id: dict = {}
+        self.next_id = 1
+        # event -> (sorted (ts, id) keys, rows in the same order) for log-style tables
+        self.event_index: dict[str, tuple[list, list]] = {}
+
+    def _index(self, row: dict):
+        event = row.get("event")
+        ts = row.get("ts")
+        if event is None or not isinstance(ts, (int, float)):
+            return
+        keys, rows = self.event_index.setdefault(event, ([], []))
+        key = (ts, row.get("id") or 0)
+        if not keys or key >= keys[-1]:
+            keys.append(key)
+            rows.append(row)
+        else:
+            pos = bisect.bisect_right(keys, key)
+            keys.insert(pos, key)
+            rows.insert(pos, row)
+
+    def add(self, row: dict) -> dict:
+        if row.get("id") is None:
+            row["id"] = self.next_id
+        if isinstance(row["id"], int):
+            self.next_id = max(self.next_id, row["id"] + 1)
+        self.rows.append(row)
+        self.by_id[row["id"]] = row
+        self._index(row)
+        return row
+
+    def find_conflict(self, row: dict, columns: tuple[str, ...]) -> dict | None:
+        if columns == ("id",):
+            return self.by_id.get(row.get("id"))
+        target = tuple(row.get(c) for c in columns)
+        if any(v is None for v in target):
+            return None
+        for existing in self.rows:
+            if tuple(existing.get(c) for c in columns) == target:
+                return existing
+        return None
+
+
+class LocalStore:
+    def __init__(self, unique_keys: dict | None = None):
+        self.unique_keys = {**DEFAULT_UNIQUE_KEYS, **(unique_keys or {})}
+        self.tables: dict[str, _Table] = {}
+        self.counters: dict[str, int] = {}
+        self.writes: list[dict] = []
+        self._lock = threading.RLock()
+
+    def table(self, name: str) -> _Table:
+        table = self.tables.get(name)
+        if table is None:
+            table = self.tables[name] = _Table(name, self.unique_keys.get(name))
+        return table
+
+    def load(self, table: str, rows) -> int:
+        with self._lock:
+            target = self.table(table)
+            count = 0
+            for row in rows:
+                target.add(dict(row))
+                count += 1
+            return count
+
+    def reset(self, keep=("logs",)) -> None:
+        with self._lock:
+            self.tables = {name: table for name, table in self.tables.items() if name in keep}
+            self.counters.clear()
+            self.writes.clear()
+
+    def _candidates(self, table: _Table, filters: list[Filter], order):
+        events = None
+        lower, upper = (-_INF, -_INF), (_INF, _INF)
+        for f in filters:
+            if isinstance(f, LogicalFilter):
+                after = f.keyset_after()
+                if after is not None:
+                    lower = max(lower, (after[0], math.nextafter(after[1], _INF)))
+                continue
+            if f.negate:
+                continue
+            if f.column == "event" and f.op == "eq":
+                events = [f.value]
+            elif f.column == "event" and f.op == "in":
+                events = list(f.values)
+            elif f.column == "ts" and f.op in {"gt", "gte", "lt", "lte"}:
+                try:
+                    bound = float(f.value)
+                except ValueError:
+                    continue
+                if f.op == "gte":
+                    lower = max(lower, (bound, -_INF))
+                elif f.op == "gt":
+                    lower = max(lower, (bound, _INF))
+                elif f.op == "lte":
+                    upper = min(upper, (bound, _INF))
+                else:
+                    upper = min(upper, (bound, -_INF))
+
+        if events is None or not table.event_index:
+            return table.rows, False
+
+        slices = []
+        for event in events:
+            keys, rows = table.event_index.get(event, ([], []))
+            lo = bisect.bisect_left(keys, lower)
+            hi = bisect.bisect_left(keys, upper)
+            slices.append(rows[lo:hi])
+
+        presorted = all(col in {"ts", "id"} and not desc for col, desc in order) and [
+            col for col, _ in order
+        ] == ["ts", "id"][: len(order)]
+        if presorted:
+            if len(slices) == 1:
+                return slices[0], True
+            return heapq.merge(*slices, key=lambda r: (r["ts"], r["id"])), True
+        return itertools.chain.from_iterable(slices), False
+
+    def select(self, name: str, filters: list[Filter], order=None, limit=None, offset=0, columns=None) -> list[dict]:
+        order = order or []
+        with self._lock:
+            table = self.table(name)
+            candidates, presorted = self._candidates(table, filters, order)
+            matched = (row for row in candidates if all(f.matches(row) for f in filters))
+            if order and not presorted:
+                matched = iter(sorted(matched, key=_order_key(order)))
+            stop = None if limit is None else offset + limit
+            return [project(row, columns) for row in itertools.islice(matched, offset, stop)]
+
+    def insert(self, name: str, rows: list[dict], *, merge: bool, on_conflict: tuple[str, ...] | None) -> list[dict]:
+        with self._lock:
+            table = self.table(name)
+            conflict_columns = on_conflict or table.unique_key or ("id",)
+            planned = []
+            seen = set()
+            for row in rows:
+                row = dict(row)
+                existing = table.find_conflict(row, conflict_columns)
+                if existing is None and conflict_columns != ("id",) and row.get("id") is not None:
+                    existing = table.by_id.get(row["id"])
+                batch_key = tuple(row.get(c) for c in conflict_columns)
+                if (existing is not None or batch_key in seen) and not merge:
+                    raise PostgrestError(409, f'duplicate key value violates unique constraint on "{name}"', "23505")
+                if all(v is not None for v in batch_key):
+                    seen.add(batch_key)
+                planned.append((row, existing))
+
+            out = []
+            for row, existing in planned:
+                if existing is not None:
+                    existing.update(row)
+                    out.append(dict(existing))
+                else:
+                    out.append(dict(table.add(row)))
+            return out
+
+    def update(self, name: str, filters: list[Filter], patch: dict) -> list[dict]:
+        with self._lock:
+            table = self.table(name)
+            out = []
+            for row in table.rows:
+                if all(f.matches(row) for f in filters):
+                    row.update(patch)
+                    out.append(dict(row))
+            return out
+
+    def increment_counter(self, counter_name: str) -> int:
+        with self._lock:
+            value = self.counters.get(counter_name, 0) + 1
+            self.counters[counter_name] = value
+            return value
+
+    def record_write(self, entry: dict) -> None:
+        with self._lock:
+            self.writes.append(entry)
+
+
+# ---------- HTTP layer ----------
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, delayed ACKs
+    # add ~40 ms to every keep-alive request and swamp the timings.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_HEAD(self):
+        self._dispatch("HEAD")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def _dispatch(self, method: str):
+        server: LocalSupabase = self.server.owner
+        started = time.perf_counter()
+        status = 500
+        try:
+            body = self._read_body()
+            fault = server.draw_fault()
+            server.sleep_latency()
+            if fault is not None:
+                status, payload, headers = fault
+            else:
+                status, payload, headers = server.handle(method, self.path, self.headers, body)
+        except PostgrestError as err:
+            status, headers = err.status, {}
+            payload = {"code": err.code, "message": err.message, "details": None, "hint": None}
+        except Exception as err:  # pragma: no cover - surfaced to the client as a 500
+            status, headers = 500, {}
+            payload = {"code": "XX000", "message": str(err), "details": None, "hint": None}
+
+        self._send(method, status, payload, headers)
+        server.record_request(method, self.path, status, time.perf_counter() - started)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        raw = self.rfile.read(length)
+        return json.loads(raw) if raw else None
+
+    def _send(self, method: str, status: int, payload, headers: dict):
+        if isinstance(payload, bytes):
+            data = payload
+        elif payload is None:
+            data = b""
+        else:
+            data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        if data and "Content-Type" not in headers:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if method != "HEAD" and data:
+            self.wfile.write(data)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LocalSupabase:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        store: LocalStore | None = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after_sec: int = 1,
+        max_rows: int | None = None,
+        seed: int = 0,
+    ):
+        self.host = host
+        self.port = port
+        self.store = store or LocalStore()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after_sec = retry_after_sec
+        self.max_rows = max_rows
+        self.requests: list[dict] = []
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._server: _Server | None = None
+        self._thread: threading.Thread | None = None
+
+    # ---------- lifecycle ----------
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("LocalSupabase is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalSupabase":
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.owner = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="local-supabase",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------- fault injection ----------
+
+    def draw_fault(self):
+        with self._random_lock:
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return 429, {"code": "429", "message": "rate limited"}, {"Retry-After": str(self.retry_after_sec)}
+        if roll < self.throttle_rate + self.error_rate:
+            return 503, {"code": "503", "message": "injected upstream error"}, {}
+        return None
+
+    def sleep_latency(self) -> None:
+        if not self.latency_ms and not self.jitter_ms:
+            return
+        with self._random_lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+    def record_request(self, method: str, path: str, status: int, seconds: float) -> None:
+        with self._random_lock:
+            self.requests.append({"method": method, "path": path, "status": status, "seconds": seconds})
+
+    # ---------- PostgREST semantics ----------
+
+    def handle(self, method: str, raw_path: str, headers, body):
+        parts = urlsplit(raw_path)
+        if not parts.path.startswith("/rest/v1/"):
+            raise PostgrestError(404, f"unknown path: {parts.path}", "PGRST125")
+        resource = parts.path[len("/rest/v1/"):].strip("/")
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        prefer = {item.strip() for item in (headers.get("Prefer") or "").split(",") if item.strip()}
+
+        if resource.startswith("rpc/"):
+            return self._rpc(resource[4:], body)
+
+        filters = [parse_filter(key, value) for key, value in params if key not in RESERVED_PARAMS]
+        options = {key: value for key, value in params if key in RESERVED_PARAMS}
+
+        if method in {"GET", "HEAD"}:
+            status, rows, response_headers = self._get(resource, filters, options)
+            if "text/csv" in (headers.get("Accept") or ""):
+                return status, to_csv(rows), {**response_headers, "Content-Type": "text/csv; charset=utf-8"}
+            return status, rows, response_headers
+        if method == "POST":
+            return self._post(resource, options, prefer, body)
+        if method == "PATCH":
+            return self._patch(resource, filters, prefer, body, params)
+        raise PostgrestError(405, f"method not allowed: {method}")
+
+    def _get(self, resource: str, filters: list[Filter], options: dict):
+        limit = int(options["limit"]) if "limit" in options else None
+        if self.max_rows is not None:
+            limit = self.max_rows if limit is None else min(limit, self.max_rows)
+        offset = int(options.get("offset") or 0)
+        rows = self.store.select(
+            resource,
+            filters,
+            order=parse_order(options.get("order")),
+            limit=limit,
+            offset=offset,
+            columns=parse_select(options.get("select")),
+        )
+        end = offset + len(rows) - 1
+        content_range = f"{offset}-{end}/*" if rows else "*/*"
+        return 200, rows, {"Content-Range": content_range}
+
+    def _post(self, resource: str, options: dict, prefer: set, body):
+        rows = body if isinstance(body, list) else [body or {}]
+        on_conflict = tuple(c.strip() for c in options["on_conflict"].split(",")) if options.get("on_conflict") else None
+        merge = "resolution=merge-duplicates" in prefer
+        self.store.record_write({
+            "method": "POST",
+            "table": resource,
+            "on_conflict": options.get("on_conflict"),
+            "prefer": sorted(prefer),
+            "body": body,
+        })
+        stored = self.store.insert(resource, rows, merge=merge, on_conflict=on_conflict)
+        if "return=representation" in prefer:
+            return 201, stored, {}
+        return 201, None, {}
+
+    def _patch(self, resource: str, filters: list[Filter], prefer: set, body, params):
+        self.store.record_write({
+            "method": "PATCH",
+            "table": resource,
+            "params": params,
+            "prefer": sorted(prefer),
+            "body": body,
+        })
+        updated = self.store.update(resource, filters, body or {})
+        if "return=representation" in prefer:
+            return 200, updated, {}
+        return 204, None, {}
+
+    def _rpc(self, name: str, body):
+        if name != "increment_counter":
+            raise PostgrestError(404, f"Could not find the function public.{name}", "PGRST202")
+        counter_name = (body or {}).get("counter_name")
+        if not counter_name:
+            raise PostgrestError(400, "counter_name is required", "PGRST102")
+        return 200, self.store.increment_counter(counter_name), {}
+
+
+def _load_jsonl(path: str):
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local PostgREST-compatible Supabase stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--max-rows", type=int, default=None, help="server-side page size cap")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load", action="append", default=[], help="JSON-lines file of logs rows to preload")
+    args = parser.parse_args()
+
+    server = LocalSupabase(
+        args.host,
+        args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_rows=args.max_rows,
+        seed=args.seed,
+    )
+    for path in args.load:
+        count = server.store.load("logs", _load_jsonl(path))
+        print(f"Loaded {count} rows into logs from {path}.")
+
+    server.start()
+    print(f"Local Supabase listening on {server.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
 # main.py
+import tracemalloc
 import uuid
 from time import perf_counter
 
+from config import LOAD_PREFETCH, METRICS_PROM_FILE, METRICS_TRACEMALLOC
+
 from window import analysis_window_utc
 from job_log import acquire_daily_lock, finish_daily_job
-from observability import log_event
+from loaders import load_events
+from observability import log_event, write_prometheus_textfile
+from perf_history import record_run_performance
+from profiling import profiler_for_run
 from runtime_metrics import METRICS
+from tracing import TRACER, export_trace, span
 
 from deribit_daily import run_deribit_daily
 from options_daily import run_options_daily
@@ -28,6 +35,19 @@ MODULES = [
     ("validation", run_validation_daily),
 ]
 
+# Events the modules above load over the full analysis window.
+PREFETCH_EVENTS = [
+    "risk_eval",
+    "options_ticker_cycle",
+    "deribit_vbi_snapshot",
+    "bybit_market_state",
+    "okx_market_state",
+    "options_market_state",
+    "alert_sent",
+    "risk_divergence",
+    "market_regime",
+]
+
 
 def main():
     run_id = str(uuid.uuid4())
@@ -37,42 +57,70 @@ def main():
         log_event("daily.skipped", run_id=run_id, reason="lock_denied")
         return
 
+    if METRICS_TRACEMALLOC and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
     status = "ok"
     module_status = {}
+    profiler = profiler_for_run(run_id)
+    TRACER.start_trace(run_id)
 
     try:
-        start, end = analysis_window_utc()
-        log_event("daily.started", run_id=run_id, window_start=start.isoformat(), window_end=end.isoformat())
-
-        for module_name, runner in MODULES:
-            METRICS.start(module_name)
+        with span("run", run_id=run_id) as run_span:
             try:
-                runner(start, end)
-                module_status[module_name] = "ok"
-                log_event("daily.module.ok", run_id=run_id, module=module_name)
-            except Exception as err:
-                status = "failed"
-                module_status[module_name] = f"failed:{type(err).__name__}"
-                log_event("daily.module.failed", run_id=run_id, module=module_name, error=str(err))
-            finally:
-                METRICS.stop(module_name)
+                start, end = analysis_window_utc()
+                log_event("daily.started", run_id=run_id, window_start=start.isoformat(), window_end=end.isoformat())
 
-        ts_from = int(start.timestamp() * 1000)
-        ts_to = int(end.timestamp() * 1000)
-        try:
-            process_cross_layer_daily_window(ts_from, ts_to)
-            module_status["cross_layer"] = "ok"
-            log_event("daily.cross_layer.ok", run_id=run_id)
-        except Exception as err:
-            module_status["cross_layer"] = f"failed_isolated:{type(err).__name__}"
-            log_event("daily.cross_layer.failed", run_id=run_id, error=str(err))
+                if LOAD_PREFETCH:
+                    try:
+                        with (
+                            METRICS.module("prefetch"),
+                            profiler.module("prefetch"),
+                            span("module", module="prefetch"),
+                        ):
+                            load_events(PREFETCH_EVENTS, start, end)
+                    except Exception as err:
+                        # Modules load whatever is missing on their own.
+                        log_event("daily.prefetch.failed", run_id=run_id, error=str(err))
 
-    finally:
-        try:
-            finish_daily_job(status)
-        except Exception as log_err:
-            log_event("daily.status_sync.failed", run_id=run_id, error=str(log_err))
+                for module_name, runner in MODULES:
+                    try:
+                        with (
+                            METRICS.module(module_name),
+                            profiler.module(module_name),
+                            span("module", module=module_name),
+                        ):
+                            runner(start, end)
+                        module_status[module_name] = "ok"
+                        log_event("daily.module.ok", run_id=run_id, module=module_name)
+                    except Exception as err:
+                        status = "failed"
+                        module_status[module_name] = f"failed:{type(err).__name__}"
+                        log_event("daily.module.failed", run_id=run_id, module=module_name, error=str(err))
+
+                ts_from = int(start.timestamp() * 1000)
+                ts_to = int(end.timestamp() * 1000)
+                try:
+                    with (
+                        METRICS.module("cross_layer"),
+                        profiler.module("cross_layer"),
+                        span("module", module="cross_layer"),
+                    ):
+                        process_cross_layer_daily_window(ts_from, ts_to)
+                    module_status["cross_layer"] = "ok"
+                    log_event("daily.cross_layer.ok", run_id=run_id)
+                except Exception as err:
+                    module_status["cross_layer"] = f"failed_isolated:{type(err).__name__}"
+                    log_event("daily.cross_layer.failed", run_id=run_id, error=str(err))
 
+            finally:
+                try:
+                    finish_daily_job(status)
+                except Exception as log_err:
+                    log_event("daily.status_sync.failed", run_id=run_id, error=str(log_err))
+                run_span.set(status=status)
+
+    finally:
         elapsed = round(perf_counter() - t0, 3)
         log_event(
             "daily.finished",
@@ -83,9 +131,32 @@ def main():
             request_count=METRICS.request_count,
             payload_rows_in=METRICS.payload_rows_in,
             payload_rows_out=METRICS.payload_rows_out,
+            frame_bytes_raw=METRICS.frame_bytes_raw,
+            frame_bytes_compact=METRICS.frame_bytes_compact,
             module_durations=METRICS.module_durations,
+            module_metrics=METRICS.module_breakdown(),
+            module_memory=METRICS.module_memory,
+            endpoint_latency=METRICS.latency_summary(),
+            load_phases=METRICS.load_breakdown(),
+            profile_files=profiler.files,
         )
 
+        try:
+            record_run_performance(run_id, status, elapsed, METRICS)
+        except Exception as perf_err:
+            log_event("daily.perf_history.failed", run_id=run_id, error=str(perf_err))
+
+        if METRICS_PROM_FILE:
+            try:
+                write_prometheus_textfile(METRICS_PROM_FILE, METRICS, status=status, elapsed_sec=elapsed)
+            except Exception as export_err:
+                log_event("daily.metrics_export.failed", run_id=run_id, error=str(export_err))
+
+        try:
+            export_trace()
+        except Exception as trace_err:
+            log_event("daily.trace_export.failed", run_id=run_id, error=str(trace_err))
+
 
 if __name__ == "__main__":
     main()
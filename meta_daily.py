@@ -49,7 +49,8 @@ def dominant_with_pct(series, default_value=None, default_pct=None):
     clean = series.dropna() if hasattr(series, "dropna") else series
     if clean is None or len(clean) == 0:
         return default_value, default_pct
-    vc = clean.value_counts(normalize=True)
+    # Count labels, not categories: ties go to the first label in this series.
+    vc = clean.astype(object).value_counts(normalize=True)
     return vc.index[0], round(float(vc.iloc[0]) * 100, 1)
 
 
@@ -120,18 +121,16 @@ def run_meta_daily(start, end):
     divergence = load_event("risk_divergence", start, end)
     deribit = load_event("deribit_vbi_snapshot", start, end)
 
-    # ---------- NORMALIZE TIME ----------
-    risk["ts_unix_ms"] = risk["ts"].astype("int64") // 10**6
-    cycle["ts_unix_ms"] = cycle["ts"].astype("int64") // 10**6
-
-    if not divergence.empty:
-        divergence["ts_unix_ms"] = divergence["ts"].astype("int64") // 10**6
-
     # ---------- MERGE RISK + OPTIONS ----------
+    # merge_asof needs identical key dtypes; loaded symbols are per-event categoricals.
+    for frame in (risk, cycle):
+        if "symbol" in frame.columns and isinstance(frame["symbol"].dtype, pd.CategoricalDtype):
+            frame["symbol"] = frame["symbol"].astype(object)
+
     df = pd.merge_asof(
-        risk.sort_values("ts_unix_ms"),
-        cycle.sort_values("ts_unix_ms"),
-        on="ts_unix_ms",
+        risk.sort_values("ts_ms"),
+        cycle.sort_values("ts_ms"),
+        on="ts_ms",
         by="symbol",
         tolerance=ALIGN,
         direction="backward",
@@ -154,14 +153,13 @@ def run_meta_daily(start, end):
                 divergence_type_col = candidate
                 break
 
-        confidence_source = divergence["confidence"] if "confidence" in divergence.columns else pd.Series(dtype="float64")
-        confidence_series = pd.to_numeric(confidence_source, errors="coerce")
+        confidence_series = divergence["confidence"] if "confidence" in divergence.columns else pd.Series(dtype="float64")
         divergence_share = round(len(divergence) / len(risk) * 100, 1) if not risk.empty else None
         dominant_divergence = None
         if divergence_type_col:
             divergence_types = divergence[divergence_type_col].dropna()
             if not divergence_types.empty:
-                dominant_divergence = divergence_types.value_counts().idxmax()
+                dominant_divergence = divergence_types.astype(object).value_counts().idxmax()
 
         divergence_conf_avg = None
         if confidence_series is not None:
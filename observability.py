@@ -1,4 +1,15 @@
-from datetime import datetime
+import json
+import math
+import time
+from datetime import datetime, timezone
+from time import perf_counter
+
+from atomic_write import write_text_atomic
+from config import LOG_FORMAT
+from runtime_metrics import COUNTER_FIELDS, peak_rss_mb
+
+
+_PROCESS_START = perf_counter()
 
 
 def _format_module_name(module_name: str) -> str:
@@ -32,6 +43,35 @@ def _render_event_message(event: str, fields: dict) -> str:
     if event == "daily.finished":
         return f"Daily analysis finished with status: {fields.get('status')}"
 
+    if event == "daily.metrics_export.failed":
+        return f"Metrics export failed: {fields.get('error')}"
+
+    if event == "daily.profile.failed":
+        return f"Profile dump for {fields.get('module')} failed: {fields.get('error')}"
+
+    if event == "daily.perf_regression":
+        module_label = _format_module_name(str(fields.get("module", "module")))
+        return (
+            f"{module_label} is slower than usual: {fields.get('duration_sec')}s vs median "
+            f"{fields.get('baseline_sec')}s ({fields.get('ratio')}x), rows in "
+            f"{fields.get('payload_rows_in')} vs {fields.get('baseline_rows_in')}"
+        )
+
+    if event == "daily.perf_history.failed":
+        return f"Run performance history failed: {fields.get('error')}"
+
+    if event == "daily.trace_export.failed":
+        return f"Trace export failed: {fields.get('error')}"
+
+    if event == "http.circuit_open":
+        return (
+            f"Circuit opened for {fields.get('host')} after {fields.get('failures')} failures; "
+            f"failing fast for {fields.get('cooldown_sec')}s"
+        )
+
+    if event == "daily.prefetch.failed":
+        return f"Event prefetch failed, modules will load on demand: {fields.get('error')}"
+
     if event == "daily.skipped":
         return f"Daily analysis skipped: {fields.get('reason')}"
 
@@ -39,7 +79,98 @@ def _render_event_message(event: str, fields: dict) -> str:
     return f"{event}: {details}" if details else event
 
 
+def _json_safe(value):
+    # NaN/Infinity are not JSON; log shippers reject the bare tokens.
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _json_safe(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(val) for val in value]
+    return value
+
+
 def log_event(event: str, **fields):
-    timestamp = datetime.now().strftime("%I:%M:%S %p")
     message = _render_event_message(event, fields)
+    if LOG_FORMAT == "json":
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "event": event,
+            "message": message,
+            "uptime_sec": round(perf_counter() - _PROCESS_START, 3),
+            **fields,
+        }
+        print(json.dumps(_json_safe(record), default=str, sort_keys=False, allow_nan=False), flush=True)
+        return
+
+    timestamp = datetime.now().strftime("%I:%M:%S %p")
     print(f"{timestamp}  {message}")
+
+
+# ---------- Prometheus textfile export ----------
+
+def _prom_escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _prom_line(name: str, value, labels: dict | None = None) -> str:
+    if labels:
+        rendered = ",".join(f'{key}="{_prom_escape(val)}"' for key, val in labels.items())
+        return f"{name}{{{rendered}}} {value}"
+    return f"{name} {value}"
+
+
+def render_prometheus_metrics(metrics, *, status: str, elapsed_sec: float) -> str:
+    lines = [
+        "# HELP daily_run_duration_seconds Wall time of the last daily run.",
+        "# TYPE daily_run_duration_seconds gauge",
+        _prom_line("daily_run_duration_seconds", elapsed_sec),
+        "# HELP daily_run_success Whether the last daily run finished with status ok.",
+        "# TYPE daily_run_success gauge",
+        _prom_line("daily_run_success", 1 if status == "ok" else 0),
+        "# HELP daily_run_last_finished_timestamp_seconds Unix time the last daily run finished.",
+        "# TYPE daily_run_last_finished_timestamp_seconds gauge",
+        _prom_line("daily_run_last_finished_timestamp_seconds", round(time.time(), 3)),
+        "# HELP daily_module_duration_seconds Wall time per module in the last daily run.",
+        "# TYPE daily_module_duration_seconds gauge",
+    ]
+    for module, duration in sorted(metrics.module_durations.items()):
+        lines.append(_prom_line("daily_module_duration_seconds", duration, {"module": module}))
+
+    breakdown = metrics.module_breakdown()
+    for counter in COUNTER_FIELDS:
+        name = f"daily_module_{counter}"
+        lines.append(f"# TYPE {name} gauge")
+        for module, counts in sorted(breakdown.items()):
+            lines.append(_prom_line(name, counts.get(counter, 0), {"module": module}))
+
+    lines.append("# HELP daily_module_rss_growth_bytes Growth of the process peak RSS while each module ran.")
+    lines.append("# TYPE daily_module_rss_growth_bytes gauge")
+    for module, memory in sorted(metrics.module_memory.items()):
+        if memory.get("rss_growth_mb") is not None:
+            lines.append(_prom_line("daily_module_rss_growth_bytes", int(memory["rss_growth_mb"] * 1024 * 1024), {"module": module}))
+    process_peak = peak_rss_mb()
+    if process_peak is not None:
+        lines.append("# HELP daily_process_peak_rss_bytes Peak RSS of the whole daily run.")
+        lines.append("# TYPE daily_process_peak_rss_bytes gauge")
+        lines.append(_prom_line("daily_process_peak_rss_bytes", int(process_peak * 1024 * 1024)))
+
+    lines.append("# HELP daily_http_request_duration_seconds Outbound HTTP attempt latency per endpoint.")
+    lines.append("# TYPE daily_http_request_duration_seconds histogram")
+    for endpoint, histogram in sorted(metrics.latency_histograms().items()):
+        for upper, cumulative in histogram.cumulative_buckets():
+            lines.append(_prom_line(
+                "daily_http_request_duration_seconds_bucket",
+                cumulative,
+                {"endpoint": endpoint, "le": f"{upper:.6g}"},
+            ))
+        lines.append(_prom_line("daily_http_request_duration_seconds_bucket", histogram.count, {"endpoint": endpoint, "le": "+Inf"}))
+        lines.append(_prom_line("daily_http_request_duration_seconds_sum", round(histogram.total_ms / 1000, 6), {"endpoint": endpoint}))
+        lines.append(_prom_line("daily_http_request_duration_seconds_count", histogram.count, {"endpoint": endpoint}))
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(path, metrics, *, status: str, elapsed_sec: float) -> None:
+    # node-exporter may read at any moment.
+    write_text_atomic(path, render_prometheus_metrics(metrics, status=status, elapsed_sec=elapsed_sec))
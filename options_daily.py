@@ -19,7 +19,9 @@ def dominant(series, default_value="UNKNOWN", default_pct=0.0):
     clean = series.dropna()
     if clean.empty:
         return default_value, default_pct
-    vc = clean.value_counts(normalize=True)
+    # Ties go to the label seen first in this series (a session's rows), not
+    # to the loaded frame's category order.
+    vc = clean.astype(object).value_counts(normalize=True)
     return vc.index[0], round(float(vc.iloc[0]) * 100, 1)
 
 
@@ -35,10 +37,10 @@ def _clean_signal_series(series):
     )
 
 
-def _to_numeric_mean(series, digits):
+def _mean(series, digits):
     if series is None or len(series) == 0:
         return None
-    values = pd.to_numeric(series, errors="coerce").dropna()
+    values = series.dropna()
     if values.empty:
         return None
     return round(float(values.mean()), digits)
@@ -86,9 +88,9 @@ def run_options_daily(start, end):
 
     # ----- BYBIT -----
     if not bybit.empty:
-        payload["bybit_mci_avg"] = _to_numeric_mean(bybit.get("mci"), 2)
-        payload["bybit_mci_slope_avg"] = _to_numeric_mean(bybit.get("mci_slope"), 3)
-        payload["bybit_confidence_avg"] = _to_numeric_mean(bybit.get("confidence"), 2)
+        payload["bybit_mci_avg"] = _mean(bybit.get("mci"), 2)
+        payload["bybit_mci_slope_avg"] = _mean(bybit.get("mci_slope"), 3)
+        payload["bybit_confidence_avg"] = _mean(bybit.get("confidence"), 2)
 
         payload["dominant_bybit_regime"], payload["dominant_bybit_regime_pct"] = dominant(
             bybit.get("regime"), "UNKNOWN", 0.0
@@ -100,8 +102,8 @@ def run_options_daily(start, end):
 
     # ----- OKX -----
     if not okx.empty:
-        payload["okx_olsi_avg"] = _to_numeric_mean(okx.get("okx_olsi_avg"), 4)
-        payload["okx_olsi_slope_avg"] = _to_numeric_mean(okx.get("okx_olsi_slope"), 4)
+        payload["okx_olsi_avg"] = _mean(okx.get("okx_olsi_avg"), 4)
+        payload["okx_olsi_slope_avg"] = _mean(okx.get("okx_olsi_slope"), 4)
 
         payload["dominant_okx_liquidity_regime"], payload["dominant_okx_liquidity_regime_pct"] = dominant(
             okx.get("okx_liquidity_regime"), "UNKNOWN", 0.0
@@ -112,11 +114,11 @@ def run_options_daily(start, end):
             divergence_series, "NONE", 0.0
         )
 
-        payload["divergence_strength_avg"] = _to_numeric_mean(
+        payload["divergence_strength_avg"] = _mean(
             okx.get("divergence_strength"), 3
         )
 
-        payload["divergence_diff_avg"] = _to_numeric_mean(
+        payload["divergence_diff_avg"] = _mean(
             okx.get("divergence_diff"), 4
         )
 
@@ -128,11 +130,11 @@ def run_options_daily(start, end):
 
     # готовим данные
     if not bybit.empty:
-        bybit = bybit.copy()
+        bybit = bybit.copy(deep=False)
         bybit["session"] = bybit["ts"].apply(session)
 
     if not okx.empty:
-        okx = okx.copy()
+        okx = okx.copy(deep=False)
         okx["session"] = okx["ts"].apply(session)
 
     day = start.date().isoformat()
@@ -150,7 +152,7 @@ def run_options_daily(start, end):
                 rows.append({
                     "date": day,
                     "session": s,
-                    "meta_score": round(_to_numeric_mean(sub.get("confidence"), 2) or 0, 1),
+                    "meta_score": round(_mean(sub.get("confidence"), 2) or 0, 1),
                     "dominant_meta": dominant_phase,
                     "share_hidden_pressure": 0,
                     "share_confirmed_stress": round(
@@ -171,7 +173,7 @@ def run_options_daily(start, end):
                 rows.append({
                     "date": day,
                     "session": s,
-                    "meta_score": round(_to_numeric_mean(sub.get("divergence_strength"), 2) or 0, 1),
+                    "meta_score": round(_mean(sub.get("divergence_strength"), 2) or 0, 1),
                     "dominant_meta": dominant_div,
                     "share_hidden_pressure": 0,
                     "share_confirmed_stress": 0,
@@ -0,0 +1,156 @@
+# perf_history.py
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+
+from requests import HTTPError
+from requests.exceptions import ConnectionError
+
+from config import (
+    PERF_HISTORY_FILE,
+    PERF_HISTORY_WINDOW,
+    PERF_MIN_HISTORY,
+    PERF_REGRESSION_MIN_SEC,
+    PERF_REGRESSION_PCT,
+)
+from observability import log_event
+from supabase import supabase_get, supabase_post
+
+
+PERF_TABLE = "daily_run_metrics"
+TOTAL_KEY = "total"
+LOCAL_HISTORY_FILE = Path(PERF_HISTORY_FILE)
+
+
+def _cache_hit_rate(load_phases: dict) -> float | None:
+    hits = sum(p.get("cache_hits", 0) for p in load_phases.values())
+    misses = sum(p.get("cache_misses", 0) for p in load_phases.values())
+    if not hits + misses:
+        return None
+    return round(hits / (hits + misses), 4)
+
+
+def build_run_record(run_id: str, status: str, elapsed_sec: float, metrics) -> dict:
+    counters = metrics.module_breakdown()
+    modules = {}
+    for name, duration in metrics.module_durations.items():
+        memory = metrics.module_memory.get(name, {})
+        module_counters = counters.get(name, {})
+        modules[name] = {
+            "duration_sec": duration,
+            "request_count": module_counters.get("request_count", 0),
+            "payload_rows_in": module_counters.get("payload_rows_in", 0),
+            "payload_rows_out": module_counters.get("payload_rows_out", 0),
+            "rss_growth_mb": memory.get("rss_growth_mb"),
+            "tracemalloc_peak_mb": memory.get("tracemalloc_peak_mb"),
+        }
+
+    return {
+        "run_id": run_id,
+        "date": datetime.now(timezone.utc).date().isoformat(),
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "status": status,
+        "elapsed_sec": elapsed_sec,
+        "request_count": metrics.request_count,
+        "payload_rows_in": metrics.payload_rows_in,
+        "payload_rows_out": metrics.payload_rows_out,
+        "cache_hit_rate": _cache_hit_rate(metrics.load_breakdown()),
+        "modules": modules,
+    }
+
+
+def _read_local_history() -> list[dict]:
+    if not LOCAL_HISTORY_FILE.exists():
+        return []
+    records = []
+    for line in LOCAL_HISTORY_FILE.read_text(encoding="utf-8").splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+def _append_local_history(record: dict) -> None:
+    with LOCAL_HISTORY_FILE.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record, default=str) + "\n")
+
+
+def load_recent_runs(limit: int = PERF_HISTORY_WINDOW) -> list[dict]:
+    try:
+        return supabase_get(
+            PERF_TABLE,
+            {
+                "select": "run_id,status,elapsed_sec,payload_rows_in,modules",
+                "status": "eq.ok",
+                "order": "finished_at.desc",
+                "limit": str(limit),
+            },
+        )
+    except (ConnectionError, HTTPError):
+        runs = [r for r in _read_local_history() if r.get("status") == "ok"]
+        return list(reversed(runs[-limit:]))
+
+
+def save_run_record(record: dict) -> str:
+    try:
+        supabase_post(PERF_TABLE, record, upsert=False)
+        return "supabase"
+    except (ConnectionError, HTTPError):
+        _append_local_history(record)
+        return "local_fallback"
+
+
+def _series(history: list[dict], name: str) -> list[tuple[float, int]]:
+    out = []
+    for run in history:
+        if name == TOTAL_KEY:
+            duration, rows = run.get("elapsed_sec"), run.get("payload_rows_in")
+        else:
+            module = (run.get("modules") or {}).get(name) or {}
+            duration, rows = module.get("duration_sec"), module.get("payload_rows_in")
+        if duration is not None:
+            out.append((float(duration), int(rows or 0)))
+    return out
+
+
+def find_regressions(
+    record: dict,
+    history: list[dict],
+    *,
+    threshold_pct: float = PERF_REGRESSION_PCT,
+    min_delta_sec: float = PERF_REGRESSION_MIN_SEC,
+    min_history: int = PERF_MIN_HISTORY,
+) -> list[dict]:
+    current = {name: (m["duration_sec"], m.get("payload_rows_in", 0)) for name, m in record["modules"].items()}
+    current[TOTAL_KEY] = (record["elapsed_sec"], record.get("payload_rows_in", 0))
+
+    regressions = []
+    for name, (duration, rows_in) in current.items():
+        past = _series(history, name)
+        if len(past) < min_history:
+            continue
+        baseline = median(d for d, _ in past)
+        baseline_rows = median(r for _, r in past)
+        if duration - baseline < min_delta_sec or duration <= baseline * (1 + threshold_pct / 100):
+            continue
+        regressions.append({
+            "module": name,
+            "duration_sec": duration,
+            "baseline_sec": round(baseline, 3),
+            "ratio": round(duration / baseline, 2) if baseline else None,
+            "payload_rows_in": rows_in,
+            "baseline_rows_in": baseline_rows,
+        })
+    return regressions
+
+
+def record_run_performance(run_id: str, status: str, elapsed_sec: float, metrics) -> list[dict]:
+    record = build_run_record(run_id, status, elapsed_sec, metrics)
+    history = load_recent_runs()
+    regressions = find_regressions(record, history) if status == "ok" else []
+    for regression in regressions:
+        log_event("daily.perf_regression", run_id=run_id, **regression)
+    save_run_record(record)
+    return regressions
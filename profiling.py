@@ -0,0 +1,130 @@
+# profiling.py
+#
+# Env-controlled per-module profiling for main.py.
+#
+#   PROFILE_MODE=cprofile   deterministic cProfile, one .pstats file per module
+#   PROFILE_MODE=sample     stack sampling of the module's thread, collapsed
+#                           stacks (flamegraph.pl / speedscope) per module
+#   PROFILE_MODE=off        default; module() is a shared nullcontext
+#
+# Files are written to PROFILE_DIR as <run_id>_<module>.pstats|.collapsed.
+# PROFILE_RUN_RATE profiles only that fraction of runs.
+import cProfile
+import os
+import random
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from config import PROFILE_DIR, PROFILE_MODE, PROFILE_RUN_RATE, PROFILE_SAMPLE_INTERVAL_MS
+from observability import log_event
+
+PROFILE_MODES = {"off", "cprofile", "sample"}
+
+_NULL = nullcontext()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapsed_stack(frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class _StackSampler:
+    def __init__(self, thread_id: int, interval_sec: float):
+        self.thread_id = thread_id
+        self.interval_sec = interval_sec
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_sec):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_collapsed_stack(frame)] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class Profiler:
+    def __init__(self, run_id: str, mode: str = "off", out_dir: str = "profiles", sample_interval_ms: float = 5.0):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"PROFILE_MODE must be one of {sorted(PROFILE_MODES)}")
+        self.run_id = run_id
+        self.mode = mode
+        self.out_dir = out_dir
+        self.sample_interval_sec = sample_interval_ms / 1000
+        self.files: list[str] = []
+
+    def module(self, name: str):
+        if self.mode == "cprofile":
+            return self._cprofile(name)
+        if self.mode == "sample":
+            return self._sample(name)
+        return _NULL
+
+    def _path(self, name: str, suffix: str) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        return os.path.join(self.out_dir, f"{self.run_id}_{name}.{suffix}")
+
+    @contextmanager
+    def _cprofile(self, name: str):
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._save(name, lambda: self._dump_pstats(profile, name))
+
+    def _dump_pstats(self, profile, name: str) -> str:
+        path = self._path(name, "pstats")
+        profile.dump_stats(path)
+        return path
+
+    @contextmanager
+    def _sample(self, name: str):
+        sampler = _StackSampler(threading.get_ident(), self.sample_interval_sec)
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            self._save(name, lambda: self._dump_collapsed(sampler.stacks, name))
+
+    def _dump_collapsed(self, stacks: Counter, name: str) -> str:
+        path = self._path(name, "collapsed")
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+        return path
+
+    def _save(self, name: str, write):
+        try:
+            self.files.append(write())
+        except OSError as err:
+            log_event("daily.profile.failed", run_id=self.run_id, module=name, error=str(err))
+
+
+def profiler_for_run(run_id: str) -> Profiler:
+    mode = PROFILE_MODE
+    if mode not in PROFILE_MODES:
+        log_event("daily.profile.failed", run_id=run_id, module="all", error=f"unknown PROFILE_MODE {mode!r}")
+        mode = "off"
+    if mode != "off" and random.random() >= PROFILE_RUN_RATE:
+        mode = "off"
+    return Profiler(run_id, mode, PROFILE_DIR, PROFILE_SAMPLE_INTERVAL_MS)
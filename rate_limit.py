@@ -0,0 +1,184 @@
+# rate_limit.py
+#
+# Client-side flow control for request_with_retry:
+#   * TokenBucket      - per-host request rate ceiling
+#   * AIMDController   - per-host in-flight limit: +1 per window of healthy
+#                        responses, halved on 429/503/errors or on latency
+#                        rising above the endpoint's own baseline
+#   * RetryBudget      - process-wide cap on retries as a share of requests
+#   * retry_after_sec  - Retry-After header parsing
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from config import (
+    HTTP_MAX_CONCURRENCY,
+    HTTP_MIN_CONCURRENCY,
+    HTTP_RATE_BURST,
+    HTTP_RATE_LIMIT,
+    HTTP_RETRY_BUDGET_MIN,
+    HTTP_RETRY_BUDGET_RATIO,
+)
+
+OVERLOAD_STATUSES = {429, 503}
+# Latency above this multiple of the endpoint's baseline counts as congestion.
+_LATENCY_TOLERANCE = 2.0
+_BASELINE_ALPHA = 0.1
+# Slow responses still pull the baseline up, more gently, so a lasting shift in
+# an endpoint's latency stops reading as congestion and the limit can recover.
+_BASELINE_DRIFT = 0.02
+
+
+class TokenBucket:
+    def __init__(self, rate_per_sec: float, burst: float):
+        self.rate = rate_per_sec
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AIMDController:
+    def __init__(self, min_limit: int = 1, max_limit: int = 16, initial: int | None = None):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(initial if initial is not None else min(4, self.max_limit))
+        self.in_flight = 0
+        # Healthy latency per endpoint: a bulk logs page and a one-row upsert
+        # on the same host are not comparable.
+        self.baselines: dict[str, float] = {}
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency_sec: float, status: int | None = None, error: bool = False, endpoint: str = ""):
+        with self._cond:
+            self.in_flight -= 1
+            overloaded = error or status in OVERLOAD_STATUSES
+            baseline = self.baselines.get(endpoint)
+            slow = not overloaded and baseline is not None and latency_sec > baseline * _LATENCY_TOLERANCE
+            if not overloaded:
+                self._observe_baseline(endpoint, latency_sec, _BASELINE_DRIFT if slow else _BASELINE_ALPHA)
+            if overloaded or slow:
+                self._decrease(latency_sec, baseline)
+            else:
+                # Additive increase: about +1 per `limit` healthy responses.
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def _observe_baseline(self, endpoint: str, latency_sec: float, alpha: float):
+        baseline = self.baselines.get(endpoint)
+        if baseline is None:
+            self.baselines[endpoint] = latency_sec
+        else:
+            self.baselines[endpoint] = baseline + alpha * (latency_sec - baseline)
+
+    def _decrease(self, latency_sec: float, baseline: float | None):
+        # Responses already in flight when congestion starts all report it;
+        # cut once per round trip rather than once per response.
+        now = time.monotonic()
+        if now - self._last_decrease < max(latency_sec, baseline or 0.0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit / 2)
+
+
+class RetryBudget:
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.retries >= self.min_retries + self.ratio * self.requests:
+                return False
+            self.retries += 1
+            return True
+
+
+class HostLimiter:
+    def __init__(self, rate_per_sec: float, burst: float, min_limit: int, max_limit: int):
+        self.bucket = TokenBucket(rate_per_sec, burst)
+        self.concurrency = AIMDController(min_limit, max_limit)
+
+    @contextmanager
+    def slot(self, endpoint: str = ""):
+        self.concurrency.acquire()
+        self.bucket.acquire()
+        started = time.perf_counter()
+        outcome = {"status": None, "error": False}
+        try:
+            yield outcome
+        except Exception:
+            outcome["error"] = True
+            raise
+        finally:
+            self.concurrency.release(
+                time.perf_counter() - started, outcome["status"], outcome["error"], endpoint=endpoint
+            )
+
+
+_LIMITERS: dict[str, HostLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+RETRY_BUDGET = RetryBudget(HTTP_RETRY_BUDGET_RATIO, HTTP_RETRY_BUDGET_MIN)
+
+
+def limiter_for(url: str) -> HostLimiter:
+    host = urlsplit(url).netloc
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(host)
+        if limiter is None:
+            limiter = _LIMITERS[host] = HostLimiter(
+                HTTP_RATE_LIMIT, HTTP_RATE_BURST, HTTP_MIN_CONCURRENCY, HTTP_MAX_CONCURRENCY
+            )
+        return limiter
+
+
+def retry_after_sec(response) -> float | None:
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
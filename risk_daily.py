@@ -1,4 +1,3 @@
-import pandas as pd
 from requests import HTTPError
 from loaders import load_event
 from supabase import supabase_post
@@ -18,8 +17,8 @@ def run_risk_daily(start, end):
     if df.empty:
         return
 
-    r = df.copy()
-    r["risk"] = pd.to_numeric(r.get("risk", 0), errors="coerce").fillna(0)
+    r = df.copy(deep=False)
+    r["risk"] = r["risk"].fillna(0) if "risk" in r.columns else 0
     r["session"] = r["ts"].apply(trading_session)
 
     total = len(r)
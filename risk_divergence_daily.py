@@ -42,7 +42,7 @@ def _one_hour_market_context(ts, risk_df: pd.DataFrame, market_df: pd.DataFrame,
     avg_market_risk = None
     buildups_share_pct = None
     if total_risk_logs:
-        risk_values = pd.to_numeric(risk_window.get("risk"), errors="coerce").fillna(0)
+        risk_values = risk_window["risk"].fillna(0) if "risk" in risk_window.columns else pd.Series(0, index=risk_window.index)
         avg_market_risk = round(float(risk_values.mean()), 2)
         buildups_share_pct = round(float((risk_values >= 2).sum() / total_risk_logs * 100), 2)
 
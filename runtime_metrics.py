@@ -1,23 +1,249 @@
+import math
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from time import perf_counter
 
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+UNSCOPED_MODULE = "main"
+
+_ACTIVE_MODULE: ContextVar[str] = ContextVar("metrics_active_module", default=UNSCOPED_MODULE)
+
+COUNTER_FIELDS = (
+    "request_count",
+    "retry_count",
+    "response_bytes",
+    "payload_rows_in",
+    "payload_rows_out",
+    "frame_bytes_raw",
+    "frame_bytes_compact",
+    "hedged_requests",
+    "circuit_rejections",
+    "schema_violations",
+)
+
+# Per-event breakdown of load_event: where the time and bytes went.
+LOAD_PHASE_FIELDS = (
+    "pages",
+    "wait_sec",
+    "bytes",
+    "decode_sec",
+    "coerce_sec",
+    "frame_sec",
+    "compact_sec",
+    "cache_hits",
+    "cache_misses",
+    "cache_bytes_saved",
+)
+
+
+# Four buckets per doubling (~19% wide) starting at 1 ms.
+_LATENCY_BUCKETS_PER_DOUBLING = 4
+_LATENCY_BASE_MS = 1.0
+# Exported ladder: every doubling from 1 ms to ~65 s. The edges sit on the
+# fine buckets so cumulative counts are exact, and the set never changes, as
+# Prometheus expects of a histogram's le labels.
+_EXPORT_BUCKETS = tuple(range(0, 17 * _LATENCY_BUCKETS_PER_DOUBLING, _LATENCY_BUCKETS_PER_DOUBLING))
+
+
+def active_module() -> str:
+    return _ACTIVE_MODULE.get()
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @staticmethod
+    def _bucket(ms: float) -> int:
+        if ms <= _LATENCY_BASE_MS:
+            return 0
+        return math.ceil(math.log2(ms / _LATENCY_BASE_MS) * _LATENCY_BUCKETS_PER_DOUBLING)
+
+    @staticmethod
+    def _upper_ms(bucket: int) -> float:
+        return _LATENCY_BASE_MS * 2 ** (bucket / _LATENCY_BUCKETS_PER_DOUBLING)
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        bucket = self._bucket(ms)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self._upper_ms(bucket), self.max_ms)
+        return self.max_ms
+
+    def cumulative_buckets(self) -> list[tuple[float, int]]:
+        """(upper bound in seconds, observations at or below it) for the fixed export ladder."""
+        return [
+            (self._upper_ms(edge) / 1000, sum(count for bucket, count in self.buckets.items() if bucket <= edge))
+            for edge in _EXPORT_BUCKETS
+        ]
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": _round_or_none(self.quantile(0.50)),
+            "p95_ms": _round_or_none(self.quantile(0.95)),
+            "p99_ms": _round_or_none(self.quantile(0.99)),
+            "max_ms": round(self.max_ms, 1),
+            "buckets_ms": {
+                round(self._upper_ms(bucket), 1): count
+                for bucket, count in sorted(self.buckets.items())
+            },
+        }
+
+
+def _round_or_none(value, digits=1):
+    return None if value is None else round(value, digits)
+
 
 @dataclass
 class RuntimeMetrics:
     request_count: int = 0
+    retry_count: int = 0
+    response_bytes: int = 0
     payload_rows_in: int = 0
     payload_rows_out: int = 0
+    frame_bytes_raw: int = 0
+    frame_bytes_compact: int = 0
+    hedged_requests: int = 0
+    circuit_rejections: int = 0
+    schema_violations: int = 0
     module_durations: dict = field(default_factory=dict)
+    module_counters: dict = field(default_factory=dict)
+    module_memory: dict = field(default_factory=dict)
+    endpoint_latency: dict = field(default_factory=dict)
+    load_phases: dict = field(default_factory=dict)
     _starts: dict = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **counts):
+        module_name = active_module()
+        with self._lock:
+            bucket = self.module_counters.setdefault(module_name, dict.fromkeys(COUNTER_FIELDS, 0))
+            for name, value in counts.items():
+                if name not in bucket:
+                    raise KeyError(f"Unknown runtime counter: {name}")
+                setattr(self, name, getattr(self, name) + value)
+                bucket[name] += value
+
+    def observe_latency(self, endpoint: str, seconds: float):
+        with self._lock:
+            histogram = self.endpoint_latency.get(endpoint)
+            if histogram is None:
+                histogram = self.endpoint_latency[endpoint] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def add_load_phase(self, event: str, **values):
+        with self._lock:
+            bucket = self.load_phases.setdefault(event, dict.fromkeys(LOAD_PHASE_FIELDS, 0))
+            for name, value in values.items():
+                if name not in bucket:
+                    raise KeyError(f"Unknown load phase: {name}")
+                bucket[name] += value
+
+    def load_breakdown(self) -> dict:
+        with self._lock:
+            return {
+                event: {name: round(value, 4) if name.endswith("_sec") else value for name, value in phases.items()}
+                for event, phases in sorted(self.load_phases.items())
+            }
+
+    def latency_quantile(self, endpoint: str, q: float, min_count: int = 1) -> float | None:
+        with self._lock:
+            histogram = self.endpoint_latency.get(endpoint)
+            if histogram is None or histogram.count < min_count:
+                return None
+            return histogram.quantile(q) / 1000
+
+    def latency_histograms(self) -> dict:
+        with self._lock:
+            return dict(self.endpoint_latency)
+
+    def latency_summary(self) -> dict:
+        with self._lock:
+            return {endpoint: histogram.summary() for endpoint, histogram in sorted(self.endpoint_latency.items())}
 
     def start(self, name: str):
-        self._starts[name] = perf_counter()
+        with self._lock:
+            self._starts[name] = perf_counter()
 
     def stop(self, name: str):
-        start = self._starts.pop(name, None)
-        if start is None:
-            return
-        self.module_durations[name] = round(perf_counter() - start, 3)
+        with self._lock:
+            start = self._starts.pop(name, None)
+            if start is None:
+                return
+            self.module_durations[name] = round(perf_counter() - start, 3)
+
+    @contextmanager
+    def module(self, name: str):
+        token = _ACTIVE_MODULE.set(name)
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        rss_before = peak_rss_mb()
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+            self._record_memory(name, rss_before)
+            _ACTIVE_MODULE.reset(token)
+
+    def _record_memory(self, name: str, rss_before: float | None):
+        # ru_maxrss only ever grows, so a module owns just the part of the
+        # process high-water mark it pushed up; the mark itself is cumulative.
+        rss_after = peak_rss_mb()
+        memory = {
+            "rss_growth_mb": None if rss_after is None else round(rss_after - rss_before, 1),
+            "process_peak_rss_mb": rss_after,
+        }
+        if tracemalloc.is_tracing():
+            memory["tracemalloc_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        with self._lock:
+            self.module_memory[name] = memory
+
+    def reset(self):
+        with self._lock:
+            for name in COUNTER_FIELDS:
+                setattr(self, name, 0)
+            for values in (self.module_durations, self.module_counters, self.module_memory, self.endpoint_latency, self.load_phases, self._starts):
+                values.clear()
+
+    def module_breakdown(self) -> dict:
+        with self._lock:
+            return {name: dict(counts) for name, counts in self.module_counters.items()}
 
 
 METRICS = RuntimeMetrics()
@@ -1,7 +1,8 @@
 # supabase.py
 from config import SUPABASE_URL, HEADERS
-from http_client import request_with_retry
+from http_client import decode_json, request_with_retry
 from runtime_metrics import METRICS
+from tracing import span
 
 
 def _url(table: str) -> str:
@@ -9,14 +10,16 @@ def _url(table: str) -> str:
 
 
 def supabase_get(table, params):
-    METRICS.request_count += 1
+    METRICS.add(request_count=1)
     r = request_with_retry(
         "GET",
         _url(table),
         headers=HEADERS,
         params=params,
     )
-    return r.json()
+    rows = decode_json(r)
+    METRICS.add(payload_rows_in=len(rows) if isinstance(rows, list) else 1)
+    return rows
 
 
 def supabase_post(table, payload, upsert: bool = True, on_conflict: str | None = None):
@@ -28,29 +31,27 @@ def supabase_post(table, payload, upsert: bool = True, on_conflict: str | None =
         if on_conflict:
             params = {"on_conflict": on_conflict}
 
-    if isinstance(payload, list):
-        METRICS.payload_rows_out += len(payload)
-    else:
-        METRICS.payload_rows_out += 1
-
-    METRICS.request_count += 1
-    r = request_with_retry(
-        "POST",
-        _url(table),
-        headers=headers,
-        params=params,
-        json=payload,
-    )
+    rows_out = len(payload) if isinstance(payload, list) else 1
+    METRICS.add(request_count=1, payload_rows_out=rows_out)
+    with span("write", table=table, method="POST", rows=rows_out):
+        r = request_with_retry(
+            "POST",
+            _url(table),
+            headers=headers,
+            params=params,
+            json=payload,
+        )
     return r
 
 
 def supabase_patch(table, params, payload):
-    METRICS.request_count += 1
-    r = request_with_retry(
-        "PATCH",
-        _url(table),
-        headers=HEADERS,
-        params=params,
-        json=payload,
-    )
+    METRICS.add(request_count=1)
+    with span("write", table=table, method="PATCH", rows=1):
+        r = request_with_retry(
+            "PATCH",
+            _url(table),
+            headers=HEADERS,
+            params=params,
+            json=payload,
+        )
     return r
@@ -0,0 +1,363 @@
+# synthetic_logs.py
+#
+# Deterministic synthetic `logs` rows for every event the daily pipeline reads.
+#
+#   python synthetic_logs.py --end 2026-02-21T11:00:00Z --volume 10 --symbols 20 --out day.jsonl
+#   python local_supabase.py --load day.jsonl
+#
+# or in-process: populate(LocalSupabase().store, start_ms, end_ms, volume=10).
+import argparse
+import json
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+
+BASE_SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "BNBUSDT", "DOGEUSDT", "ADAUSDT", "AVAXUSDT"]
+BASE_PRICES = {"BTCUSDT": 97000.0, "ETHUSDT": 2700.0, "SOLUSDT": 190.0, "XRPUSDT": 2.6, "BNBUSDT": 650.0}
+
+# Seconds between rows at volume 1.0 (a normal production day).
+CADENCE_SEC = {
+    "risk_eval": 60,
+    "options_ticker_cycle": 300,
+    "deribit_vbi_snapshot": 300,
+    "bybit_market_state": 300,
+    "okx_market_state": 300,
+    "options_market_state": 900,
+    "market_regime": 900,
+}
+
+EVENTS = [
+    "risk_eval",
+    "alert_sent",
+    "risk_divergence",
+    "deribit_vbi_snapshot",
+    "bybit_market_state",
+    "okx_market_state",
+    "options_market_state",
+    "options_ticker_cycle",
+    "market_regime",
+]
+
+REGIMES = ["CALM", "NEUTRAL", "UNCERTAIN", "DIRECTIONAL_UP", "DIRECTIONAL_DOWN"]
+MCI_PHASES = ["OVERCOMPRESSED", "STABLE", "RELEASING", "EXPANDING"]
+VBI_STATES = ["COLD", "CALM", "WARM", "HOT"]
+VBI_PATTERNS = ["NONE", "NONE", "NONE", "PRE-BREAK", "COMPRESSION_BUILD"]
+LIQUIDITY_REGIMES = ["LIQUIDITY_FLAT", "LIQUIDITY_EXPANSION", "LIQUIDITY_CRUSH"]
+OKX_DIVERGENCE = ["NONE", "NONE", "WEAK", "STRONG"]
+EXPIRY_STATES = ["CALM", "NEUTRAL", "BUILDING", "STRESS", "COMPRESSION", "EXPANSION"]
+DIVERGENCE_TYPES = ["BULLISH", "BEARISH"]
+
+
+def symbol_names(count: int) -> List[str]:
+    names = BASE_SYMBOLS[:count]
+    names += [f"SYN{i:03d}USDT" for i in range(len(names), count)]
+    return names
+
+
+def _rng(seed: int, *parts) -> random.Random:
+    return random.Random(":".join([str(seed), *map(str, parts)]))
+
+
+def _steps(start_ms: int, end_ms: int, cadence_sec: float, volume: float, rng: random.Random) -> Iterator[int]:
+    # Jittered fixed cadence; higher volume means proportionally denser rows.
+    step_ms = max(1, int(cadence_sec * 1000 / volume))
+    ts = start_ms + rng.randrange(step_ms)
+    while ts <= end_ms:
+        yield ts
+        ts += max(1, int(step_ms * rng.uniform(0.9, 1.1)))
+
+
+class _Sticky:
+    """Categorical state that mostly stays put and occasionally jumps."""
+
+    def __init__(self, rng: random.Random, choices: List[str], stay: float = 0.95):
+        self.rng = rng
+        self.choices = choices
+        self.stay = stay
+        self.value = rng.choice(choices)
+
+    def next(self) -> str:
+        if self.rng.random() > self.stay:
+            self.value = self.rng.choice(self.choices)
+        return self.value
+
+
+class _Walk:
+    """Mean-reverting random walk clamped to [lo, hi]."""
+
+    def __init__(self, rng: random.Random, mean: float, sigma: float, lo: float, hi: float, revert: float = 0.05):
+        self.rng = rng
+        self.mean = mean
+        self.sigma = sigma
+        self.lo = lo
+        self.hi = hi
+        self.revert = revert
+        self.value = mean
+
+    def next(self) -> float:
+        self.value += self.revert * (self.mean - self.value) + self.rng.gauss(0, self.sigma)
+        self.value = min(self.hi, max(self.lo, self.value))
+        return self.value
+
+
+def _row(ts: int, event: str, symbol: Optional[str], data: Dict[str, Any]) -> Dict[str, Any]:
+    if symbol is not None:
+        data = {"symbol": symbol, **data}
+    return {"ts": ts, "event": event, "symbol": symbol, "data": data}
+
+
+def _risk_family(start_ms, end_ms, symbols, volume, seed) -> Iterator[Dict[str, Any]]:
+    # risk_eval plus the sparse events derived from it (alert_sent, risk_divergence).
+    step_sec = CADENCE_SEC["risk_eval"] / volume
+    for symbol in symbols:
+        rng = _rng(seed, "risk", symbol)
+        stress = _Walk(rng, mean=0.8, sigma=0.35, lo=0.0, hi=5.0, revert=0.03)
+        price = BASE_PRICES.get(symbol, rng.uniform(0.5, 300.0))
+        sigma = 0.002 * math.sqrt(step_sec / 60)
+        prev_risk = 0
+        for ts in _steps(start_ms, end_ms, CADENCE_SEC["risk_eval"], volume, rng):
+            price *= math.exp(rng.gauss(0, sigma))
+            risk = int(round(min(5.0, max(0.0, stress.next() + rng.gauss(0, 0.3)))))
+            direction = "up" if rng.random() < 0.5 else "down"
+            yield _row(ts, "risk_eval", symbol, {
+                "risk": risk,
+                "price": round(price, 6),
+                "direction": direction,
+                "ts_unix_ms": ts,
+            })
+            if risk >= 3 and prev_risk < 3 and rng.random() < 0.6:
+                yield _row(ts + 1, "alert_sent", symbol, {"type": "BUILDUP", "risk": risk, "price": round(price, 6)})
+            if risk >= 2 and rng.random() < 0.004 / max(1.0, volume ** 0.5):
+                yield _row(ts + 2, "risk_divergence", symbol, {
+                    "divergence_type": rng.choice(DIVERGENCE_TYPES),
+                    "risk": risk,
+                    "price": round(price, 6),
+                    "confidence": round(rng.uniform(0.3, 0.95), 3),
+                })
+            prev_risk = risk
+
+
+def _deribit(start_ms, end_ms, volume, seed):
+    for symbol in ("BTC", "ETH"):
+        rng = _rng(seed, "deribit", symbol)
+        state = _Sticky(rng, VBI_STATES, 0.97)
+        pattern = _Sticky(rng, VBI_PATTERNS, 0.97)
+        near_iv = _Walk(rng, 0.55, 0.01, 0.2, 1.5)
+        far_iv = _Walk(rng, 0.58, 0.008, 0.2, 1.5)
+        skew = _Walk(rng, 0.0, 0.01, -0.3, 0.3)
+        curvature = _Walk(rng, 0.0, 0.004, -0.1, 0.1)
+        score = _Walk(rng, 0.3, 0.05, 0.0, 1.0)
+        for ts in _steps(start_ms, end_ms, CADENCE_SEC["deribit_vbi_snapshot"], volume, rng):
+            n, f = near_iv.next(), far_iv.next()
+            yield _row(ts, "deribit_vbi_snapshot", symbol, {
+                "vbi_state": state.next(),
+                "vbi_pattern": pattern.next(),
+                "near_iv": round(n, 4),
+                "far_iv": round(f, 4),
+                "iv_slope": round(f - n, 4),
+                "curvature": round(curvature.next(), 4),
+                "skew": round(skew.next(), 4),
+                "vbi_score": round(score.next(), 3),
+            })
+
+
+def _bybit(start_ms, end_ms, volume, seed):
+    rng = _rng(seed, "bybit")
+    regime = _Sticky(rng, REGIMES, 0.96)
+    phase = _Sticky(rng, MCI_PHASES, 0.96)
+    mci = _Walk(rng, 0.4, 0.04, 0.0, 1.0)
+    confidence = _Walk(rng, 0.6, 0.03, 0.0, 1.0)
+    last = mci.value
+    for ts in _steps(start_ms, end_ms, CADENCE_SEC["bybit_market_state"], volume, rng):
+        value = mci.next()
+        yield _row(ts, "bybit_market_state", "BTC", {
+            "regime": regime.next(),
+            "mci": round(value, 4),
+            "mci_slope": round(value - last, 4),
+            "confidence": round(confidence.next(), 3),
+            "mci_phase": phase.next(),
+        })
+        last = value
+
+
+def _okx(start_ms, end_ms, volume, seed):
+    rng = _rng(seed, "okx")
+    liquidity = _Sticky(rng, LIQUIDITY_REGIMES, 0.96)
+    divergence = _Sticky(rng, OKX_DIVERGENCE, 0.9)
+    olsi = _Walk(rng, 0.4, 0.02, 0.0, 1.0)
+    last = olsi.value
+    for ts in _steps(start_ms, end_ms, CADENCE_SEC["okx_market_state"], volume, rng):
+        value = olsi.next()
+        div = divergence.next()
+        yield _row(ts, "okx_market_state", "BTC", {
+            "okx_olsi_avg": round(value, 4),
+            "okx_olsi_slope": round(value - last, 4),
+            "okx_liquidity_regime": liquidity.next(),
+            "divergence": div,
+            "divergence_type": None if div == "NONE" else rng.choice(DIVERGENCE_TYPES),
+            "divergence_strength": 0.0 if div == "NONE" else round(rng.uniform(0.1, 1.0), 3),
+            "divergence_diff": round(rng.gauss(0, 0.05), 4),
+        })
+        last = value
+
+
+def _options_market(start_ms, end_ms, volume, seed):
+    rng = _rng(seed, "options_market")
+    regime = _Sticky(rng, EXPIRY_STATES, 0.95)
+    near = _Sticky(rng, EXPIRY_STATES, 0.9)
+    mid = _Sticky(rng, EXPIRY_STATES, 0.93)
+    mci = _Walk(rng, 0.0, 0.05, -1.0, 1.0)
+    last = mci.value
+    for ts in _steps(start_ms, end_ms, CADENCE_SEC["options_market_state"], volume, rng):
+        value = mci.next()
+        yield _row(ts, "options_market_state", "BTC", {
+            "regime": regime.next(),
+            "near_expiry_state": near.next(),
+            "mid_expiry_state": mid.next(),
+            "mci": round(value, 4),
+            "mci_slope": round(value - last, 4),
+            "confidence": round(rng.uniform(0.2, 0.9), 3),
+            "skew": round(rng.gauss(0, 0.06), 4),
+            "credit": round(rng.gauss(0, 0.06), 4),
+            "divergence": rng.choice(OKX_DIVERGENCE),
+        })
+        last = value
+
+
+def _ticker_cycle(start_ms, end_ms, symbols, volume, seed):
+    for symbol in symbols:
+        rng = _rng(seed, "cycle", symbol)
+        regime = _Sticky(rng, ["CALM", "UNCERTAIN", "DIRECTIONAL_UP", "DIRECTIONAL_DOWN"], 0.95)
+        mci = _Walk(rng, 0.5, 0.04, 0.0, 1.0)
+        for ts in _steps(start_ms, end_ms, CADENCE_SEC["options_ticker_cycle"], volume, rng):
+            yield _row(ts, "options_ticker_cycle", symbol, {
+                "regime": regime.next(),
+                "mci": round(mci.next(), 4),
+            })
+
+
+def _market_regime(start_ms, end_ms, volume, seed):
+    rng = _rng(seed, "market_regime")
+    regime = _Sticky(rng, ["CALM", "NEUTRAL", "STRESS"], 0.95)
+    liquidity = _Sticky(rng, LIQUIDITY_REGIMES, 0.95)
+    for ts in _steps(start_ms, end_ms, CADENCE_SEC["market_regime"], volume, rng):
+        yield _row(ts, "market_regime", "MARKET", {
+            "regime": regime.next(),
+            "liquidity_regime": liquidity.next(),
+            "market_volatility": rng.choice(["LOW", "NORMAL", "HIGH"]),
+        })
+
+
+def generate_logs(
+    start_ms: int,
+    end_ms: int,
+    *,
+    volume: float = 1.0,
+    symbols: int = 5,
+    seed: int = 0,
+    events: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    if volume <= 0:
+        raise ValueError("volume must be positive")
+    wanted = set(events or EVENTS)
+    unknown = wanted - set(EVENTS)
+    if unknown:
+        raise ValueError(f"Unknown events: {sorted(unknown)}")
+    names = symbol_names(symbols)
+
+    sources = []
+    if wanted & {"risk_eval", "alert_sent", "risk_divergence"}:
+        sources.append(_risk_family(start_ms, end_ms, names, volume, seed))
+    if "deribit_vbi_snapshot" in wanted:
+        sources.append(_deribit(start_ms, end_ms, volume, seed))
+    if "bybit_market_state" in wanted:
+        sources.append(_bybit(start_ms, end_ms, volume, seed))
+    if "okx_market_state" in wanted:
+        sources.append(_okx(start_ms, end_ms, volume, seed))
+    if "options_market_state" in wanted:
+        sources.append(_options_market(start_ms, end_ms, volume, seed))
+    if "options_ticker_cycle" in wanted:
+        sources.append(_ticker_cycle(start_ms, end_ms, names, volume, seed))
+    if "market_regime" in wanted:
+        sources.append(_market_regime(start_ms, end_ms, volume, seed))
+
+    for source in sources:
+        for row in source:
+            if row["event"] in wanted and row["ts"] <= end_ms:
+                yield row
+
+
+def populate(store, start_ms: int, end_ms: int, **kwargs) -> int:
+    return store.load("logs", generate_logs(start_ms, end_ms, **kwargs))
+
+
+def write_jsonl(path: str, rows) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as fh:
+        for row in rows:
+            fh.write(json.dumps(row, separators=(",", ":")))
+            fh.write("\n")
+            count += 1
+    return count
+
+
+def post_rows(base_url: str, rows, api_key: str = "local", batch_size: int = 5000) -> int:
+    headers = {"apikey": api_key, "Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    count = 0
+    batch = []
+    with requests.Session() as session:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                session.post(f"{base_url}/rest/v1/logs", headers=headers, json=batch, timeout=120).raise_for_status()
+                count += len(batch)
+                batch = []
+        if batch:
+            session.post(f"{base_url}/rest/v1/logs", headers=headers, json=batch, timeout=120).raise_for_status()
+            count += len(batch)
+    return count
+
+
+def _parse_dt(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic logs rows for the daily pipeline")
+    parser.add_argument("--end", required=True, help="window end (UTC ISO), e.g. 2026-02-21T11:00:00Z")
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--lookback-hours", type=float, default=0.0, help="extra history before the window (validation uses 48h)")
+    parser.add_argument("--volume", type=float, default=1.0, help="row density multiplier, 1 = normal day")
+    parser.add_argument("--symbols", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--event", action="append", dest="events", help="limit to specific events")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="JSON-lines output file (loadable with local_supabase.py --load)")
+    target.add_argument("--url", help="base URL of a running local_supabase.py to POST into")
+    args = parser.parse_args()
+
+    end = _parse_dt(args.end)
+    start = end - timedelta(hours=args.hours + args.lookback_hours)
+    rows = generate_logs(
+        int(start.timestamp() * 1000),
+        int(end.timestamp() * 1000),
+        volume=args.volume,
+        symbols=args.symbols,
+        seed=args.seed,
+        events=args.events,
+    )
+    if args.out:
+        count = write_jsonl(args.out, rows)
+        print(f"Wrote {count} rows to {args.out}.")
+    else:
+        count = post_rows(args.url, rows)
+        print(f"Posted {count} rows to {args.url}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 from http_client import request_with_retry
+from runtime_metrics import METRICS
 
 
 TELEGRAM_API_BASE = "https://api.telegram.org"
 
 
 def post_telegram_message(text: str, bot_token: str, chat_id: str):
+    METRICS.add(request_count=1)
     return request_with_retry(
         "POST",
         f"{TELEGRAM_API_BASE}/bot{bot_token}/sendMessage",
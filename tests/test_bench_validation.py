@@ -0,0 +1,28 @@
+import os
+import unittest
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+from bench_validation import build_inputs, fit_exponent, time_signal
+
+
+class BenchValidationTests(unittest.TestCase):
+    def test_fit_exponent_recovers_power_law(self):
+        sizes = [100, 200, 400, 800]
+        self.assertAlmostEqual(fit_exponent(sizes, [1e-6 * n for n in sizes]), 1.0)
+        self.assertAlmostEqual(fit_exponent(sizes, [1e-9 * n * n for n in sizes]), 2.0)
+        self.assertIsNone(fit_exponent([100], [1.0]))
+
+    def test_inputs_match_requested_sizes(self):
+        inputs = build_inputs(symbols=3, points=120, aux_rows=60)
+
+        self.assertEqual(len(inputs["symbols"]), 3)
+        for series in inputs["price_series"].values():
+            self.assertAlmostEqual(len(series), 120, delta=15)
+        self.assertAlmostEqual(len(inputs["okx_rows"]), 60, delta=10)
+        self.assertGreater(time_signal("S3_bybit_calm", inputs), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
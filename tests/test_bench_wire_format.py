@@ -0,0 +1,22 @@
+import os
+import unittest
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+from bench_wire_format import run
+
+
+class BenchWireFormatTests(unittest.TestCase):
+    def test_modes_load_same_rows_and_csv_is_smallest(self):
+        report = run(volume=0.2, symbols=2, fields=["risk", "price"])
+        modes = report["modes"]
+
+        self.assertEqual({r["rows"] for r in modes.values()}, {report["meta"]["stored_rows"]})
+        self.assertEqual(modes["csv_projection"]["columns"], 6)
+        self.assertLess(modes["csv_projection"]["bytes"], modes["json_projection"]["bytes"])
+        self.assertLess(modes["json_projection"]["bytes"], modes["json_rows"]["bytes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
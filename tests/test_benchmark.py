@@ -0,0 +1,52 @@
+import unittest
+
+from unittest.mock import patch
+
+from benchmark import compare_results, main
+
+
+def _report(**modules):
+    return {"results": {"1x": {"modules": modules}}}
+
+
+class CompareResultsTests(unittest.TestCase):
+    def test_flags_regressions_above_threshold(self):
+        baseline = _report(risk={"wall_sec": 1.0, "cpu_sec": 1.0, "peak_mb": 10.0, "requests": 6})
+        current = _report(risk={"wall_sec": 1.3, "cpu_sec": 1.1, "peak_mb": 10.0, "requests": 6})
+
+        regressions = compare_results(baseline, current, threshold_pct=20)
+
+        self.assertEqual([(r["module"], r["field"]) for r in regressions], [("risk", "wall_sec")])
+        self.assertEqual(regressions[0]["change_pct"], 30.0)
+
+    def test_ignores_noise_and_modules_missing_from_baseline(self):
+        baseline = _report(deribit={"wall_sec": 0.01, "cpu_sec": 0.01, "peak_mb": 0.5, "requests": 3})
+        current = _report(
+            deribit={"wall_sec": 0.04, "cpu_sec": 0.04, "peak_mb": 0.9, "requests": 4},
+            risk={"wall_sec": 9.0, "cpu_sec": 9.0, "peak_mb": 90.0, "requests": 60},
+        )
+        self.assertEqual(compare_results(baseline, current, threshold_pct=20), [])
+
+    def test_new_error_is_a_regression(self):
+        baseline = _report(meta={"wall_sec": 1.0, "cpu_sec": 1.0, "peak_mb": 10.0, "requests": 6})
+        current = _report(meta={"wall_sec": 0.1, "cpu_sec": 0.1, "peak_mb": 1.0, "requests": 1, "error": "KeyError: 'ts'"})
+
+        regressions = compare_results(baseline, current, threshold_pct=20)
+
+        self.assertEqual([(r["module"], r["field"], r["current"]) for r in regressions], [("meta", "error", "KeyError: 'ts'")])
+        self.assertEqual(compare_results(current, current, threshold_pct=20), [])
+
+
+class MainTests(unittest.TestCase):
+    @patch("benchmark.run_benchmark")
+    def test_exit_code_is_non_zero_when_a_module_errored(self, run_mock):
+        stats = {"wall_sec": 0.1, "cpu_sec": 0.1, "peak_mb": None, "requests": 1, "rows_per_sec": 10.0}
+        run_mock.return_value = _report(risk=dict(stats), meta=dict(stats, error="ValueError: bad"))
+        self.assertEqual(main(["--no-memory"]), 1)
+
+        run_mock.return_value = _report(risk=dict(stats))
+        self.assertEqual(main(["--no-memory"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
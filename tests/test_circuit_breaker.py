@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+import requests
+
+import http_client
+import job_log
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, reset_breakers
+from runtime_metrics import RuntimeMetrics
+
+
+def _response(status):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"[]"
+    return response
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_opens_after_consecutive_failures_then_probes_once(self):
+        breaker = CircuitBreaker("db.example", failure_threshold=2, cooldown_sec=0)
+        breaker.record_failure()
+        breaker.record_success()
+        self.assertFalse(breaker.record_failure())
+        self.assertTrue(breaker.record_failure())
+        self.assertEqual(breaker.state, OPEN)
+
+        breaker.cooldown_sec = 60
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.opened_at -= 60
+        breaker.before_request()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.before_request()
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("db.example", failure_threshold=1, cooldown_sec=60)
+        breaker.record_failure()
+        breaker.opened_at -= 60
+        breaker.before_request()
+        self.assertTrue(breaker.record_failure())
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+
+class RequestCircuitTests(unittest.TestCase):
+    def setUp(self):
+        reset_breakers()
+        self.addCleanup(reset_breakers)
+
+    @patch("http_client.time.sleep")
+    @patch("http_client.requests.request")
+    def test_open_circuit_fails_fast_without_sending(self, request_mock, _sleep):
+        request_mock.side_effect = requests.exceptions.ConnectTimeout("down")
+        url = "http://down.example/rest/v1/logs"
+        with patch("circuit_breaker.HTTP_BREAKER_FAILURES", 2):
+            with self.assertRaises(CircuitOpenError):
+                http_client.request_with_retry("GET", url, retries=5)
+        self.assertEqual(request_mock.call_count, 2)
+
+        with self.assertRaises(CircuitOpenError):
+            http_client.request_with_retry("GET", url, retries=5)
+        self.assertEqual(request_mock.call_count, 2)
+
+    def test_open_circuit_takes_job_log_local_fallback(self):
+        with tempfile.TemporaryDirectory() as td:
+            lock_file = Path(td) / ".daily_job_lock.json"
+            with patch("job_log.LOCAL_LOCK_FILE", lock_file), patch(
+                "job_log.supabase_post", side_effect=CircuitOpenError("open")
+            ):
+                self.assertTrue(job_log.acquire_daily_lock())
+            state = json.loads(lock_file.read_text(encoding="utf-8"))
+            self.assertEqual(state["backend"], "local_fallback")
+
+
+class HedgedRequestTests(unittest.TestCase):
+    def setUp(self):
+        reset_breakers()
+        self.addCleanup(reset_breakers)
+
+    def test_slow_get_is_hedged_and_first_response_wins(self):
+        metrics = RuntimeMetrics()
+        for _ in range(20):
+            metrics.observe_latency("logs", 0.01)
+        release_slow = threading.Event()
+        calls = []
+
+        def fake_request(method, url, timeout=None, **kwargs):
+            calls.append(method)
+            if len(calls) == 1:
+                release_slow.wait(5)
+                return _response(500)
+            return _response(200)
+
+        with patch("http_client.HTTP_HEDGE", True), patch("http_client.METRICS", metrics), patch(
+            "http_client.requests.request", side_effect=fake_request
+        ):
+            response = http_client.request_with_retry("GET", "http://db.example/rest/v1/logs", retries=0)
+            release_slow.set()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(metrics.hedged_requests, 1)
+
+    def test_writes_and_cold_endpoints_are_not_hedged(self):
+        metrics = RuntimeMetrics()
+        with patch("http_client.HTTP_HEDGE", True), patch("http_client.METRICS", metrics):
+            self.assertIsNone(http_client._hedge_delay("GET", "logs", {}))
+            for _ in range(20):
+                metrics.observe_latency("logs", 0.2)
+            self.assertIsNone(http_client._hedge_delay("POST", "logs", {}))
+            self.assertIsNone(http_client._hedge_delay("GET", "logs", {"stream": True}))
+            self.assertAlmostEqual(http_client._hedge_delay("GET", "logs", {}), 0.2, delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
+import json
 import os
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
 os.environ.setdefault("SUPABASE_KEY", "test-key")
@@ -50,14 +51,15 @@ class CrossLayerDailyTests(unittest.TestCase):
 
 
 class CrossLayerJsonSanitizationTests(unittest.TestCase):
-    @patch("cross_layer.supabase_post")
-    def test_persist_cross_layer_event_converts_nan_to_none(self, mock_supabase_post):
+    @patch("http_client.requests.request")
+    def test_persist_cross_layer_event_converts_nan_to_none(self, mock_request):
         from cross_layer import _persist_cross_layer_event
 
+        mock_request.return_value = MagicMock(status_code=201, content=b"")
         _persist_cross_layer_event({"event_key": "BTC:1:DAILY_24H", "direction": float("nan")})
 
-        payload = mock_supabase_post.call_args.args[1]
-        self.assertIsNone(payload["direction"])
+        body = json.loads(mock_request.call_args.kwargs["data"])
+        self.assertIsNone(body["direction"])
 
 
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
 os.environ.setdefault("SUPABASE_KEY", "test-key")
 
 from deribit_daily import run_deribit_daily
+from event_schema import apply_schema
 
 
 class DeribitDailyTests(unittest.TestCase):
@@ -39,6 +40,23 @@ class DeribitDailyTests(unittest.TestCase):
         self.assertEqual(payload["vbi_pattern_dominant"], "NONE")
         self.assertEqual(payload["vbi_pattern_share_pct"], 0.0)
 
+    @patch("deribit_daily.supabase_post")
+    @patch("deribit_daily.load_event")
+    def test_dominant_state_ties_break_within_each_symbol(self, mock_load_event, mock_supabase_post):
+        ts = pd.Timestamp(datetime(2026, 2, 20, 10, 0, tzinfo=timezone.utc))
+        # Categorical vbi_state is ordered [CALM, WARM] for the frame; BTC sees WARM first.
+        mock_load_event.return_value = apply_schema(
+            "deribit_vbi_snapshot",
+            pd.DataFrame({"ts": [ts, ts, ts], "symbol": ["ETH", "BTC", "BTC"], "vbi_state": ["CALM", "WARM", "CALM"]}),
+        )
+
+        run_deribit_daily(datetime.now(timezone.utc), datetime.now(timezone.utc))
+
+        payloads = {c.args[1]["symbol"]: c.args[1] for c in mock_supabase_post.call_args_list}
+        self.assertEqual(payloads["BTC"]["vbi_state_dominant"], "WARM")
+        self.assertEqual(payloads["BTC"]["vbi_state_share_pct"], 50.0)
+        self.assertEqual(payloads["ETH"]["vbi_state_dominant"], "CALM")
+
 
 if __name__ == "__main__":
     unittest.main()
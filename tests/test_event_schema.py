@@ -0,0 +1,49 @@
+import os
+import unittest
+
+import pandas as pd
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+import event_schema
+from runtime_metrics import METRICS
+
+
+class EventSchemaTests(unittest.TestCase):
+    def setUp(self):
+        METRICS.reset()
+
+    def test_coerces_known_fields_and_adds_ts_ms(self):
+        df = pd.DataFrame(
+            {
+                "risk": ["3", 1, None],
+                "price": ["101.5", "n/a", 99],
+                "direction": ["up", "sideways", "down"],
+                "extra": ["7", "8", "9"],
+                "ts": pd.to_datetime([1_000, 2_000, 3_500], unit="ms", utc=True),
+            }
+        )
+        out = event_schema.apply_schema("risk_eval", df)
+
+        self.assertEqual(out["ts_ms"].tolist(), [1_000, 2_000, 3_500])
+        self.assertEqual(out["ts_ms"].dtype, "int64")
+        self.assertEqual(out["risk"].tolist()[:2], [3.0, 1.0])
+        self.assertTrue(pd.isna(out["price"].iloc[1]))
+        self.assertIsInstance(out["direction"].dtype, pd.CategoricalDtype)
+        self.assertEqual(list(out["direction"].cat.categories), ["up", "sideways", "down"])
+        self.assertEqual(out["extra"].tolist(), ["7", "8", "9"])
+        # "n/a" price, "sideways" direction and the null risk.
+        self.assertEqual(METRICS.schema_violations, 3)
+        self.assertEqual(df["risk"].tolist()[0], "3")
+
+    def test_integral_int_fields_stay_int(self):
+        df = pd.DataFrame({"risk": [1.0, 2.0], "ts": pd.to_datetime([1, 2], unit="ms", utc=True)})
+        out = event_schema.apply_schema("alert_sent", df)
+
+        self.assertEqual(out["risk"].dtype, "int64")
+        self.assertEqual(METRICS.schema_violations, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
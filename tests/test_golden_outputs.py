@@ -0,0 +1,33 @@
+import math
+import unittest
+
+from golden_outputs import diff_captures, diff_payloads
+
+
+class DiffPayloadsTests(unittest.TestCase):
+    def test_numbers_compare_with_tolerance(self):
+        self.assertEqual(diff_payloads({"avg": 1.0}, {"avg": 1.0 + 1e-12}), [])
+        self.assertEqual(diff_payloads({"avg": math.nan}, {"avg": math.nan}), [])
+        self.assertEqual(diff_payloads({"n": 3}, {"n": 3.0}), [])
+        self.assertEqual(diff_payloads({"avg": 1.0}, {"avg": 1.01}), ["avg: 1.0 != 1.01"])
+        self.assertEqual(diff_payloads({"avg": 1.0}, {"avg": 1.01}, rel_tol=0.05), [])
+        self.assertEqual(diff_payloads({"ok": True}, {"ok": 1}), ["ok: True != 1"])
+
+    def test_reports_paths_for_nested_differences(self):
+        golden = {"writes": {"risk": [{"table": "daily_risk", "body": [{"risk_0_pct": 40.0, "date": "2026-02-20"}]}]}}
+        candidate = {"writes": {"risk": [{"table": "daily_risk", "body": [{"risk_0_pct": 41.0, "extra": 1}]}]}}
+
+        diffs = diff_captures(golden, candidate)["risk"]
+
+        self.assertEqual(diffs, [
+            "risk[0].body[0].date: missing in candidate",
+            "risk[0].body[0].extra: unexpected in candidate (1)",
+            "risk[0].body[0].risk_0_pct: 40.0 != 41.0",
+        ])
+
+    def test_length_mismatch_is_reported(self):
+        self.assertEqual(diff_payloads([1, 2], [1], "rows"), ["rows: length 2 != 1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
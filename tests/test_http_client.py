@@ -1,13 +1,25 @@
+import io
+import json
 import os
+import tempfile
 import unittest
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+import pandas as pd
 import requests
 
 os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
 os.environ.setdefault("SUPABASE_KEY", "test-key")
 
-from http_client import request_with_retry
+from http_archive import HttpRecorder, HttpReplayer, ReplayMissError
+from http_client import JsonArrayStream, decode_json, endpoint_label, json_dumps, request_with_retry
+from local_supabase import LocalSupabase
+from runtime_metrics import METRICS
+from telegram_api import post_telegram_message
+from twitter_api import post_tweet
+from window import analysis_window_utc
 
 
 class HttpClientTests(unittest.TestCase):
@@ -33,6 +45,196 @@ class HttpClientTests(unittest.TestCase):
         request_mock.assert_called_once()
         session_mock.request.assert_called_once()
 
+    def test_endpoint_label_groups_by_table_and_service(self):
+        self.assertEqual(endpoint_label("http://localhost:54321/rest/v1/logs"), "logs")
+        self.assertEqual(endpoint_label("https://x.supabase.co/rest/v1/daily_meta_v2?on_conflict=date"), "daily_meta_v2")
+        self.assertEqual(endpoint_label("https://x.supabase.co/rest/v1/rpc/increment_counter"), "rpc/increment_counter")
+        self.assertEqual(endpoint_label("https://api.telegram.org/bot123/sendMessage"), "telegram")
+        self.assertEqual(endpoint_label("https://api.twitter.com/2/tweets"), "twitter")
+
+    @patch("http_client.requests.request")
+    def test_social_posts_are_counted_like_supabase_requests(self, request_mock):
+        request_mock.return_value = MagicMock(status_code=200, content=b"{}")
+        METRICS.reset()
+        with METRICS.module("telegram"):
+            post_telegram_message("daily", bot_token="bot", chat_id="1")
+        with METRICS.module("twitter"):
+            post_tweet("daily", "key", "secret", "token", "token-secret")
+
+        breakdown = METRICS.module_breakdown()
+        self.assertEqual(breakdown["telegram"]["request_count"], 1)
+        self.assertEqual(breakdown["twitter"]["request_count"], 1)
+        self.assertEqual(set(METRICS.latency_summary()), {"telegram", "twitter"})
+        METRICS.reset()
+
+
+class JsonCodecTests(unittest.TestCase):
+    PAYLOAD = {
+        "nan": float("nan"),
+        "inf": float("-inf"),
+        "np": [np.int64(3), np.float64("nan"), np.bool_(True)],
+        "missing": [pd.NA, pd.NaT],
+        "text": "привет",
+        "keys": {1: "a"},
+    }
+    EXPECTED = {"nan": None, "inf": None, "np": [3, None, True], "missing": [None, None], "text": "привет", "keys": {"1": "a"}}
+
+    def test_non_finite_and_numpy_values_encode_to_json(self):
+        self.assertEqual(json.loads(json_dumps(self.PAYLOAD)), self.EXPECTED)
+
+    def test_stdlib_fallback_matches(self):
+        with patch("http_client.orjson", None):
+            body = json_dumps(self.PAYLOAD)
+            self.assertEqual(json.loads(body), self.EXPECTED)
+            response = requests.Response()
+            response._content = body
+            self.assertEqual(decode_json(response), self.EXPECTED)
+
+    def test_stdlib_fallback_uses_c_encoder_for_finite_payloads(self):
+        with patch("http_client.orjson", None), patch("http_client._STDLIB_ENCODER") as slow:
+            body = json_dumps({"x": [1.5, np.int64(2)], "y": "z"})
+        slow.encode.assert_not_called()
+        self.assertEqual(json.loads(body), {"x": [1.5, 2], "y": "z"})
+
+    @patch("http_client.requests.request")
+    def test_json_kwarg_is_sent_as_encoded_body(self, request_mock):
+        request_mock.return_value = MagicMock(status_code=201)
+        request_with_retry("POST", "http://localhost:54321/rest/v1/t", json={"x": float("nan")}, retries=0)
+
+        kwargs = request_mock.call_args.kwargs
+        self.assertNotIn("json", kwargs)
+        self.assertEqual(kwargs["headers"]["Content-Type"], "application/json")
+        self.assertEqual(json.loads(kwargs["data"]), {"x": None})
+
+class JsonArrayStreamTests(unittest.TestCase):
+    ROWS = [{"id": i, "text": "ü" * (i % 4), "values": [1.5, None]} for i in range(25)] + [12345, "a,]"]
+
+    def _streamed(self, body: bytes):
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(body)
+        return response
+
+    def test_batches_survive_any_chunk_boundary(self):
+        body = json.dumps(self.ROWS, ensure_ascii=False).encode("utf-8")
+        for chunk_bytes in (1, 7, 64, len(body)):
+            stream = JsonArrayStream(self._streamed(body), batch_rows=10, chunk_bytes=chunk_bytes)
+            batches = list(stream)
+            self.assertEqual([len(b) for b in batches], [10, 10, 7])
+            self.assertEqual(sum(batches, []), self.ROWS)
+            self.assertEqual(stream.bytes_read, len(body))
+
+    def test_buffered_and_empty_responses(self):
+        response = requests.Response()
+        response._content = b" [ ] "
+        self.assertEqual(list(JsonArrayStream(response)), [])
+
+    def test_truncated_body_raises(self):
+        with self.assertRaises(ValueError):
+            list(JsonArrayStream(self._streamed(b'[{"a": 1}, {"b"'), chunk_bytes=4))
+
+    def test_abandoned_stream_closes_the_response(self):
+        response = self._streamed(json.dumps(self.ROWS).encode("utf-8"))
+        batches = iter(JsonArrayStream(response, batch_rows=5, chunk_bytes=16))
+        next(batches)
+        self.assertFalse(response.raw.closed)
+        batches.close()
+        self.assertTrue(response.raw.closed)
+
+    @patch("http_client.time.sleep")
+    @patch("http_client.requests.request")
+    def test_streamed_responses_are_closed_before_retry_and_raise(self, request_mock, sleep_mock):
+        unavailable = self._streamed(b"busy")
+        unavailable.status_code = 503
+        ok = self._streamed(b"[]")
+        request_mock.side_effect = [unavailable, ok]
+
+        self.assertIs(request_with_retry("GET", "http://localhost:54321/rest/v1/logs", retries=1, stream=True), ok)
+        self.assertTrue(unavailable.raw.closed)
+
+        missing = self._streamed(b'{"message":"no table"}')
+        missing.status_code = 404
+        request_mock.side_effect = [missing]
+        with self.assertRaises(requests.HTTPError) as ctx:
+            request_with_retry("GET", "http://localhost:54321/rest/v1/nope", retries=0, stream=True)
+        # Read to the end, so the connection is free again.
+        self.assertEqual(missing.raw.read(), b"")
+        self.assertIn("no table", ctx.exception.response.text)
+
+
+class HttpArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "day.jsonl.gz")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _record(self):
+        with LocalSupabase() as server:
+            server.store.load("logs", [{"ts": i, "event": "risk_eval", "data": {"risk": i}} for i in range(5)])
+            base = f"{server.url}/rest/v1"
+            recorder = HttpRecorder(self.path)
+            with patch("http_client.ARCHIVE", recorder):
+                rows = request_with_retry("GET", f"{base}/logs", params={"ts": "gte.2"}, retries=0).json()
+                first = request_with_retry("POST", f"{base}/rpc/increment_counter", json={"counter_name": "c"}, retries=0).json()
+                second = request_with_retry("POST", f"{base}/rpc/increment_counter", json={"counter_name": "c"}, retries=0).json()
+            recorder.close()
+            return base, rows, [first, second]
+
+    def test_replay_serves_recorded_responses_in_order_without_network(self):
+        base, rows, counters = self._record()
+
+        replayer = HttpReplayer(self.path)
+        with patch("http_client.ARCHIVE", replayer), patch("http_client.requests.request") as request_mock:
+            replayed = request_with_retry("GET", f"{base}/logs", params={"ts": "gte.2"}, retries=0).json()
+            replayed_counters = [
+                request_with_retry("POST", f"{base}/rpc/increment_counter", json={"counter_name": "c"}, retries=0).json()
+                for _ in range(2)
+            ]
+            with self.assertRaises(ReplayMissError):
+                request_with_retry("GET", f"{base}/logs", params={"ts": "gte.3"}, retries=0)
+
+        request_mock.assert_not_called()
+        self.assertEqual(replayed, rows)
+        self.assertEqual(counters, [1, 2])
+        self.assertEqual(replayed_counters, counters)
+
+    def test_recorded_errors_are_raised_again(self):
+        recorder = HttpRecorder(self.path)
+        with patch("http_client.ARCHIVE", recorder), patch("http_client.requests.request") as request_mock:
+            request_mock.side_effect = requests.exceptions.Timeout("slow")
+            with self.assertRaises(requests.exceptions.Timeout):
+                request_with_retry("GET", "https://api.telegram.org/bot123:abc/sendMessage", retries=0)
+        recorder.close()
+
+        replayer = HttpReplayer(self.path)
+        with patch("http_client.ARCHIVE", replayer):
+            with self.assertRaises(requests.exceptions.Timeout):
+                request_with_retry("GET", "https://api.telegram.org/bot999:xyz/sendMessage", retries=0)
+
+    def test_clock_reads_are_replayed_so_time_keyed_requests_match(self):
+        def fetch_window():
+            start, end = analysis_window_utc()
+            params = {"ts": f"gte.{int(start.timestamp() * 1000)}", "and": f"(ts.lt.{int(end.timestamp() * 1000)})"}
+            return request_with_retry("GET", f"{base}/logs", params=params, retries=0).json()
+
+        with LocalSupabase() as server:
+            server.store.load("logs", [{"ts": 1, "event": "risk_eval", "data": {}}])
+            base = f"{server.url}/rest/v1"
+            recorder = HttpRecorder(self.path)
+            with patch("http_client.ARCHIVE", recorder), patch("http_archive._CLOCK_ARCHIVE", recorder):
+                recorded = fetch_window()
+            recorder.close()
+
+        replayer = HttpReplayer(self.path)
+        later = datetime.now(timezone.utc) + timedelta(days=3)
+        with patch("http_client.ARCHIVE", replayer), patch("http_archive._CLOCK_ARCHIVE", replayer), patch(
+            "http_archive.datetime"
+        ) as datetime_mock:
+            datetime_mock.now.return_value = later
+            self.assertEqual(fetch_window(), recorded)
+
 
 if __name__ == "__main__":
     unittest.main()
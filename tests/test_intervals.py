@@ -0,0 +1,25 @@
+import unittest
+
+import intervals
+
+
+class IntervalsTests(unittest.TestCase):
+    def test_add_merges_overlapping_and_touching(self):
+        covered = intervals.add([], 10, 20)
+        covered = intervals.add(covered, 30, 40)
+        self.assertEqual(covered, [(10, 20), (30, 40)])
+        self.assertEqual(intervals.add(covered, 20, 30), [(10, 40)])
+        self.assertEqual(intervals.add(covered, 15, 35), [(10, 40)])
+        self.assertEqual(intervals.add(covered, 5, 5), covered)
+
+    def test_gaps(self):
+        covered = [(10, 20), (30, 40)]
+        self.assertEqual(intervals.gaps(covered, 0, 50), [(0, 10), (20, 30), (40, 50)])
+        self.assertEqual(intervals.gaps(covered, 12, 18), [])
+        self.assertEqual(intervals.gaps(covered, 15, 35), [(20, 30)])
+        self.assertTrue(intervals.contains(covered, 30, 40))
+        self.assertFalse(intervals.contains(covered, 30, 41))
+
+
+if __name__ == "__main__":
+    unittest.main()
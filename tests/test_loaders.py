@@ -0,0 +1,332 @@
+import json
+import os
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+import pandas as pd
+import requests
+
+import deribit_daily
+import loaders
+import meta_daily
+import telegram_daily
+import twitter_daily
+from runtime_metrics import RuntimeMetrics
+
+
+def _response(rows):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(rows).encode("utf-8")
+    return response
+
+
+class LoadEventCacheTests(unittest.TestCase):
+    def setUp(self):
+        loaders.clear_run_cache()
+        self.start = datetime(2026, 2, 20, 11, 0, tzinfo=timezone.utc)
+        self.end = datetime(2026, 2, 21, 11, 0, tzinfo=timezone.utc)
+        base_ms = int(self.start.timestamp() * 1000)
+        self.rows = [
+            {"id": 1, "ts": base_ms + 1000, "symbol": "BTCUSDT", "data": {"risk": 1}},
+            {"id": 2, "ts": base_ms + 2000, "symbol": "ETHUSDT", "data": {"risk": 3}},
+        ]
+
+    def tearDown(self):
+        loaders.clear_run_cache()
+
+    @patch("loaders.request_with_retry")
+    def test_cache_hit_skips_network_and_isolates_caller_mutations(self, mock_request):
+        mock_request.side_effect = lambda *a, **k: _response([dict(r, data=dict(r["data"])) for r in self.rows])
+
+        first = loaders.load_event("risk_eval", self.start, self.end)
+        first["risk"] = first["risk"].fillna(0) * 10
+        first["session"] = "ASIA"
+
+        second = loaders.load_event("risk_eval", self.start, self.end)
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(second["risk"].tolist(), [1, 3])
+        self.assertNotIn("session", second.columns)
+
+    @patch("loaders.request_with_retry")
+    def test_load_phases_record_pages_bytes_and_cache_savings(self, mock_request):
+        def respond(*args, **kwargs):
+            response = _response([dict(r, data=dict(r["data"])) for r in self.rows])
+            response._content = response.content.ljust(150)
+            return response
+
+        mock_request.side_effect = respond
+        metrics = RuntimeMetrics()
+        with patch("loaders.METRICS", metrics):
+            loaders.load_event("risk_eval", self.start, self.end)
+            loaders.load_event("risk_eval", self.start, self.end)
+
+        phases = metrics.load_breakdown()["risk_eval"]
+        self.assertEqual(phases["pages"], 1)
+        self.assertEqual(phases["bytes"], 150)
+        self.assertEqual(phases["cache_misses"], 1)
+        self.assertEqual(phases["cache_hits"], 1)
+        self.assertEqual(phases["cache_bytes_saved"], 150)
+        for name in ("wait_sec", "decode_sec", "coerce_sec", "frame_sec", "compact_sec"):
+            self.assertGreaterEqual(phases[name], 0)
+
+    @patch("loaders.request_with_retry")
+    def test_cache_evicts_least_recently_used_over_budget(self, mock_request):
+        mock_request.side_effect = lambda *a, **k: _response([dict(r, data=dict(r["data"])) for r in self.rows])
+
+        loaders.load_event("risk_eval", self.start, self.end)
+        size = next(iter(loaders._RUN_CACHE_SIZES.values()))
+
+        with patch("loaders._RUN_CACHE_MAX_BYTES", int(size * 1.5)):
+            loaders.load_event("alert_sent", self.start, self.end)
+
+        self.assertEqual([key[0] for key in loaders._RUN_CACHE], ["alert_sent"])
+
+
+class RangeCacheTests(unittest.TestCase):
+    EVENT = "deribit_vbi_snapshot"
+
+    def setUp(self):
+        loaders.clear_run_cache()
+        self.base_ms = int(datetime(2026, 2, 20, 11, 0, tzinfo=timezone.utc).timestamp() * 1000)
+        states = ["CALM"] * 20 + ["WARM", "CALM"] * 20
+        self.rows = [
+            {"id": i, "ts": self.base_ms + i * 1000, "symbol": "BTC" if i % 3 else "ETH", "data": {"vbi_state": state, "skew": i / 10}}
+            for i, state in enumerate(states)
+        ]
+        self.fetched = []
+
+    def tearDown(self):
+        loaders.clear_run_cache()
+
+    def _serve(self, *args, **kwargs):
+        params = kwargs["params"]
+        lo = next(int(v[4:]) for k, v in params if k == "ts" and v.startswith("gte."))
+        hi = next(int(v[4:]) for k, v in params if k == "ts" and v.startswith("lte."))
+        # In whole rows: a gap starts 1 ms after the cached range ends.
+        self.fetched.append((-(-(lo - self.base_ms) // 1000), (hi - self.base_ms) // 1000))
+        return _response([dict(r, data=dict(r["data"])) for r in self.rows if lo <= r["ts"] <= hi])
+
+    def _window(self, first: int, last: int):
+        return datetime.fromtimestamp((self.base_ms + first * 1000) / 1000, tz=timezone.utc), datetime.fromtimestamp(
+            (self.base_ms + last * 1000) / 1000, tz=timezone.utc
+        )
+
+    def _load(self, first: int, last: int):
+        return loaders.load_event(self.EVENT, *self._window(first, last))
+
+    def _fresh(self, first: int, last: int):
+        loaders.clear_run_cache()
+        with patch("loaders.request_with_retry", side_effect=self._serve):
+            return self._load(first, last)
+
+    def _assert_same_as_fresh(self, df, first: int, last: int):
+        fresh = self._fresh(first, last)
+        pd.testing.assert_frame_equal(df, fresh)
+        self.assertIsInstance(df.index, pd.RangeIndex)
+        self.assertEqual(df["id"].tolist(), list(range(first, last + 1)))
+
+    def test_left_and_right_gaps_are_fetched_and_merged(self):
+        with patch("loaders.request_with_retry", side_effect=self._serve):
+            self._load(10, 19)
+            df = self._load(5, 30)
+        self.assertEqual(self.fetched, [(10, 19), (5, 9), (20, 30)])
+        self._assert_same_as_fresh(df, 5, 30)
+
+    def test_interior_gap_is_fetched_once(self):
+        with patch("loaders.request_with_retry", side_effect=self._serve):
+            self._load(0, 9)
+            self._load(30, 39)
+            df = self._load(0, 39)
+        self.assertEqual(self.fetched, [(0, 9), (30, 39), (10, 29)])
+        self._assert_same_as_fresh(df, 0, 39)
+
+    def test_sub_window_of_a_cached_superset_matches_a_fresh_fetch(self):
+        with patch("loaders.request_with_retry", side_effect=self._serve):
+            self._load(0, 59)
+            sliced = self._load(20, 23)
+        self.assertEqual(self.fetched, [(0, 59)])
+
+        # WARM/CALM tie inside the window: the window sees WARM first, the
+        # superset saw CALM first.
+        self.assertEqual(sliced["vbi_state"].value_counts().index[0], "WARM")
+        self.assertEqual(deribit_daily.dominant(sliced["vbi_state"]), ("WARM", 50.0))
+        self._assert_same_as_fresh(sliced, 20, 23)
+
+
+class FilterPushdownTests(unittest.TestCase):
+    def setUp(self):
+        loaders.clear_run_cache()
+        self.addCleanup(loaders.clear_run_cache)
+        self.start = datetime(2026, 2, 20, 11, 0, tzinfo=timezone.utc)
+        self.end = datetime(2026, 2, 21, 11, 0, tzinfo=timezone.utc)
+        base_ms = int(self.start.timestamp() * 1000)
+        self.rows = [
+            {"id": 1, "ts": base_ms + 1000, "symbol": "BTCUSDT", "data": {"type": "BUILDUP"}},
+            {"id": 2, "ts": base_ms + 2000, "symbol": "ETHUSDT", "data": {"type": "FLUSH"}},
+            {"id": 3, "ts": base_ms + 3000, "symbol": "ETHUSDT", "data": {"type": "BUILDUP"}},
+        ]
+
+    def test_filter_params(self):
+        self.assertEqual(
+            loaders.filter_params(symbols=["ETH", "BTC"], where={"type": "BUILDUP", "ok": True}),
+            [("symbol", "in.(BTC,ETH)"), ("data->>ok", "eq.true"), ("data->>type", "eq.BUILDUP")],
+        )
+        self.assertEqual(loaders.filter_params(), [])
+
+    @patch("loaders.request_with_retry")
+    def test_filters_are_sent_and_cached_separately(self, mock_request):
+        mock_request.side_effect = lambda *a, **k: _response([dict(r, data=dict(r["data"])) for r in self.rows[2:]])
+
+        df = loaders.load_event("alert_sent", self.start, self.end, symbols=["ETHUSDT"], where={"type": "BUILDUP"})
+        loaders.load_event("alert_sent", self.start, self.end, symbols=["ETHUSDT"], where={"type": "BUILDUP"})
+
+        self.assertEqual(mock_request.call_count, 1)
+        params = mock_request.call_args.kwargs["params"]
+        self.assertIn(("symbol", "in.(ETHUSDT)"), params)
+        self.assertIn(("data->>type", "eq.BUILDUP"), params)
+        self.assertEqual(df["id"].tolist(), [3])
+
+    @patch("loaders.request_with_retry")
+    def test_unfiltered_cache_entry_serves_filtered_loads(self, mock_request):
+        mock_request.side_effect = lambda *a, **k: _response([dict(r, data=dict(r["data"])) for r in self.rows])
+
+        loaders.load_event("alert_sent", self.start, self.end)
+        buildups = loaders.load_event("alert_sent", self.start, self.end, where={"type": "BUILDUP"})
+        eth = loaders.load_event("alert_sent", self.start, self.end, symbols=["ETHUSDT"])
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(buildups["id"].tolist(), [1, 3])
+        self.assertEqual(eth["id"].tolist(), [2, 3])
+        self.assertEqual(buildups.index.tolist(), [0, 1])
+        self.assertEqual(eth.index.tolist(), [0, 1])
+
+    @patch("loaders.request_with_retry")
+    def test_non_string_predicates_are_not_answered_from_the_unfiltered_cache(self, mock_request):
+        rows = [
+            {"id": 1, "ts": self.rows[0]["ts"], "symbol": "BTCUSDT", "data": {"type": "BUILDUP", "risk": 1.0, "ok": True}},
+            {"id": 2, "ts": self.rows[1]["ts"], "symbol": "ETHUSDT", "data": {"type": "FLUSH", "risk": 2.0, "ok": False}},
+        ]
+        mock_request.side_effect = lambda *a, **k: _response([dict(r, data=dict(r["data"])) for r in rows])
+
+        loaders.load_event("alert_sent", self.start, self.end)
+        # data->>risk of a stored 1 is "1", while the loaded float renders as "1.0".
+        loaders.load_event("alert_sent", self.start, self.end, where={"risk": "1"})
+        loaders.load_event("alert_sent", self.start, self.end, where={"ok": True})
+
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertIn(("data->>risk", "eq.1"), mock_request.call_args_list[1].kwargs["params"])
+        self.assertIn(("data->>ok", "eq.true"), mock_request.call_args_list[2].kwargs["params"])
+
+
+class ColumnBuilderTests(unittest.TestCase):
+    def test_matches_frame_built_from_row_dicts(self):
+        rows = [
+            {"id": 1, "ts": 1000, "symbol": "BTCUSDT", "data": {"risk": 1, "type": "BUILDUP"}},
+            {"id": 2, "ts": 2000, "symbol": "ETHUSDT", "data": {"symbol": "stale", "price": 2.5}},
+            {"id": 3, "ts": 3000, "symbol": None, "data": None},
+            {"id": 4, "ts": 4000, "symbol": "BTCUSDT", "data": {"risk": None, "flag": True}},
+        ]
+        expected = pd.DataFrame([
+            {**(r["data"] or {}), "symbol": r["symbol"], "ts": pd.to_datetime(r["ts"], unit="ms", utc=True), "id": r["id"]}
+            for r in rows
+        ])
+
+        builder = loaders._ColumnBuilder()
+        builder.add(rows[:2])
+        builder.add(rows[2:])
+
+        pd.testing.assert_frame_equal(builder.frame(), expected)
+        self.assertTrue(loaders._ColumnBuilder().frame().empty)
+
+
+class PageSizerTests(unittest.TestCase):
+    def test_grows_on_fast_pages_and_backs_off_on_heavy_ones(self):
+        pager = loaders._PageSizer(initial=1000, low=250, high=10000, target_sec=2, target_bytes=8 * 1024 * 1024, server_max=None)
+        pager.observe(1000, 0.1, 500_000)
+        self.assertEqual(pager.size, 2000)
+        pager.observe(2000, 0.2, 1_000_000)
+        self.assertEqual(pager.size, 4000)
+        pager.observe(4000, 16.0, 2_000_000)
+        self.assertEqual(pager.size, 2000)
+        pager.observe(2000, 0.1, 64 * 1024 * 1024)
+        self.assertEqual(pager.size, 1000)
+
+    def test_never_exceeds_server_max_rows(self):
+        pager = loaders._PageSizer(initial=1000, low=250, high=10000, server_max=1000)
+        pager.observe(1000, 0.01, 1000)
+        self.assertEqual(pager.size, 1000)
+
+        # A raised db-max-rows is what lets fast pages grow.
+        pager = loaders._PageSizer(initial=1000, low=250, high=10000, server_max=5000)
+        pager.observe(1000, 0.01, 1000)
+        self.assertEqual(pager.size, 2000)
+
+
+class CompactFrameTests(unittest.TestCase):
+    def test_compact_frame_uses_categoricals_and_small_numeric_types(self):
+        n = 200
+        df = pd.DataFrame(
+            {
+                "ts": pd.to_datetime(list(range(n)), unit="ms", utc=True),
+                "id": list(range(n)),
+                "symbol": ["BTCUSDT", "ETHUSDT"] * (n // 2),
+                "regime": ["CALM"] * n,
+                "risk": [i % 5 for i in range(n)],
+                "near_iv": [0.1 * i for i in range(n)],
+                "skew": [0.1 * i for i in range(n)],
+                "price": [100.5 + i for i in range(n)],
+                "note": [f"row-{i}" for i in range(n)],
+            }
+        )
+
+        out, before, after = loaders._compact_frame(df, "deribit_vbi_snapshot")
+
+        self.assertIsInstance(out["symbol"].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(out["regime"].dtype, pd.CategoricalDtype)
+        self.assertEqual(out["risk"].dtype, "int8")
+        self.assertEqual(out["near_iv"].dtype, "float32")
+        # Fed into threshold logic elsewhere, so never downcast.
+        self.assertEqual(out["skew"].dtype, "float64")
+        self.assertEqual(out["price"].dtype, "float64")
+        self.assertFalse(isinstance(out["note"].dtype, pd.CategoricalDtype))
+        self.assertEqual(out["id"].dtype, df["id"].dtype)
+        self.assertLess(after, before)
+        self.assertEqual(out["symbol"].value_counts().to_dict(), {"BTCUSDT": 100, "ETHUSDT": 100})
+
+    def test_categorical_ties_break_like_object_dtype(self):
+        df = pd.DataFrame({"vbi_state": ["ZED", "ALPHA", "ZED", "ALPHA", "MID"] * 20})
+
+        out, _, _ = loaders._compact_frame(df)
+
+        self.assertIsInstance(out["vbi_state"].dtype, pd.CategoricalDtype)
+        self.assertEqual(out["vbi_state"].value_counts().index[0], df["vbi_state"].value_counts().index[0])
+        self.assertEqual(out["vbi_state"].value_counts().idxmax(), "ZED")
+
+    def test_dominants_of_a_subset_break_ties_like_object_dtype(self):
+        # Frame-wide first-seen order is [ALPHA, ZED]; the BTC rows see ZED first.
+        df = pd.DataFrame(
+            {
+                "symbol": ["ETHUSDT", "BTCUSDT", "BTCUSDT"] * 10,
+                "vbi_pattern": ["ALPHA", "ZED", "ALPHA"] * 10,
+            }
+        )
+        out, _, _ = loaders._compact_frame(df)
+        self.assertIsInstance(out["vbi_pattern"].dtype, pd.CategoricalDtype)
+
+        btc = out[out["symbol"] == "BTCUSDT"]["vbi_pattern"]
+        expected = df[df["symbol"] == "BTCUSDT"]["vbi_pattern"].value_counts().idxmax()
+        self.assertEqual(expected, "ZED")
+        for helper in (twitter_daily.dominant_with_pct, telegram_daily.dominant_with_pct, meta_daily.dominant_with_pct):
+            self.assertEqual(helper(btc), ("ZED", 50.0), helper.__module__)
+        for helper in (twitter_daily.dominant, telegram_daily.dominant):
+            self.assertEqual(helper(btc), "ZED", helper.__module__)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,264 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pandas as pd
+import requests
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+import loaders
+from http_archive import HttpRecorder, HttpReplayer
+from local_supabase import LocalSupabase
+
+
+class LocalSupabaseTests(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalSupabase().start()
+        self.base = f"{self.server.url}/rest/v1"
+        self.server.store.load(
+            "logs",
+            [
+                {"ts": 1000 + i, "event": "risk_eval" if i % 3 else "alert_sent", "symbol": "BTCUSDT" if i % 2 else "ETHUSDT", "data": {"risk": i % 5, "type": "BUILDUP"}}
+                for i in range(30)
+            ],
+        )
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_filters_order_limit_and_select(self):
+        r = requests.get(
+            f"{self.base}/logs",
+            params=[
+                ("select", "ts,symbol"),
+                ("event", "eq.risk_eval"),
+                ("ts", "gte.1005"),
+                ("ts", "lt.1020"),
+                ("order", "ts.desc"),
+                ("limit", "3"),
+            ],
+        )
+        r.raise_for_status()
+        self.assertEqual(r.json(), [
+            {"ts": 1019, "symbol": "BTCUSDT"},
+            {"ts": 1017, "symbol": "BTCUSDT"},
+            {"ts": 1016, "symbol": "ETHUSDT"},
+        ])
+
+    def test_insert_conflicts_upsert_and_patch(self):
+        row = {"date": "2026-02-20", "status": "running"}
+        self.assertEqual(requests.post(f"{self.base}/daily_job_runs", json=row).status_code, 201)
+        self.assertEqual(requests.post(f"{self.base}/daily_job_runs", json=row).status_code, 409)
+
+        r = requests.post(
+            f"{self.base}/daily_deribit_vbi",
+            params={"on_conflict": "date_utc,symbol"},
+            headers={"Prefer": "resolution=merge-duplicates,return=representation"},
+            json=[{"date_utc": "2026-02-20", "symbol": "BTC", "skew_avg": 1.0}],
+        )
+        self.assertEqual(r.status_code, 201)
+        requests.post(
+            f"{self.base}/daily_deribit_vbi",
+            params={"on_conflict": "date_utc,symbol"},
+            headers={"Prefer": "resolution=merge-duplicates"},
+            json={"date_utc": "2026-02-20", "symbol": "BTC", "skew_avg": 2.0},
+        ).raise_for_status()
+        stored = requests.get(f"{self.base}/daily_deribit_vbi", params={"symbol": "eq.BTC"}).json()
+        self.assertEqual(len(stored), 1)
+        self.assertEqual(stored[0]["skew_avg"], 2.0)
+
+        r = requests.patch(f"{self.base}/daily_job_runs", params={"date": "eq.2026-02-20"}, json={"status": "ok"})
+        self.assertEqual(r.status_code, 204)
+        self.assertEqual(requests.get(f"{self.base}/daily_job_runs").json()[0]["status"], "ok")
+
+    def test_rpc_increment_counter(self):
+        values = [
+            requests.post(f"{self.base}/rpc/increment_counter", json={"counter_name": "tg_daily_log"}).json()
+            for _ in range(3)
+        ]
+        self.assertEqual(values, [1, 2, 3])
+
+    def test_fault_injection_and_page_cap(self):
+        self.server.throttle_rate = 1.0
+        r = requests.get(f"{self.base}/logs")
+        self.assertEqual(r.status_code, 429)
+        self.assertEqual(r.headers["Retry-After"], "1")
+
+        self.server.throttle_rate = 0.0
+        self.server.max_rows = 4
+        self.assertEqual(len(requests.get(f"{self.base}/logs", params={"limit": "10"}).json()), 4)
+
+    def test_load_event_pages_through_stand_in(self):
+        start = datetime.fromtimestamp(1, tz=timezone.utc)
+        end = datetime.fromtimestamp(2, tz=timezone.utc)
+        loaders.clear_run_cache()
+        with patch("loaders.SUPABASE_URL", self.server.url):
+            df = loaders.load_event("risk_eval", start, end)
+        loaders.clear_run_cache()
+
+        self.assertEqual(len(df), 20)
+        self.assertEqual(df["id"].is_unique, True)
+
+    def test_load_events_batches_sparse_events_into_one_scan(self):
+        self.server.store.load(
+            "logs", [{"ts": 1100 + i, "event": "market_regime", "symbol": None, "data": {"regime": "CALM"}} for i in range(3)]
+        )
+        start = datetime.fromtimestamp(1, tz=timezone.utc)
+        end = datetime.fromtimestamp(2, tz=timezone.utc)
+        loaders.clear_run_cache()
+        with patch("loaders.SUPABASE_URL", self.server.url):
+            frames = loaders.load_events(["risk_eval", "alert_sent", "market_regime"], start, end)
+            scans = len(self.server.requests)
+            again = loaders.load_event("alert_sent", start, end)
+        loaders.clear_run_cache()
+
+        self.assertEqual(scans, 2)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual({k: len(v) for k, v in frames.items()}, {"risk_eval": 20, "alert_sent": 10, "market_regime": 3})
+        self.assertEqual(len(again), 10)
+
+    def test_streamed_load_matches_buffered(self):
+        start = datetime.fromtimestamp(1, tz=timezone.utc)
+        end = datetime.fromtimestamp(2, tz=timezone.utc)
+        frames = []
+        for stream in (False, True):
+            loaders.clear_run_cache()
+            with patch("loaders.SUPABASE_URL", self.server.url), patch("loaders.LOAD_STREAM", stream), patch(
+                "loaders.LOAD_STREAM_BATCH_ROWS", 4
+            ):
+                frames.append(loaders.load_event("risk_eval", start, end))
+        loaders.clear_run_cache()
+
+        self.assertEqual(len(frames[1]), 20)
+        self.assertTrue(frames[0].equals(frames[1]))
+
+    def test_csv_projection_matches_json_and_cached_rows(self):
+        self.server.store.load(
+            "logs", [{"ts": 1040, "event": "risk_eval", "symbol": "BTCUSDT", "data": {"type": "WATCH", "flag": True}}]
+        )
+        start = datetime.fromtimestamp(1, tz=timezone.utc)
+        end = datetime.fromtimestamp(2, tz=timezone.utc)
+        pager_cls = loaders._PageSizer
+        frames = {}
+        for wire in ("json", "csv"):
+            loaders.clear_run_cache()
+            with patch("loaders.SUPABASE_URL", self.server.url), patch("loaders.LOAD_WIRE_FORMAT", wire), patch(
+                "loaders._PageSizer", lambda: pager_cls(initial=4, low=4, high=4)
+            ):
+                frames[wire] = loaders.load_event("risk_eval", start, end, fields=["risk", "type", "flag"])
+        loaders.clear_run_cache()
+        with patch("loaders.SUPABASE_URL", self.server.url):
+            loaders.load_event("risk_eval", start, end)
+        with patch("loaders.request_with_retry", side_effect=AssertionError("projection refetched")):
+            frames["cached"] = loaders.load_event("risk_eval", start, end, fields=["risk", "type", "flag"])
+        loaders.clear_run_cache()
+
+        self.assertEqual(list(frames["csv"].columns), ["risk", "type", "flag", "symbol", "ts", "id", "ts_ms"])
+        self.assertEqual(len(frames["csv"]), 21)
+        self.assertEqual(frames["csv"]["risk"].tolist()[:3], [1.0, 2.0, 4.0])
+        self.assertEqual(frames["csv"]["flag"].tolist()[-1], True)
+        for other in ("json", "cached"):
+            pd.testing.assert_frame_equal(frames["csv"], frames[other], check_dtype=False, check_categorical=False)
+
+    def test_range_cache_serves_sub_windows_and_fetches_only_gaps(self):
+        def window(a, b):
+            return datetime.fromtimestamp(a, tz=timezone.utc), datetime.fromtimestamp(b, tz=timezone.utc)
+
+        loaders.clear_run_cache()
+        fetched = []
+        fetch_pages = loaders._fetch_pages
+
+        def recording_fetch(events, start_ts, end_ts, *args, **kwargs):
+            fetched.append((start_ts, end_ts))
+            return fetch_pages(events, start_ts, end_ts, *args, **kwargs)
+
+        with patch("loaders.SUPABASE_URL", self.server.url), patch("loaders._fetch_pages", side_effect=recording_fetch):
+            day = loaders.load_event("risk_eval", *window(1.004, 1.02))
+            inside = loaders.load_event("risk_eval", *window(1.010, 1.016))
+            filtered = loaders.load_event("risk_eval", *window(1.010, 1.016), symbols=["BTCUSDT"])
+            wider = loaders.load_event("risk_eval", *window(1.0, 1.026))
+        loaders.clear_run_cache()
+
+        self.assertEqual(fetched, [(1004, 1020), (1000, 1003), (1021, 1026)])
+        self.assertEqual(day["ts_ms"].tolist(), [t for t in range(1004, 1021) if (t - 1000) % 3])
+        self.assertEqual(inside["ts_ms"].tolist(), [t for t in range(1010, 1017) if (t - 1000) % 3])
+        self.assertEqual(filtered["ts_ms"].tolist(), [1011, 1013])
+        self.assertEqual(wider["ts_ms"].tolist(), [t for t in range(1000, 1027) if (t - 1000) % 3])
+        self.assertTrue(wider["ts"].is_monotonic_increasing)
+        self.assertEqual(list(wider.index), list(range(len(wider))))
+        self.assertEqual(list(wider["symbol"].cat.categories), list(pd.unique(wider["symbol"].astype(object))))
+
+    def test_or_and_groups(self):
+        r = requests.get(
+            f"{self.base}/logs",
+            params=[
+                ("select", "ts,id"),
+                ("event", "eq.risk_eval"),
+                ("order", "ts.asc,id.asc"),
+                ("or", "(ts.gt.1025,and(ts.eq.1001,id.gt.1))"),
+            ],
+        )
+        r.raise_for_status()
+        self.assertEqual([row["ts"] for row in r.json()], [1001, 1026, 1028, 1029])
+
+    def test_keyset_pages_through_identical_timestamps(self):
+        self.server.store.load(
+            "logs", [{"ts": 5000, "event": "burst", "symbol": "BTCUSDT", "data": {"n": i}} for i in range(7)]
+        )
+        start = datetime.fromtimestamp(4, tz=timezone.utc)
+        end = datetime.fromtimestamp(6, tz=timezone.utc)
+        pager_cls = loaders._PageSizer
+        loaders.clear_run_cache()
+        with patch("loaders.SUPABASE_URL", self.server.url), patch(
+            "loaders._PageSizer", lambda: pager_cls(initial=3, low=3, high=3)
+        ):
+            df = loaders.load_event("burst", start, end)
+        loaders.clear_run_cache()
+
+        self.assertEqual(sorted(df["n"].tolist()), list(range(7)))
+        pages = [entry for entry in self.server.requests if entry["path"].startswith("/rest/v1/logs")]
+        self.assertEqual(len(pages), 3)
+
+    def test_archived_loads_replay_with_the_recorded_page_sizes(self):
+        self.server.store.load(
+            "logs", [{"ts": 7000 + i, "event": "slow", "symbol": "BTCUSDT", "data": {"n": i}} for i in range(40)]
+        )
+        start = datetime.fromtimestamp(6, tz=timezone.utc)
+        end = datetime.fromtimestamp(8, tz=timezone.utc)
+        pager_cls = loaders._PageSizer
+        # A 1 ms page target: any real latency would shrink the next page.
+        pager = lambda: pager_cls(initial=10, low=2, high=40, target_sec=0.001, server_max=None)
+        send = loaders.request_with_retry
+
+        def slow_send(*args, **kwargs):
+            time.sleep(0.02)
+            return send(*args, **kwargs)
+
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "day.jsonl.gz")
+            recorder = HttpRecorder(path)
+            loaders.clear_run_cache()
+            with patch("loaders.SUPABASE_URL", self.server.url), patch("http_client.ARCHIVE", recorder), patch(
+                "loaders._PageSizer", pager
+            ), patch("loaders.request_with_retry", slow_send):
+                recorded = loaders.load_event("slow", start, end)
+            recorder.close()
+
+            loaders.clear_run_cache()
+            with patch("loaders.SUPABASE_URL", self.server.url), patch(
+                "http_client.ARCHIVE", HttpReplayer(path)
+            ), patch("loaders._PageSizer", pager):
+                replayed = loaders.load_event("slow", start, end)
+            loaders.clear_run_cache()
+
+        self.assertEqual(len(recorded), 40)
+        pd.testing.assert_frame_equal(recorded, replayed)
+
+
+if __name__ == "__main__":
+    unittest.main()
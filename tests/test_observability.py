@@ -0,0 +1,104 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+import observability
+from runtime_metrics import RuntimeMetrics
+
+
+class StructuredLogTests(unittest.TestCase):
+    def test_json_mode_keeps_every_field(self):
+        out = io.StringIO()
+        with patch("observability.LOG_FORMAT", "json"), redirect_stdout(out):
+            observability.log_event(
+                "daily.finished",
+                run_id="r1",
+                status="ok",
+                elapsed_sec=12.5,
+                module_durations={"risk": 1.25},
+            )
+
+        record = json.loads(out.getvalue())
+        self.assertEqual(record["event"], "daily.finished")
+        self.assertEqual(record["run_id"], "r1")
+        self.assertEqual(record["elapsed_sec"], 12.5)
+        self.assertEqual(record["module_durations"], {"risk": 1.25})
+        self.assertEqual(record["message"], "Daily analysis finished with status: ok")
+        self.assertIn("ts", record)
+
+    def test_json_mode_writes_non_finite_numbers_as_null(self):
+        out = io.StringIO()
+        with patch("observability.LOG_FORMAT", "json"), redirect_stdout(out):
+            observability.log_event(
+                "daily.perf_regression", ratio=float("nan"), duration_sec=float("inf"), samples=[1.0, float("-inf")]
+            )
+
+        line = out.getvalue()
+        self.assertNotIn("NaN", line)
+        self.assertNotIn("Infinity", line)
+        record = json.loads(line)
+        self.assertIsNone(record["ratio"])
+        self.assertIsNone(record["duration_sec"])
+        self.assertEqual(record["samples"], [1.0, None])
+
+    def test_text_mode_prints_human_sentence(self):
+        out = io.StringIO()
+        with patch("observability.LOG_FORMAT", "text"), redirect_stdout(out):
+            observability.log_event("daily.module.ok", run_id="r1", module="risk_divergence")
+
+        self.assertIn("Risk divergence daily completed.", out.getvalue())
+
+
+class PrometheusExportTests(unittest.TestCase):
+    def test_textfile_contains_module_gauges_and_latency_histogram(self):
+        metrics = RuntimeMetrics()
+        with metrics.module("risk"):
+            metrics.add(request_count=3, payload_rows_in=2500)
+        metrics.observe_latency("logs", 0.05)
+        metrics.observe_latency("logs", 0.20)
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "daily.prom"
+            observability.write_prometheus_textfile(path, metrics, status="ok", elapsed_sec=42.0)
+            text = path.read_text(encoding="utf-8")
+            leftovers = [p.name for p in Path(td).iterdir() if p.name != "daily.prom"]
+
+        self.assertEqual(leftovers, [])
+        self.assertIn("daily_run_duration_seconds 42.0", text)
+        self.assertIn("daily_run_success 1", text)
+        self.assertIn('daily_module_request_count{module="risk"} 3', text)
+        self.assertIn('daily_module_duration_seconds{module="risk"}', text)
+        self.assertIn('daily_module_rss_growth_bytes{module="risk"}', text)
+        self.assertNotIn("daily_module_peak_rss_bytes", text)
+        self.assertIn('daily_http_request_duration_seconds_bucket{endpoint="logs",le="+Inf"} 2', text)
+        self.assertIn('daily_http_request_duration_seconds_count{endpoint="logs"} 2', text)
+
+    def test_latency_histogram_always_exports_the_full_bucket_ladder(self):
+        metrics = RuntimeMetrics()
+        metrics.observe_latency("logs", 0.05)
+        metrics.observe_latency("rpc/increment_counter", 120.0)
+        text = observability.render_prometheus_metrics(metrics, status="ok", elapsed_sec=1.0)
+
+        def buckets(endpoint):
+            prefix = f'daily_http_request_duration_seconds_bucket{{endpoint="{endpoint}",le="'
+            return [line[len(prefix):] for line in text.splitlines() if line.startswith(prefix)]
+
+        logs = buckets("logs")
+        self.assertEqual([b.split('"')[0] for b in logs], [b.split('"')[0] for b in buckets("rpc/increment_counter")])
+        self.assertEqual(len(logs), 18)
+        self.assertEqual(logs[0], '0.001"} 0')
+        self.assertEqual(logs[-1], '+Inf"} 1')
+        self.assertIn('0.064"} 1', logs)
+        self.assertIn('65.536"} 0', buckets("rpc/increment_counter"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pandas as pd
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+from event_schema import apply_schema
+from options_daily import DAILY_META_SESSIONS_TABLE, run_options_daily
+
+
+class OptionsDailySessionTests(unittest.TestCase):
+    @patch("options_daily.supabase_post")
+    @patch("options_daily.load_event")
+    def test_session_dominant_meta_ties_break_within_the_session(self, mock_load_event, mock_supabase_post):
+        hours = [1, 9, 10]
+        bybit = apply_schema(
+            "bybit_market_state",
+            pd.DataFrame(
+                {
+                    "ts": [pd.Timestamp(datetime(2026, 2, 20, h, 0, tzinfo=timezone.utc)) for h in hours],
+                    "regime": ["CALM", "CALM", "CALM"],
+                    "mci_phase": ["RELEASING", "EXPANDING", "RELEASING"],
+                    "confidence": [0.5, 0.5, 0.5],
+                }
+            ),
+        )
+        mock_load_event.side_effect = lambda event, *a, **k: bybit if event == "bybit_market_state" else pd.DataFrame()
+
+        run_options_daily(datetime(2026, 2, 20, tzinfo=timezone.utc), datetime(2026, 2, 21, tzinfo=timezone.utc))
+
+        sessions = {
+            c.args[1]["session"]: c.args[1]
+            for c in mock_supabase_post.call_args_list
+            if c.args[0] == DAILY_META_SESSIONS_TABLE
+        }
+        # EU sees EXPANDING first; the frame's category order puts RELEASING first.
+        self.assertEqual(sessions["EU"]["dominant_meta"], "EXPANDING")
+        self.assertEqual(sessions["ASIA"]["dominant_meta"], "RELEASING")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from requests.exceptions import ConnectionError
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+import perf_history
+from runtime_metrics import RuntimeMetrics
+
+
+def _run(risk_sec, elapsed=None, rows=1000):
+    return {
+        "status": "ok",
+        "elapsed_sec": elapsed if elapsed is not None else risk_sec + 10,
+        "payload_rows_in": rows,
+        "modules": {"risk": {"duration_sec": risk_sec, "payload_rows_in": rows}},
+    }
+
+
+class PerfHistoryTests(unittest.TestCase):
+    def test_flags_module_well_above_rolling_median(self):
+        history = [_run(10), _run(11), _run(9), _run(10), _run(12)]
+        record = _run(25, elapsed=35, rows=3000)
+
+        regressions = perf_history.find_regressions(record, history, threshold_pct=50, min_delta_sec=5, min_history=5)
+
+        self.assertEqual([r["module"] for r in regressions], ["risk", "total"])
+        self.assertEqual(regressions[0]["baseline_sec"], 10)
+        self.assertEqual(regressions[0]["ratio"], 2.5)
+        self.assertEqual(regressions[0]["baseline_rows_in"], 1000)
+
+    def test_ignores_short_history_and_small_absolute_slowdowns(self):
+        history = [_run(1), _run(1), _run(1), _run(1), _run(1)]
+        self.assertEqual(perf_history.find_regressions(_run(3), history, min_delta_sec=5, min_history=5), [])
+        self.assertEqual(perf_history.find_regressions(_run(30), history[:2], min_history=5), [])
+
+    def test_falls_back_to_local_history_when_supabase_is_unreachable(self):
+        metrics = RuntimeMetrics()
+        with metrics.module("risk"):
+            metrics.add(request_count=2, payload_rows_in=100)
+        metrics.add_load_phase("risk_eval", cache_hits=3, cache_misses=1)
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch("perf_history.LOCAL_HISTORY_FILE", Path(tmp) / "history.jsonl"), \
+                patch("perf_history.supabase_get", side_effect=ConnectionError()), \
+                patch("perf_history.supabase_post", side_effect=ConnectionError()):
+            perf_history.record_run_performance("run-1", "ok", 12.5, metrics)
+            history = perf_history.load_recent_runs()
+
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history[0]["run_id"], "run-1")
+        self.assertEqual(history[0]["cache_hit_rate"], 0.75)
+        self.assertEqual(history[0]["modules"]["risk"]["request_count"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import pstats
+import tempfile
+import time
+import unittest
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+from profiling import Profiler
+
+
+def busy_work(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+class ProfilerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_off_mode_writes_nothing(self):
+        profiler = Profiler("run1", "off", self.tmp.name)
+        with profiler.module("risk"):
+            busy_work(0.01)
+        self.assertEqual(profiler.files, [])
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_cprofile_dumps_pstats_named_by_run_and_module(self):
+        profiler = Profiler("run1", "cprofile", self.tmp.name)
+        with profiler.module("risk"):
+            busy_work(0.01)
+
+        self.assertEqual(profiler.files, [os.path.join(self.tmp.name, "run1_risk.pstats")])
+        stats = pstats.Stats(profiler.files[0])
+        self.assertTrue(any(func[2] == "busy_work" for func in stats.stats))
+
+    def test_sample_mode_writes_collapsed_stacks(self):
+        profiler = Profiler("run1", "sample", self.tmp.name, sample_interval_ms=1)
+        with profiler.module("cross_layer"):
+            busy_work(0.1)
+
+        with open(profiler.files[0], encoding="utf-8") as fh:
+            lines = fh.read().splitlines()
+        self.assertTrue(profiler.files[0].endswith("run1_cross_layer.collapsed"))
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertIn("busy_work (test_profiling.py:", stack)
+        self.assertGreater(int(count), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import time
+import unittest
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+import requests
+
+from http_client import request_with_retry
+from rate_limit import AIMDController, RetryBudget, TokenBucket, retry_after_sec
+
+
+def _response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b"[]"
+    return response
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_burst_is_free_then_requests_are_paced(self):
+        bucket = TokenBucket(rate_per_sec=100, burst=5)
+        started = time.monotonic()
+        for _ in range(10):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+
+
+class AIMDControllerTests(unittest.TestCase):
+    def test_grows_while_healthy_and_halves_on_overload(self):
+        controller = AIMDController(min_limit=1, max_limit=32, initial=4)
+        for _ in range(40):
+            controller.acquire()
+            controller.release(0.05, 200)
+        grown = controller.limit
+        self.assertGreater(grown, 8)
+
+        controller.acquire()
+        controller.release(0.05, 429)
+        self.assertAlmostEqual(controller.limit, grown / 2)
+
+        # A second overload inside the same round trip does not cut again.
+        controller.acquire()
+        controller.release(0.05, 503)
+        self.assertAlmostEqual(controller.limit, grown / 2)
+
+    def test_rising_latency_counts_as_congestion(self):
+        controller = AIMDController(min_limit=1, max_limit=32, initial=8)
+        for _ in range(5):
+            controller.acquire()
+            controller.release(0.05, 200)
+        before = controller.limit
+        controller.acquire()
+        controller.release(0.5, 200)
+        self.assertAlmostEqual(controller.limit, before / 2)
+
+    def test_baselines_are_kept_per_endpoint(self):
+        controller = AIMDController(min_limit=1, max_limit=32, initial=8)
+        for _ in range(5):
+            controller.acquire()
+            controller.release(0.01, 201, endpoint="daily_meta_v2")
+        before = controller.limit
+        # A large logs page is slow next to an upsert, but not congested.
+        for _ in range(5):
+            controller.acquire()
+            controller.release(0.5, 200, endpoint="logs")
+        self.assertGreater(controller.limit, before)
+        self.assertAlmostEqual(controller.baselines["daily_meta_v2"], 0.01)
+
+    @patch("rate_limit.time.monotonic")
+    def test_lasting_latency_shift_recovers(self, monotonic_mock):
+        clock = [1000.0]
+        monotonic_mock.side_effect = lambda: clock[0]
+        controller = AIMDController(min_limit=1, max_limit=32, initial=8)
+        for _ in range(5):
+            controller.acquire()
+            controller.release(0.05, 200, endpoint="logs")
+        for _ in range(200):
+            clock[0] += 1
+            controller.acquire()
+            controller.release(0.5, 200, endpoint="logs")
+        # The baseline follows the new latency and the limit grows back.
+        self.assertGreater(controller.baselines["logs"], 0.25)
+        self.assertGreater(controller.limit, 4)
+
+
+class RetryBudgetTests(unittest.TestCase):
+    def test_retries_are_capped_by_share_of_requests(self):
+        budget = RetryBudget(ratio=0.5, min_retries=1)
+        for _ in range(4):
+            budget.record_request()
+        self.assertEqual([budget.try_spend() for _ in range(4)], [True, True, True, False])
+
+
+class RetryAfterTests(unittest.TestCase):
+    def test_parses_seconds_and_http_dates(self):
+        self.assertEqual(retry_after_sec(_response(429, {"Retry-After": "3"})), 3.0)
+        when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        self.assertAlmostEqual(retry_after_sec(_response(503, {"Retry-After": when})), 30, delta=2)
+        self.assertIsNone(retry_after_sec(_response(503)))
+
+    @patch("http_client.time.sleep")
+    @patch("http_client.requests.request")
+    def test_request_with_retry_honors_retry_after(self, request_mock, sleep_mock):
+        request_mock.side_effect = [_response(429, {"Retry-After": "7"}), _response(200)]
+        request_with_retry("GET", "http://localhost:54321/rest/v1/logs", retries=1)
+        self.assertGreaterEqual(sleep_mock.call_args[0][0], 7)
+
+    @patch("http_client.time.sleep")
+    @patch("http_client.requests.request")
+    def test_exhausted_budget_stops_retrying(self, request_mock, sleep_mock):
+        request_mock.return_value = _response(503)
+        with patch("http_client.RETRY_BUDGET", RetryBudget(ratio=0, min_retries=0)):
+            with self.assertRaises(requests.HTTPError):
+                request_with_retry("GET", "http://localhost:54321/rest/v1/logs", retries=3)
+        self.assertEqual(request_mock.call_count, 1)
+        sleep_mock.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
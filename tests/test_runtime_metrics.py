@@ -0,0 +1,110 @@
+import contextvars
+import threading
+import unittest
+from unittest.mock import patch
+
+from runtime_metrics import UNSCOPED_MODULE, LatencyHistogram, RuntimeMetrics
+
+
+class RuntimeMetricsTests(unittest.TestCase):
+    def test_counters_are_charged_to_active_module(self):
+        metrics = RuntimeMetrics()
+
+        metrics.add(request_count=1)
+        with metrics.module("risk"):
+            metrics.add(request_count=2, payload_rows_in=1500, response_bytes=4096)
+            with metrics.module("cross_layer"):
+                metrics.add(request_count=1, retry_count=1)
+            metrics.add(payload_rows_out=1)
+
+        breakdown = metrics.module_breakdown()
+        self.assertEqual(metrics.request_count, 4)
+        self.assertEqual(breakdown[UNSCOPED_MODULE]["request_count"], 1)
+        self.assertEqual(breakdown["risk"]["request_count"], 2)
+        self.assertEqual(breakdown["risk"]["payload_rows_in"], 1500)
+        self.assertEqual(breakdown["risk"]["payload_rows_out"], 1)
+        self.assertEqual(breakdown["cross_layer"]["retry_count"], 1)
+        self.assertIn("risk", metrics.module_durations)
+
+    def test_concurrent_modules_do_not_lose_updates(self):
+        metrics = RuntimeMetrics()
+
+        def worker(name):
+            with metrics.module(name):
+                for _ in range(2000):
+                    metrics.add(request_count=1, payload_rows_in=2)
+
+        threads = [
+            threading.Thread(target=contextvars.copy_context().run, args=(worker, f"m{i}"))
+            for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        breakdown = metrics.module_breakdown()
+        self.assertEqual(metrics.request_count, 8000)
+        self.assertEqual(metrics.payload_rows_in, 16000)
+        for i in range(4):
+            self.assertEqual(breakdown[f"m{i}"]["request_count"], 2000)
+
+    def test_unknown_counter_is_rejected(self):
+        with self.assertRaises(KeyError):
+            RuntimeMetrics().add(requests=1)
+
+    def test_module_scope_records_its_own_rss_growth(self):
+        metrics = RuntimeMetrics()
+        # Process high-water mark: 100 MB before "risk", 150 MB after it and
+        # unchanged by the lighter "meta" that runs next.
+        with patch("runtime_metrics.peak_rss_mb", side_effect=[100.0, 150.0, 150.0, 150.0]):
+            with metrics.module("risk"):
+                pass
+            with metrics.module("meta"):
+                pass
+
+        self.assertEqual(metrics.module_memory["risk"]["rss_growth_mb"], 50.0)
+        self.assertEqual(metrics.module_memory["meta"]["rss_growth_mb"], 0.0)
+        self.assertEqual(metrics.module_memory["meta"]["process_peak_rss_mb"], 150.0)
+
+    def test_reset_clears_counters_and_breakdowns(self):
+        metrics = RuntimeMetrics()
+        with metrics.module("risk"):
+            metrics.add(request_count=3)
+        metrics.observe_latency("logs", 0.1)
+
+        metrics.reset()
+
+        self.assertEqual(metrics.request_count, 0)
+        self.assertEqual(metrics.module_breakdown(), {})
+        self.assertEqual(metrics.latency_summary(), {})
+        self.assertEqual(metrics.module_durations, {})
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_quantiles_are_within_one_bucket_of_exact_values(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.observe(ms / 1000)
+
+        summary = histogram.summary()
+        self.assertEqual(summary["count"], 1000)
+        self.assertEqual(summary["max_ms"], 1000.0)
+        for key, exact in (("p50_ms", 500), ("p95_ms", 950), ("p99_ms", 990)):
+            self.assertGreaterEqual(summary[key], exact)
+            self.assertLessEqual(summary[key], exact * 1.2)
+        self.assertEqual(sum(summary["buckets_ms"].values()), 1000)
+
+    def test_latency_summary_is_keyed_by_endpoint(self):
+        metrics = RuntimeMetrics()
+        metrics.observe_latency("logs", 0.120)
+        metrics.observe_latency("logs", 0.080)
+        metrics.observe_latency("rpc/increment_counter", 0.010)
+
+        summary = metrics.latency_summary()
+        self.assertEqual(summary["logs"]["count"], 2)
+        self.assertEqual(summary["rpc/increment_counter"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from local_supabase import LocalStore
+from synthetic_logs import EVENTS, generate_logs, populate, write_jsonl
+
+DAY_MS = 24 * 3600 * 1000
+START_MS = 1_771_585_200_000
+END_MS = START_MS + DAY_MS
+
+
+class SyntheticLogsTests(unittest.TestCase):
+    def test_same_seed_is_deterministic(self):
+        a = list(generate_logs(START_MS, START_MS + 3600_000, symbols=3, seed=7))
+        b = list(generate_logs(START_MS, START_MS + 3600_000, symbols=3, seed=7))
+        c = list(generate_logs(START_MS, START_MS + 3600_000, symbols=3, seed=8))
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_every_event_is_produced_within_window_and_ranges(self):
+        rows = list(generate_logs(START_MS, END_MS, symbols=4, seed=1))
+        counts = Counter(row["event"] for row in rows)
+
+        self.assertEqual(set(counts), set(EVENTS))
+        self.assertAlmostEqual(counts["risk_eval"], 4 * 1440, delta=4 * 1440 * 0.1)
+        for row in rows:
+            self.assertGreaterEqual(row["ts"], START_MS)
+            self.assertLessEqual(row["ts"], END_MS)
+            if row["event"] == "risk_eval":
+                self.assertIn(row["data"]["risk"], range(6))
+                self.assertGreater(row["data"]["price"], 0)
+
+    def test_volume_scales_row_count(self):
+        base = sum(1 for _ in generate_logs(START_MS, END_MS, symbols=2, events=["risk_eval"]))
+        dense = sum(1 for _ in generate_logs(START_MS, END_MS, symbols=2, volume=10, events=["risk_eval"]))
+        self.assertAlmostEqual(dense / base, 10, delta=1)
+
+    def test_writes_to_store_and_jsonl(self):
+        store = LocalStore()
+        count = populate(store, START_MS, START_MS + 3600_000, symbols=2, events=["risk_eval", "bybit_market_state"])
+        self.assertGreater(count, 0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "logs.jsonl")
+            written = write_jsonl(path, generate_logs(START_MS, START_MS + 3600_000, symbols=2, events=["risk_eval", "bybit_market_state"]))
+            with open(path, encoding="utf-8") as fh:
+                self.assertEqual(sum(1 for _ in fh), written)
+        self.assertEqual(count, written)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+import requests
+
+from http_client import request_with_retry
+from tracing import Tracer
+
+
+class TracerTests(unittest.TestCase):
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer(enabled=False)
+        with tracer.span("run") as run:
+            run.set(status="ok")
+        self.assertEqual(tracer.finished_spans(), [])
+
+    def test_nested_spans_link_to_parents_and_export(self):
+        tracer = Tracer(enabled=True)
+        tracer.start_trace("1b4e28ba-2fa1-11d2-883f-0016d3cca427")
+        with tracer.span("run", run_id="r1"):
+            with tracer.span("module", module="risk"):
+                with tracer.span("load_event", event="risk_eval") as load:
+                    load.set(rows=10)
+            with self.assertRaises(ValueError):
+                with tracer.span("module", module="meta"):
+                    raise ValueError("boom")
+
+        spans = {(s.name, s.attributes.get("module")): s for s in tracer.finished_spans()}
+        run = spans[("run", None)]
+        risk = spans[("module", "risk")]
+        self.assertIsNone(run.parent_id)
+        self.assertEqual(risk.parent_id, run.span_id)
+        self.assertEqual(spans[("load_event", None)].parent_id, risk.span_id)
+        self.assertEqual(spans[("module", "meta")].error, "ValueError")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            chrome_path = tracer.export(os.path.join(tmp, "trace.json"))
+            otlp_path = tracer.export(os.path.join(tmp, "trace.otlp.json"), "otlp")
+            with open(chrome_path, encoding="utf-8") as fh:
+                chrome = json.load(fh)
+            with open(otlp_path, encoding="utf-8") as fh:
+                otlp = json.load(fh)
+
+        self.assertEqual({e["ph"] for e in chrome["traceEvents"]}, {"X"})
+        self.assertEqual(len(chrome["traceEvents"]), 4)
+        otlp_spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertTrue(all(len(s["traceId"]) == 32 for s in otlp_spans))
+        load_span = next(s for s in otlp_spans if s["name"] == "load_event")
+        self.assertIn({"key": "rows", "value": {"intValue": "10"}}, load_span["attributes"])
+        self.assertEqual(next(s for s in otlp_spans if s["status"]["code"] == 2)["status"]["message"], "ValueError")
+
+    def test_http_attempts_and_backoff_are_children_of_the_request(self):
+        tracer = Tracer(enabled=True)
+        failure = requests.exceptions.ConnectionError("down")
+        ok = requests.Response()
+        ok.status_code = 200
+        ok._content = b"[]"
+        with patch("tracing.TRACER", tracer), patch("http_client.span", tracer.span), \
+                patch("http_client.requests.request", side_effect=[failure, ok]), \
+                patch("http_client.time.sleep"):
+            request_with_retry("GET", "http://localhost:54321/rest/v1/logs", retries=1)
+
+        spans = tracer.finished_spans()
+        request = next(s for s in spans if s.name == "http.request")
+        children = [s.name for s in spans if s.parent_id == request.span_id]
+        self.assertEqual(children, ["http.attempt", "http.backoff", "http.attempt"])
+        self.assertEqual(request.attributes["attempts"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import io
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+
+import requests
+
+import validation_runner as vr
+
+
+class IterLogsTests(unittest.TestCase):
+    @patch("validation_runner.request_with_retry")
+    def test_rows_are_folded_as_they_stream_and_not_cached(self, request_mock):
+        rows = [{"ts": t, "event": "risk_divergence", "symbol": s, "data": {}} for t, s in ((1, "BTC"), (2, "ETH"), (3, "BTC"))]
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(json.dumps(rows).encode("utf-8"))
+        request_mock.return_value = response
+
+        times = vr.build_signal_times_by_symbol_risk_divergence(vr.iter_logs("risk_divergence", 0, 10))
+
+        self.assertEqual(dict(times), {"BTC": [1, 3], "ETH": [2]})
+        self.assertTrue(response.raw.closed)
+        self.assertTrue(request_mock.call_args.kwargs["stream"])
+        self.assertEqual(vr._LOG_CACHE, {})
+
+
+class LogCacheTests(unittest.TestCase):
+    def setUp(self):
+        vr.clear_log_cache()
+        self.addCleanup(vr.clear_log_cache)
+        self.calls = []
+
+    def _fake_load(self, event, ts_from, ts_to, symbols=None, where=None):
+        self.calls.append((ts_from, ts_to))
+        return [{"ts": ts, "event": event, "data": {}} for ts in range(-(-ts_from // 10) * 10, ts_to, 10)]
+
+    def test_overlapping_lookbacks_fetch_only_gaps(self):
+        with patch("validation_runner._load_logs", side_effect=self._fake_load):
+            first = vr.load_logs("okx_market_state", 100, 200)
+            inside = vr.load_logs("okx_market_state", 120, 160)
+            later = vr.load_logs("okx_market_state", 150, 260)
+            earlier = vr.load_logs("okx_market_state", 50, 255)
+
+        self.assertEqual(self.calls, [(100, 200), (200, 260), (50, 100)])
+        self.assertEqual([r["ts"] for r in first], list(range(100, 200, 10)))
+        self.assertEqual([r["ts"] for r in inside], list(range(120, 160, 10)))
+        self.assertEqual([r["ts"] for r in later], list(range(150, 260, 10)))
+        self.assertEqual([r["ts"] for r in earlier], list(range(50, 255, 10)))
+
+    def test_filtered_loads_bypass_cache(self):
+        with patch("validation_runner._load_logs", side_effect=self._fake_load):
+            vr.load_logs("risk_divergence", 100, 200)
+            vr.load_logs("risk_divergence", 100, 200, symbols=["BTCUSDT"])
+        self.assertEqual(len(self.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
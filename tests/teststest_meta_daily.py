@@ -55,9 +55,10 @@ class MetaDailyTests(unittest.TestCase):
     @patch("meta_daily.load_event")
     def test_run_meta_daily_includes_deribit_fields(self, mock_load_event, mock_post):
         ts = pd.Timestamp(datetime(2026, 2, 20, 10, 0, tzinfo=timezone.utc))
+        ts_ms = int(ts.timestamp() * 1000)
         mock_load_event.side_effect = [
-            pd.DataFrame({"ts": [ts], "symbol": ["BTCUSDT"], "risk": [1]}),
-            pd.DataFrame({"ts": [ts], "symbol": ["BTCUSDT"], "regime": ["CALM"], "mci": [0.2]}),
+            pd.DataFrame({"ts": [ts], "ts_ms": [ts_ms], "symbol": ["BTCUSDT"], "risk": [1]}),
+            pd.DataFrame({"ts": [ts], "ts_ms": [ts_ms], "symbol": ["BTCUSDT"], "regime": ["CALM"], "mci": [0.2]}),
             pd.DataFrame(),
             pd.DataFrame({"ts": [ts], "vbi_state": ["CALM"], "vbi_pattern": ["NONE"]}),
         ]
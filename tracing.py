@@ -0,0 +1,172 @@
+# tracing.py
+#
+# Lightweight hierarchical spans: run -> module -> load_event -> page ->
+# HTTP attempt / backoff -> write. Enabled by TRACE_FILE; exported at the end
+# of the run as Chrome trace JSON (Perfetto, chrome://tracing) or OTLP/JSON
+# (TRACE_FORMAT=otlp). When disabled, span() hands back a shared no-op.
+import json
+import os
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+
+from atomic_write import write_text_atomic
+from config import TRACE_FILE, TRACE_FORMAT
+
+TRACE_FORMATS = {"chrome", "otlp"}
+SERVICE_NAME = "daily-analysis"
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error", "thread_id")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.error = None
+        self.thread_id = threading.get_ident()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+class _NoopSpan:
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+_CURRENT: ContextVar[Span | None] = ContextVar("trace_current_span", default=None)
+
+
+class _ActiveSpan:
+    __slots__ = ("tracer", "span", "token")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self.tracer = tracer
+        self.span = span
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = _CURRENT.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.end_ns = time.time_ns()
+        if exc_type is not None:
+            self.span.error = exc_type.__name__
+        _CURRENT.reset(self.token)
+        self.tracer._finish(self.span)
+        return False
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def start_trace(self, trace_id: str | None = None):
+        with self._lock:
+            self.trace_id = (trace_id or secrets.token_hex(16)).replace("-", "")[:32].ljust(32, "0")
+            self.spans = []
+
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            return _NOOP
+        parent = _CURRENT.get()
+        return _ActiveSpan(self, Span(name, self.trace_id, parent.span_id if parent else None, attributes))
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def finished_spans(self) -> list[Span]:
+        with self._lock:
+            return sorted(self.spans, key=lambda s: s.start_ns)
+
+    # ---------- export ----------
+
+    def to_chrome(self) -> dict:
+        events = []
+        for s in self.finished_spans():
+            args = dict(s.attributes)
+            if s.error:
+                args["error"] = s.error
+            events.append({
+                "name": s.name,
+                "cat": s.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": s.start_ns / 1000,
+                "dur": (s.end_ns - s.start_ns) / 1000,
+                "pid": os.getpid(),
+                "tid": s.thread_id,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"trace_id": self.trace_id}}
+
+    def to_otlp(self) -> dict:
+        spans = []
+        for s in self.finished_spans():
+            span = {
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 1,
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": [_otlp_attribute(k, v) for k, v in s.attributes.items()],
+                "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+            }
+            if s.parent_id:
+                span["parentSpanId"] = s.parent_id
+            spans.append(span)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": spans}],
+            }]
+        }
+
+    def export(self, path: str, fmt: str = "chrome") -> str:
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"TRACE_FORMAT must be one of {sorted(TRACE_FORMATS)}")
+        payload = self.to_otlp() if fmt == "otlp" else self.to_chrome()
+        write_text_atomic(path, json.dumps(payload, default=str))
+        return path
+
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+TRACER = Tracer(enabled=bool(TRACE_FILE))
+
+
+def span(name: str, **attributes):
+    return TRACER.span(name, **attributes)
+
+
+def export_trace() -> str | None:
+    if not TRACE_FILE:
+        return None
+    return TRACER.export(TRACE_FILE, TRACE_FORMAT)
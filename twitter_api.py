@@ -6,6 +6,7 @@ import time
 from urllib.parse import quote
 
 from http_client import request_with_retry
+from runtime_metrics import METRICS
 
 
 TWITTER_POST_URL = "https://api.twitter.com/2/tweets"
@@ -57,6 +58,7 @@ def post_tweet(text, api_key, api_secret, access_token, access_token_secret):
         access_token_secret,
     )
 
+    METRICS.add(request_count=1)
     return request_with_retry(
         "POST",
         TWITTER_POST_URL,
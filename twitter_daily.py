@@ -71,14 +71,16 @@ def dominant(series, default_value="UNKNOWN"):
     clean = series.dropna() if hasattr(series, "dropna") else series
     if clean is None or len(clean) == 0:
         return default_value
-    return clean.value_counts().idxmax()
+    # Object dtype: ties go to the label seen first in this series, whatever
+    # category order the loaded frame gave the column.
+    return clean.astype(object).value_counts().idxmax()
 
 
 def dominant_with_pct(series, default_value="UNKNOWN", default_pct=0.0):
     clean = series.dropna() if hasattr(series, "dropna") else series
     if clean is None or len(clean) == 0:
         return default_value, default_pct
-    vc = clean.value_counts(normalize=True)
+    vc = clean.astype(object).value_counts(normalize=True)
     return vc.index[0], round(vc.iloc[0] * 100, 1)
 
 
@@ -376,7 +378,7 @@ def map_deribit_line(deribit):
 # ---------------- ANOMALIES ----------------
 
 def detect_anomaly(start, end):
-    alerts = load_event("alert_sent", start, end)
+    alerts = load_event("alert_sent", start, end, where={"type": "BUILDUP"})
 
     if alerts.empty or "type" not in alerts.columns:
         return None
@@ -1,11 +1,18 @@
 import os
 import math
-import time
+import bisect
+import threading
 from datetime import datetime
 
-import requests
-from typing import Any, Dict, List, Optional, Tuple
-from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import Counter, OrderedDict, defaultdict
+
+import intervals
+from http_archive import now_utc
+from http_client import JsonArrayStream, decode_json, request_with_retry
+from loaders import filter_params
+from runtime_metrics import METRICS
+from tracing import span
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
@@ -30,6 +37,11 @@ RISK_THRESHOLDS = {"LOW": 0.05, "MEDIUM": 0.15}
 # Если 0 или <=0 — без разрежения.
 VAL_STEP_MINUTES = int(os.getenv("VAL_STEP_MINUTES", "0"))
 
+# ---- Log cache ----
+# Rows of unfiltered load_logs calls, per event, with the [from, to) ranges
+# they cover: overlapping 48h lookbacks of later runs only fetch the gaps.
+VAL_CACHE_MAX_ROWS = int(os.getenv("VAL_CACHE_MAX_ROWS", "2000000"))
+
 
 # ----------------- Supabase helpers -----------------
 def sb_headers():
@@ -42,20 +54,26 @@ def sb_headers():
 
 def sb_get(path: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
     url = f"{SUPABASE_URL}/rest/v1/{path}"
-    r = requests.get(url, headers=sb_headers(), params=params, timeout=60)
-    r.raise_for_status()
-    return r.json()
+    METRICS.add(request_count=1)
+    r = request_with_retry("GET", url, headers=sb_headers(), params=params, timeout=60, retries=0)
+    rows = decode_json(r)
+    METRICS.add(payload_rows_in=len(rows))
+    return rows
 
 
-def sb_post(path: str, rows: List[Dict[str, Any]]) -> None:
+def sb_post(path: str, rows: List[Dict[str, Any]], prefer: Optional[str] = None):
     url = f"{SUPABASE_URL}/rest/v1/{path}"
-    r = requests.post(url, headers=sb_headers(), json=rows, timeout=60)
-    r.raise_for_status()
+    headers = sb_headers()
+    if prefer:
+        headers["Prefer"] = prefer
+    METRICS.add(request_count=1, payload_rows_out=len(rows))
+    with span("write", table=path, method="POST", rows=len(rows)):
+        return request_with_retry("POST", url, headers=headers, json=rows, timeout=60, retries=0)
 
 
 # ----------------- Utilities -----------------
 def ms_now() -> int:
-    return int(time.time() * 1000)
+    return int(now_utc().timestamp() * 1000)
 
 
 def coerce_float(x) -> Optional[float]:
@@ -107,9 +125,91 @@ def downsample_times(times_ms: List[int], step_minutes: int) -> List[int]:
 
 
 # ----------------- Load logs -----------------
-def load_logs(event: str, ts_from: int, ts_to: int) -> List[Dict[str, Any]]:
+class _LogRange:
+    def __init__(self):
+        self.ts: List[int] = []
+        self.rows: List[Dict[str, Any]] = []
+        self.covered: List[Tuple[int, int]] = []
+
+
+_LOG_CACHE: "OrderedDict[str, _LogRange]" = OrderedDict()
+_LOG_CACHE_LOCK = threading.Lock()
+
+
+def clear_log_cache() -> None:
+    with _LOG_CACHE_LOCK:
+        _LOG_CACHE.clear()
+
+
+def load_logs(event: str, ts_from: int, ts_to: int, *, symbols=None, where=None) -> List[Dict[str, Any]]:
+    with span("load_logs", event=event) as load_span:
+        if symbols is not None or where:
+            rows = _load_logs(event, ts_from, ts_to, symbols, where)
+        else:
+            rows = _cached_logs(event, ts_from, ts_to, load_span)
+        load_span.set(rows=len(rows))
+        return rows
+
+
+def _cached_logs(event: str, ts_from: int, ts_to: int, load_span) -> List[Dict[str, Any]]:
+    with _LOG_CACHE_LOCK:
+        entry = _LOG_CACHE.get(event)
+        gaps = intervals.gaps(entry.covered if entry else [], ts_from, ts_to)
+    load_span.set(cache="hit" if not gaps else "partial" if entry else "miss")
+
+    for gap_from, gap_to in gaps:
+        fetched = _load_logs(event, gap_from, gap_to)
+        with _LOG_CACHE_LOCK:
+            entry = _LOG_CACHE.setdefault(event, _LogRange())
+            if intervals.contains(entry.covered, gap_from, gap_to):
+                continue
+            # Drop what an overlapping load already added, then splice the
+            # gap in: every cached row outside it sorts before or after.
+            lo = bisect.bisect_left(entry.ts, gap_from)
+            hi = bisect.bisect_left(entry.ts, gap_to)
+            entry.ts[lo:hi] = [int(r["ts"]) for r in fetched]
+            entry.rows[lo:hi] = fetched
+            entry.covered = intervals.add(entry.covered, gap_from, gap_to)
+
+    with _LOG_CACHE_LOCK:
+        entry = _LOG_CACHE.get(event)
+        if entry is None or not intervals.contains(entry.covered, ts_from, ts_to):
+            return _load_logs(event, ts_from, ts_to)
+        _LOG_CACHE.move_to_end(event)
+        rows = entry.rows[bisect.bisect_left(entry.ts, ts_from):bisect.bisect_left(entry.ts, ts_to)]
+        _evict_logs()
+    return rows
+
+
+def _evict_logs() -> None:
+    total = sum(len(entry.rows) for entry in _LOG_CACHE.values())
+    while total > VAL_CACHE_MAX_ROWS and _LOG_CACHE:
+        _, entry = _LOG_CACHE.popitem(last=False)
+        total -= len(entry.rows)
+
+
+def iter_logs(event: str, ts_from: int, ts_to: int, *, symbols=None, where=None) -> Iterator[Dict[str, Any]]:
+    """Rows of event in [ts_from, ts_to) as the response arrives; neither cached nor kept.
+
+    For callers that fold the rows into something smaller. Signals index into
+    the full row lists, so those go through load_logs.
+    """
+    for batch in _iter_log_batches(event, ts_from, ts_to, symbols, where):
+        yield from batch
+
+
+def _load_logs(event: str, ts_from: int, ts_to: int, symbols=None, where=None) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for batch in _iter_log_batches(event, ts_from, ts_to, symbols, where):
+        rows.extend(batch)
+    return rows
+
+
+def _iter_log_batches(event: str, ts_from: int, ts_to: int, symbols=None, where=None) -> Iterator[List[Dict[str, Any]]]:
     url = f"{SUPABASE_URL}/rest/v1/{LOGS_TABLE}"
-    r = requests.get(
+    METRICS.add(request_count=1)
+    r = request_with_retry(
+        "GET",
         url,
         headers=sb_headers(),
         params=[
@@ -117,12 +217,18 @@ def load_logs(event: str, ts_from: int, ts_to: int) -> List[Dict[str, Any]]:
             ("event", f"eq.{event}"),
             ("ts", f"gte.{ts_from}"),
             ("ts", f"lt.{ts_to}"),
+            *filter_params(symbols, where),
             ("order", "ts.asc"),
         ],
         timeout=120,
+        retries=0,
+        stream=True,
     )
-    r.raise_for_status()
-    return r.json()
+    # Unpaginated multi-day scans: parse as the body arrives instead of
+    # holding the full response text next to the parsed rows.
+    for batch in JsonArrayStream(r, batch_rows=5000):
+        METRICS.add(payload_rows_in=len(batch))
+        yield batch
 
 
 # ----------------- Core: price series -----------------
@@ -266,7 +372,7 @@ def compute_dispersion_at(
 
 
 # ----------------- Signal builders -----------------
-def build_signal_times_by_symbol_risk_divergence(rows: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+def build_signal_times_by_symbol_risk_divergence(rows: Iterable[Dict[str, Any]]) -> Dict[str, List[int]]:
     out = defaultdict(list)
     for r in rows:
         ts = int(r["ts"])
@@ -418,15 +524,8 @@ def run_one_signal(
         }
 
         try:
-            url = f"{SUPABASE_URL}/rest/v1/validation_runs"
-            r = requests.post(
-                url,
-                headers={**sb_headers(), "Prefer": "return=representation"},
-                json=[run_row],
-                timeout=60,
-            )
-            r.raise_for_status()
-            run_id = r.json()[0]["id"]
+            r = sb_post("validation_runs", [run_row], prefer="return=representation")
+            run_id = decode_json(r)[0]["id"]
 
             results_rows = []
             for seg, b in buckets.items():
@@ -514,8 +613,11 @@ def run_validation_runner(t_start: int, t_end: int) -> None:
     else:
         symbols = sorted(list(price_series.keys()))
 
-    risk_div_rows = load_logs(EV_RISK_DIVERGENCE, t_start, t_end)
-    div_times = build_signal_times_by_symbol_risk_divergence(risk_div_rows)
+    # Divergence times are only looked up for the validated symbols; only the
+    # times are kept, so the rows are folded in as they stream.
+    div_times = build_signal_times_by_symbol_risk_divergence(
+        iter_logs(EV_RISK_DIVERGENCE, t_start, t_end, symbols=symbols if symbols_env else None)
+    )
 
     bybit_rows = load_logs(EV_BYBIT_STATE, t_start - 48 * 3600 * 1000, t_end)
     okx_rows = load_logs(EV_OKX_STATE, t_start - 48 * 3600 * 1000, t_end)
@@ -1,6 +1,8 @@
 # window.py
 from datetime import datetime, timedelta, timezone
 
+from http_archive import now_utc
+
 def analysis_window_utc(now: datetime | None = None):
     """
     Возвращает UTC-окно анализа строго 11:00 -> 11:00.
@@ -8,7 +10,7 @@ def analysis_window_utc(now: datetime | None = None):
     Если запуск раньше 11:00 UTC, окно будет за предыдущие сутки
     (позавчера 11:00 -> вчера 11:00).
     """
-    now = now or datetime.now(timezone.utc)
+    now = now or now_utc()
     if now.tzinfo is None:
         now = now.replace(tzinfo=timezone.utc)
     else: